@@ -0,0 +1,116 @@
+from typing import TYPE_CHECKING, Any, Optional
+
+from fastapi import Depends, HTTPException, Request
+
+from ..services.answers import AnswerService
+from ..services.channel_sync import ChannelStateStore
+from ..services.corpus import CorpusStore
+from ..services.embeddings import EmbeddingPipeline
+from ..services.fetch_policy import FetchPolicy
+from ..services.jobs import JobManager
+from ..services.lexical_index import LexicalStore
+from ..services.quota import QuotaManager
+from ..services.retrieval import Retriever
+from ..services.scheduler import FairScheduler
+from ..services.singleflight import SingleFlight
+from ..services.transcript_cache import TranscriptCache
+from ..services.transcripts import TranscriptService
+from ..services.vector_store import VectorStore
+from ..services.ytdlp_pool import YoutubeDLPool
+
+if TYPE_CHECKING:
+    # Annotation only: httpx is imported lazily, by the lifespan or the warm-up
+    import httpx
+
+
+def _component(request: Request, name: str) -> Any:
+    """A component built in the app lifespan; 503 while a background startup is still building them."""
+    state = request.app.state
+    if not getattr(state, "started", False):
+        raise HTTPException(status_code=503, detail="Backend is starting up", headers={"Retry-After": "1"})
+    return getattr(state, name)
+
+
+def get_http_client(request: Request) -> "httpx.AsyncClient":
+    """Pooled client created in the app lifespan."""
+    return _component(request, "http_client")
+
+
+def get_transcript_cache(request: Request) -> Optional[TranscriptCache]:
+    return _component(request, "transcript_cache")
+
+
+def get_channel_state(request: Request) -> ChannelStateStore:
+    return _component(request, "channel_state")
+
+
+def get_corpus(request: Request) -> Optional[CorpusStore]:
+    return _component(request, "corpus")
+
+
+def get_singleflight(request: Request) -> SingleFlight:
+    return _component(request, "singleflight")
+
+
+def get_quota(request: Request) -> QuotaManager:
+    return _component(request, "quota")
+
+
+def get_fetch_policy(request: Request) -> FetchPolicy:
+    return _component(request, "fetch_policy")
+
+
+def get_ytdlp(request: Request) -> YoutubeDLPool:
+    return _component(request, "ytdlp")
+
+
+def get_scheduler(request: Request) -> FairScheduler:
+    return _component(request, "scheduler")
+
+
+def get_embeddings(request: Request) -> EmbeddingPipeline:
+    return _component(request, "embeddings")
+
+
+def get_vector_store(request: Request) -> VectorStore:
+    return _component(request, "vector_store")
+
+
+def get_lexical(request: Request) -> LexicalStore:
+    return _component(request, "lexical")
+
+
+def get_retriever(request: Request) -> Retriever:
+    return _component(request, "retriever")
+
+
+def get_answers(request: Request) -> AnswerService:
+    return _component(request, "answers")
+
+
+def get_transcript_service(
+    http_client: "httpx.AsyncClient" = Depends(get_http_client),
+    cache: Optional[TranscriptCache] = Depends(get_transcript_cache),
+    channel_state: ChannelStateStore = Depends(get_channel_state),
+    singleflight: SingleFlight = Depends(get_singleflight),
+    quota: QuotaManager = Depends(get_quota),
+    ytdlp: YoutubeDLPool = Depends(get_ytdlp),
+    scheduler: FairScheduler = Depends(get_scheduler),
+    corpus: Optional[CorpusStore] = Depends(get_corpus),
+    fetch_policy: FetchPolicy = Depends(get_fetch_policy),
+) -> TranscriptService:
+    return TranscriptService(
+        http_client=http_client,
+        cache=cache,
+        channel_state=channel_state,
+        singleflight=singleflight,
+        quota=quota,
+        ytdlp=ytdlp,
+        scheduler=scheduler,
+        corpus=corpus,
+        fetch_policy=fetch_policy,
+    )
+
+
+def get_job_manager(request: Request) -> JobManager:
+    return _component(request, "job_manager")
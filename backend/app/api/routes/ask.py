@@ -0,0 +1,61 @@
+from typing import AsyncIterator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
+
+from ...services.answers import AnswerService
+from ..deps import get_answers
+from .transcripts import _encode_ndjson, _encode_sse
+
+router = APIRouter(prefix="/ask", tags=["ask"])
+
+
+class AskRequest(BaseModel):
+    channel_url: HttpUrl
+    question: str = Field(min_length=1, max_length=2000)
+    top_k: int = Field(default=5, ge=1, le=20)
+    mode: Literal["hybrid", "vector", "lexical"] = "hybrid"
+    # Set to false to always generate a fresh answer (it still gets cached)
+    use_cache: bool = True
+
+
+@router.post("")
+async def ask(
+    payload: AskRequest,
+    stream_format: Literal["sse", "ndjson"] = Query(default="sse", alias="format"),
+    answers: AnswerService = Depends(get_answers),
+) -> StreamingResponse:
+    """
+    Answer a question about an ingested channel, streamed as it is generated:
+    a ``sources`` event with the retrieved chunks, ``token`` events with
+    answer text, then ``done``. Cached answers arrive as one ``token`` event.
+    """
+    events = answers.ask(str(payload.channel_url), payload.question, payload.top_k, payload.mode, payload.use_cache)
+    # Retrieval happens before the first event, so a channel without an index is still a 404
+    try:
+        first = await events.__anext__()
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:  # pragma: no cover - unexpected
+        raise HTTPException(status_code=500, detail="Failed to answer question") from e
+
+    encode = _encode_sse if stream_format == "sse" else _encode_ndjson
+
+    async def body() -> AsyncIterator[str]:
+        yield encode(first)
+        try:
+            async for event in events:
+                yield encode(event)
+        except Exception as e:
+            yield encode({"type": "error", "detail": f"Failed to generate answer: {e}"})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,94 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, HttpUrl
+
+from ...services.captions import segments_to_text
+from ...services.corpus import ChannelCorpus, CorpusStore
+from ...services.vector_store import collection_for_channel
+from ..deps import get_corpus
+from .transcripts import CaptionSegment
+
+router = APIRouter(prefix="/corpus", tags=["corpus"])
+
+
+class CorpusVideo(BaseModel):
+    video_id: str
+    title: str
+    segments: int
+    chars: int
+    duration: float
+
+
+class CorpusVideosResponse(BaseModel):
+    total: int
+    offset: int
+    videos: list[CorpusVideo]
+
+
+class TranscriptPage(BaseModel):
+    video_id: str
+    title: str
+    total_segments: int
+    offset: int
+    # Offset of the following page, absent on the last one
+    next_offset: Optional[int] = None
+    segments: Optional[list[CaptionSegment]] = None
+    text: Optional[str] = None
+
+
+def _channel_corpus(channel_url: HttpUrl, corpus: Optional[CorpusStore]) -> ChannelCorpus:
+    if corpus is None:
+        raise HTTPException(status_code=404, detail="Transcript corpus is disabled")
+    collection = collection_for_channel(str(channel_url))
+    if not corpus.exists(collection):
+        raise HTTPException(status_code=404, detail="No stored transcripts for this channel; ingest it first")
+    return corpus.corpus(collection)
+
+
+@router.get("/videos", response_model=CorpusVideosResponse)
+async def list_videos(
+    channel_url: HttpUrl,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    corpus: Optional[CorpusStore] = Depends(get_corpus),
+) -> CorpusVideosResponse:
+    """Stored videos of a channel (title, segment count, text length, duration) without their text."""
+    channel = _channel_corpus(channel_url, corpus)
+    videos = [CorpusVideo(**entry.summary()) for entry in channel.videos(offset, limit)]
+    return CorpusVideosResponse(total=len(channel.entries), offset=offset, videos=videos)
+
+
+@router.get("/videos/{video_id}", response_model=TranscriptPage, response_model_exclude_none=True)
+async def read_transcript(
+    video_id: str,
+    channel_url: HttpUrl,
+    offset: int = Query(default=0, ge=0, description="First segment of the page"),
+    limit: int = Query(default=200, ge=1, le=5000, description="Segments per page"),
+    start: Optional[float] = Query(default=None, ge=0, description="Only segments from this second on"),
+    end: Optional[float] = Query(default=None, ge=0, description="Only segments before this second"),
+    output: Literal["segments", "text"] = Query(default="segments", alias="format"),
+    corpus: Optional[CorpusStore] = Depends(get_corpus),
+) -> TranscriptPage:
+    """
+    A page of one video's transcript: segments ``offset``..``offset + limit``,
+    optionally restricted to a ``start``..``end`` window (seconds). Only the
+    compressed blocks the page overlaps are read.
+    """
+    channel = _channel_corpus(channel_url, corpus)
+    entry = channel.get(video_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Video not stored for this channel")
+    # One extra segment tells whether another page follows
+    segments = channel.segments(video_id, offset, limit + 1, start, end)
+    more = len(segments) > limit
+    segments = segments[:limit]
+    return TranscriptPage(
+        video_id=video_id,
+        title=entry.title,
+        total_segments=entry.segments,
+        offset=offset,
+        next_offset=offset + limit if more else None,
+        segments=[CaptionSegment(**segment.to_dict()) for segment in segments] if output == "segments" else None,
+        text=segments_to_text(segments) if output == "text" else None,
+    )
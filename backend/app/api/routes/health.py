@@ -0,0 +1,48 @@
+import time
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from ...core.lazy import loaded_modules
+
+router = APIRouter(tags=["observability"])
+
+
+def _status(request: Request) -> Dict[str, Any]:
+    state = request.app.state
+    ready = getattr(state, "ready", False)
+    started = getattr(state, "started", False)
+    startup = getattr(state, "startup", None) or {}
+    started_at = getattr(state, "started_at", None)
+    if ready:
+        status = "ready"
+    elif startup.get("error"):
+        status = "failed"
+    else:
+        # warming: the API already serves, warm-up steps are still running
+        status = "warming" if started else "starting"
+    return {
+        "status": status,
+        "started": started,
+        "ready": ready,
+        "uptime_seconds": round(time.monotonic() - started_at, 3) if started_at is not None else 0.0,
+        "startup": startup,
+        "modules": loaded_modules(),
+    }
+
+
+@router.get("/health")
+async def health(request: Request) -> JSONResponse:
+    """Liveness: answers as soon as the server accepts connections, with startup and warm-up progress."""
+    body = _status(request)
+    return JSONResponse(body, status_code=503 if body["status"] == "failed" else 200)
+
+
+@router.get("/health/ready")
+async def readiness(request: Request) -> JSONResponse:
+    """Readiness: 200 once startup (and warm-up, if enabled) has finished; 503 until then."""
+    body = _status(request)
+    if body["ready"]:
+        return JSONResponse(body)
+    return JSONResponse(body, status_code=503, headers={"Retry-After": "1"})
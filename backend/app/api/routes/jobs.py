@@ -0,0 +1,173 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field, HttpUrl
+
+from ...services.jobs import ACTIVE_STATUSES, JobManager
+from ..deps import get_job_manager
+from .transcripts import FetchTranscriptsRequest, TranscriptItem
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+class JobVideo(BaseModel):
+    video_id: str
+    status: str
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    channel_url: str
+    incremental: bool
+    status: str
+    total: Optional[int] = None
+    completed: int
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    priority: str
+    weight: float
+    videos: list[JobVideo]
+
+
+class SubmitJobResponse(BaseModel):
+    job_id: str
+    status: str
+    # True when an ingestion of the same channel was already queued or running
+    coalesced: bool
+
+
+class JobResultResponse(BaseModel):
+    job_id: str
+    status: str
+    transcripts: list[TranscriptItem]
+
+
+class BatchChannel(BaseModel):
+    channel_url: HttpUrl
+    # Relative share of the fetch slots while this channel competes with the rest of the batch
+    weight: float = Field(default=1.0, gt=0, le=100)
+
+
+class BatchIngestRequest(BaseModel):
+    channels: list[BatchChannel] = Field(min_length=1, max_length=500)
+    incremental: bool = False
+
+
+class BatchJobRef(BaseModel):
+    channel_url: str
+    job_id: str
+    status: str
+    coalesced: bool
+
+
+class SubmitBatchResponse(BaseModel):
+    batch_id: str
+    jobs: list[BatchJobRef]
+
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    channel_url: str
+    status: str
+    priority: str
+    weight: float
+    total: Optional[int] = None
+    completed: int
+    progress: float
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    channels: int
+    channels_finished: int
+    # Unknown until every channel has been enumerated
+    videos_total: Optional[int] = None
+    videos_completed: int
+    elapsed_seconds: float
+    videos_per_second: float
+    jobs: list[BatchJobStatus]
+
+
+@router.post("/ingest", response_model=SubmitJobResponse, status_code=202)
+async def submit_ingest_job(
+    payload: FetchTranscriptsRequest,
+    jobs: JobManager = Depends(get_job_manager),
+) -> SubmitJobResponse:
+    """Queue a channel ingestion and return its job id immediately."""
+    try:
+        job, coalesced = jobs.submit(str(payload.channel_url), incremental=payload.incremental)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SubmitJobResponse(job_id=job.id, status=job.status, coalesced=coalesced)
+
+
+@router.post("/batch", response_model=SubmitBatchResponse, status_code=202)
+async def submit_batch_ingest(
+    payload: BatchIngestRequest,
+    jobs: JobManager = Depends(get_job_manager),
+) -> SubmitBatchResponse:
+    """
+    Queue many channels at bulk priority. Their video fetches are interleaved
+    fairly (by weight) under the global fetch concurrency and yield to
+    interactive requests; track them with ``GET /jobs/batches/{batch_id}``.
+    """
+    channels = [(str(channel.channel_url), payload.incremental, channel.weight) for channel in payload.channels]
+    try:
+        batch_id, submitted = jobs.submit_batch(channels)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SubmitBatchResponse(
+        batch_id=batch_id,
+        jobs=[
+            BatchJobRef(channel_url=job.channel_url, job_id=job.id, status=job.status, coalesced=coalesced)
+            for job, coalesced in submitted
+        ],
+    )
+
+
+@router.get("/batches/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(batch_id: str, jobs: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    batch = jobs.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str, jobs: JobManager = Depends(get_job_manager)) -> Dict[str, Any]:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse, response_model_exclude_none=True)
+async def get_job_result(
+    job_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    include_text: bool = True,
+    jobs: JobManager = Depends(get_job_manager),
+) -> JobResultResponse:
+    """
+    Transcripts fetched so far, in channel order; complete once the job status is
+    ``succeeded``. Page with ``offset``/``limit``; ``include_text=false`` returns
+    only text lengths.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in ACTIVE_STATUSES and not job.completed:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}; no results yet")
+    return JobResultResponse(
+        job_id=job.id, status=job.status, transcripts=jobs.results(job_id, offset, limit, include_text)
+    )
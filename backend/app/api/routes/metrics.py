@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ...core import metrics
+
+router = APIRouter(tags=["observability"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Prometheus text exposition of request, stage, quota and cache metrics."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,74 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field, HttpUrl
+
+from ...services.lexical_index import LexicalStore
+from ...services.retrieval import Retriever
+from ...services.vector_store import collection_for_channel
+from ..deps import get_lexical, get_retriever
+
+router = APIRouter(prefix="/retrieve", tags=["retrieve"])
+
+
+class RetrieveRequest(BaseModel):
+    channel_url: HttpUrl
+    question: str = Field(min_length=1)
+    top_k: int = Field(default=5, ge=1, le=50)
+    # hybrid = vector + BM25 fused by reciprocal rank
+    mode: Literal["hybrid", "vector", "lexical"] = "hybrid"
+
+
+class PhraseRequest(BaseModel):
+    channel_url: HttpUrl
+    phrase: str = Field(min_length=1)
+    limit: int = Field(default=10, ge=1, le=100)
+
+
+class RetrievedChunk(BaseModel):
+    chunk_id: str
+    video_id: str
+    title: str
+    start: float
+    end: float
+    text: str
+    score: Optional[float] = None
+    vector_score: Optional[float] = None
+    lexical_score: Optional[float] = None
+    # Phrase lookups: start time of the segment where the phrase occurs
+    match_time: Optional[float] = None
+
+
+class RetrieveResponse(BaseModel):
+    chunks: list[RetrievedChunk]
+
+
+@router.post("", response_model=RetrieveResponse, response_model_exclude_none=True)
+async def retrieve(payload: RetrieveRequest, retriever: Retriever = Depends(get_retriever)) -> RetrieveResponse:
+    """Top-k transcript chunks of an ingested channel for a question."""
+    try:
+        chunks = await retriever.retrieve(str(payload.channel_url), payload.question, payload.top_k, payload.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return RetrieveResponse(chunks=chunks)
+
+
+@router.post("/phrase", response_model=RetrieveResponse, response_model_exclude_none=True)
+async def retrieve_phrase(payload: PhraseRequest, lexical: LexicalStore = Depends(get_lexical)) -> RetrieveResponse:
+    """Chunks containing an exact phrase, with the time it is said."""
+    collection = collection_for_channel(str(payload.channel_url))
+    return RetrieveResponse(chunks=lexical.phrase(collection, payload.phrase, payload.limit))
+
+
+@router.get("/at", response_model=RetrievedChunk, response_model_exclude_none=True)
+async def retrieve_at(
+    channel_url: HttpUrl,
+    video_id: str,
+    t: float = Query(ge=0, description="Seconds into the video"),
+    lexical: LexicalStore = Depends(get_lexical),
+) -> RetrievedChunk:
+    """The chunk being spoken at a timestamp of a video."""
+    chunk = lexical.at_time(collection_for_channel(str(channel_url)), video_id, t)
+    if chunk is None:
+        raise HTTPException(status_code=404, detail="No indexed chunk for this video")
+    return RetrievedChunk(**chunk)
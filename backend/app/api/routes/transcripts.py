@@ -1,30 +1,87 @@
-from fastapi import APIRouter, HTTPException
+import json
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, HttpUrl
 
+from ...core.http import connection_stats
+from ...services.answers import AnswerService
+from ...services.corpus import CorpusStore
+from ...services.embeddings import EmbeddingPipeline
+from ...services.fetch_policy import FetchPolicy
+from ...services.lexical_index import LexicalStore
+from ...services.vector_store import VectorStore
+from ...services.transcript_cache import TranscriptCache
 from ...services.transcripts import TranscriptService
+from ...services.quota import QuotaManager
+from ...services.scheduler import FairScheduler
+from ...services.singleflight import SingleFlight
+from ..deps import (
+    get_answers,
+    get_corpus,
+    get_embeddings,
+    get_fetch_policy,
+    get_http_client,
+    get_lexical,
+    get_quota,
+    get_scheduler,
+    get_singleflight,
+    get_transcript_cache,
+    get_transcript_service,
+    get_vector_store,
+)
+
+if TYPE_CHECKING:
+    import httpx
 
 router = APIRouter(prefix="/transcripts", tags=["transcripts"])
 
 
 class FetchTranscriptsRequest(BaseModel):
     channel_url: HttpUrl
+    # Only fetch videos uploaded since the last sync of this channel
+    incremental: bool = False
+    # Also return timestamped caption segments (start/end in seconds)
+    include_segments: bool = False
+    # Set to false to return only each video's text length; page through the text via /corpus
+    include_text: bool = True
+
+
+class CaptionSegment(BaseModel):
+    start: float
+    end: float
+    text: str
 
 
 class TranscriptItem(BaseModel):
     video_id: str
     title: str
-    text: str
+    # "ok": the video's captions; "demo": placeholder text; "failed": no text, see reason
+    status: Literal["ok", "demo", "failed"] = "ok"
+    reason: Optional[str] = None
+    text: Optional[str] = None
+    # Text length, in place of the text when it was not requested
+    chars: Optional[int] = None
+    segments: Optional[list[CaptionSegment]] = None
 
 
 class FetchTranscriptsResponse(BaseModel):
     transcripts: list[TranscriptItem]
 
 
-@router.post("/fetch", response_model=FetchTranscriptsResponse)
-async def fetch_transcripts(payload: FetchTranscriptsRequest) -> FetchTranscriptsResponse:
+@router.post("/fetch", response_model=FetchTranscriptsResponse, response_model_exclude_none=True)
+async def fetch_transcripts(
+    payload: FetchTranscriptsRequest,
+    service: TranscriptService = Depends(get_transcript_service),
+) -> FetchTranscriptsResponse:
     try:
-        service = TranscriptService()
-        items = await service.fetch_channel_transcripts(channel_url=str(payload.channel_url))
+        items = await service.fetch_channel_transcripts(
+            channel_url=str(payload.channel_url),
+            incremental=payload.incremental,
+            include_segments=payload.include_segments,
+            include_text=payload.include_text,
+        )
         return FetchTranscriptsResponse(transcripts=items)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -32,3 +89,81 @@ async def fetch_transcripts(payload: FetchTranscriptsRequest) -> FetchTranscript
         raise HTTPException(status_code=500, detail="Failed to fetch transcripts") from e
 
 
+def _encode_ndjson(event: Dict[str, Any]) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def _encode_sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@router.post("/fetch/stream")
+async def fetch_transcripts_stream(
+    payload: FetchTranscriptsRequest,
+    stream_format: Literal["ndjson", "sse"] = Query(default="ndjson", alias="format"),
+    service: TranscriptService = Depends(get_transcript_service),
+) -> StreamingResponse:
+    """
+    Streaming variant of ``/fetch``: each transcript is sent as soon as it is
+    fetched, interleaved with progress events, as NDJSON or Server-Sent Events.
+    """
+    events = service.iter_ingest_events(
+        channel_url=str(payload.channel_url),
+        incremental=payload.incremental,
+        include_segments=payload.include_segments,
+    )
+    # Pull the first event eagerly so URL validation still maps to a 400
+    try:
+        first = await events.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:  # pragma: no cover - unexpected
+        raise HTTPException(status_code=500, detail="Failed to fetch transcripts") from e
+
+    encode = _encode_sse if stream_format == "sse" else _encode_ndjson
+
+    async def body() -> AsyncIterator[str]:
+        yield encode(first)
+        try:
+            async for event in events:
+                yield encode(event)
+        except Exception as e:  # pragma: no cover - unexpected
+            yield encode({"type": "error", "detail": f"Failed to fetch transcripts: {e}"})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def transcript_stats(
+    http_client: "httpx.AsyncClient" = Depends(get_http_client),
+    cache: Optional[TranscriptCache] = Depends(get_transcript_cache),
+    singleflight: SingleFlight = Depends(get_singleflight),
+    quota: QuotaManager = Depends(get_quota),
+    embeddings: EmbeddingPipeline = Depends(get_embeddings),
+    vectors: VectorStore = Depends(get_vector_store),
+    lexical: LexicalStore = Depends(get_lexical),
+    answers: AnswerService = Depends(get_answers),
+    scheduler: FairScheduler = Depends(get_scheduler),
+    corpus: Optional[CorpusStore] = Depends(get_corpus),
+    fetch_policy: FetchPolicy = Depends(get_fetch_policy),
+) -> Dict[str, Any]:
+    """Runtime counters for the ingestion, retrieval and answer pipeline (connections, retries, caches, coalescing, quota, indexes)."""
+    return {
+        "quota": quota.stats(),
+        "http": connection_stats(http_client),
+        "fetch": fetch_policy.stats(),
+        "cache": cache.stats() if cache else None,
+        "singleflight": singleflight.stats(),
+        "scheduler": scheduler.stats(),
+        "embeddings": embeddings.stats(),
+        "vectors": vectors.stats(),
+        "lexical": lexical.stats(),
+        "answers": answers.stats(),
+        "corpus": corpus.stats() if corpus else None,
+    }
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable
+from urllib.parse import urlsplit
+
+from .lazy import lazy_module
+from .settings import Settings
+
+if TYPE_CHECKING:
+    import httpx
+else:
+    httpx = lazy_module("httpx")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConnectionStats:
+    """Counts requests versus new TCP/TLS connections made by the shared client."""
+
+    requests: int = 0
+    tcp_connects: int = 0
+    tls_handshakes: int = 0
+
+    @property
+    def reused_requests(self) -> int:
+        return max(self.requests - self.tcp_connects, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["reused_requests"] = self.reused_requests
+        data["reuse_ratio"] = round(self.reused_requests / self.requests, 4) if self.requests else 0.0
+        return data
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """
+    Build the application-scoped AsyncClient: pooled keep-alive connections,
+    optional HTTP/2 and timeouts from settings. Connection reuse is tracked
+    via httpcore trace events and exposed as ``client.connection_stats``.
+    """
+    stats = ConnectionStats()
+
+    async def trace(event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            stats.tcp_connects += 1
+        elif event_name == "connection.start_tls.complete":
+            stats.tls_handshakes += 1
+
+    async def on_request(request: httpx.Request) -> None:
+        stats.requests += 1
+        request.extensions["trace"] = trace
+
+    http2 = settings.http2_enabled and _http2_available()
+    if settings.http2_enabled and not http2:
+        logger.warning("HTTP/2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+
+    client = httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(settings.request_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        event_hooks={"request": [on_request]},
+    )
+    client.connection_stats = stats  # type: ignore[attr-defined]
+    return client
+
+
+def connection_stats(client: httpx.AsyncClient) -> Dict[str, Any]:
+    stats = getattr(client, "connection_stats", None)
+    return stats.snapshot() if stats else {}
+
+
+async def warm_connections(client: httpx.AsyncClient, urls: Iterable[str], timeout: float = 2.0) -> Dict[str, bool]:
+    """
+    Open a pooled keep-alive connection to each URL's origin with a HEAD
+    request, so the first real call skips DNS, TCP and TLS setup. Any
+    response counts (the status is irrelevant); failures are only reported.
+    """
+    origins = sorted({f"{parts.scheme}://{parts.netloc}" for parts in map(urlsplit, urls) if parts.netloc})
+
+    async def connect(origin: str) -> bool:
+        try:
+            await client.head(origin, timeout=timeout)
+        except httpx.HTTPError as e:
+            logger.info("pre-connect failed", extra={"origin": origin, "error": type(e).__name__})
+            return False
+        return True
+
+    results = await asyncio.gather(*(connect(origin) for origin in origins))
+    return dict(zip(origins, results))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, Sequence
+
+# Third-party modules that dominate import time; loaded on first use or by the warm-up
+HEAVY_MODULES = ("httpx", "numpy", "yt_dlp")
+
+_registry_lock = threading.Lock()
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access, so
+    ``np = lazy_module("numpy")`` keeps ``np.zeros(...)`` working unchanged
+    while importing the service costs nothing until numpy is actually used.
+    Attributes are cached on the stand-in after their first lookup, so hot
+    paths pay the indirection once per name. Only dunder names live on the
+    class, so no module attribute (``np.load``) is shadowed.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["__name__"] = name
+        self.__dict__["__module"] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(load(self), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        raise AttributeError(f"Cannot set {attr!r} on lazy module {self.__dict__['__name__']!r}")
+
+    def __repr__(self) -> str:
+        name = self.__dict__["__name__"]
+        return f"<lazy module {name!r} ({'loaded' if name in sys.modules else 'not loaded'})>"
+
+
+_modules: Dict[str, LazyModule] = {}
+
+
+def lazy_module(name: str) -> LazyModule:
+    """The shared stand-in for ``name``; nothing is imported yet."""
+    with _registry_lock:
+        module = _modules.get(name)
+        if module is None:
+            module = _modules[name] = LazyModule(name)
+        return module
+
+
+def load(module: LazyModule) -> ModuleType:
+    """The real module behind a stand-in, importing it if needed."""
+    real = module.__dict__["__module"]
+    if real is None:
+        # The import system serializes concurrent imports of one module
+        real = importlib.import_module(module.__dict__["__name__"])
+        module.__dict__["__module"] = real
+    return real
+
+
+def preload(names: Sequence[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """Import ``names`` now (blocking); returns seconds spent per module, ~0 if already loaded."""
+    timings: Dict[str, float] = {}
+    for name in names:
+        started = time.perf_counter()
+        load(lazy_module(name))
+        timings[name] = round(time.perf_counter() - started, 4)
+    return timings
+
+
+def loaded_modules(names: Sequence[str] = HEAVY_MODULES) -> Dict[str, bool]:
+    return {name: name in sys.modules for name in names}
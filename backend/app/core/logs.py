@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Id of the HTTP request (or ingestion job) being handled; attached to every log record
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in record.__dict__.items() if key not in _RESERVED}
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    One line per record: JSON objects (``json``) or ``key=value`` pairs after
+    the message (``text``), with the request id and any ``extra=`` fields.
+    """
+
+    def __init__(self, fmt: str = "text"):
+        super().__init__()
+        self.fmt = fmt
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = record_fields(record)
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            fields["request_id"] = request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z"
+        if self.fmt == "json":
+            data = {"ts": timestamp, "level": record.levelname, "logger": record.name, "msg": record.getMessage()}
+            data.update(fields)
+            if record.exc_text:
+                data["exc"] = record.exc_text
+            return json.dumps(data, ensure_ascii=False, default=str)
+        pairs = " ".join(f"{key}={_text_value(value)}" for key, value in fields.items())
+        line = f"{timestamp} {record.levelname:<7} {record.name} {record.getMessage()}"
+        line = f"{line} {pairs}" if pairs else line
+        return f"{line}\n{record.exc_text}" if record.exc_text else line
+
+
+def _text_value(value: Any) -> str:
+    text = str(value)
+    return json.dumps(text, ensure_ascii=False) if (not text or " " in text or '"' in text) else text
+
+
+class _RequestIdFilter(logging.Filter):
+    """Runs in the logging thread of the caller, where the request's context is still set."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text") -> None:
+    """
+    Route the ``app`` logger tree through a queue: callers only enqueue the
+    record, and a background thread formats it and writes to stdout, so slow
+    terminals or log shippers never stall the event loop. Idempotent.
+    """
+    global _listener
+    logger = logging.getLogger("app")
+    logger.setLevel(level.upper())
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.setFormatter(StructuredFormatter(fmt))
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(StructuredFormatter(fmt))
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = logging.handlers.QueueHandler(records)
+    handler.addFilter(_RequestIdFilter())
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        # Flushes records still in the queue
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+logger = logging.getLogger("app.spans")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: "Optional[Registry]" = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        header = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return header + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+
+class _CounterChild:
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric: "Counter", key: Tuple[str, ...]):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._metric._add(self._key, amount)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def labels(self, **labels: str) -> _CounterChild:
+        return _CounterChild(self, self._key(labels))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._add((), amount)
+
+    def _add(self, key: Tuple[str, ...], amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def total(self) -> float:
+        """Sum over all label sets."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down; ``set_function`` reads it at scrape time instead."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        self._function = function
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return [f"{self.name} {_format_value(self._function())}"]
+            except Exception:  # a failing callback must not break the scrape
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class _HistogramChild:
+    __slots__ = ("_metric", "_state")
+
+    def __init__(self, metric: "Histogram", state: list):
+        self._metric = metric
+        self._state = state
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._state, value)
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last = +Inf), sum, count]
+        self._states: Dict[Tuple[str, ...], list] = {}
+
+    def labels(self, **labels: str) -> _HistogramChild:
+        key = self._key(labels)
+        state = self._states.get(key)
+        if state is None:
+            with self._lock:
+                state = self._states.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+        return _HistogramChild(self, state)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _observe(self, state: list, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            items = sorted((key, [list(state[0]), state[1], state[2]]) for key, state in self._states.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Dependency-free Prometheus metrics: counters, gauges and histograms with
+    labels, rendered in the text exposition format served at ``/metrics``.
+    Updates are a dict lookup plus a locked add, cheap enough for hot paths.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = Counter("ytchat_http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "ytchat_http_request_duration_seconds", "HTTP request latency including streamed bodies", ["method", "route"]
+)
+STAGE_SECONDS = Histogram("ytchat_stage_duration_seconds", "Duration of ingestion and answer pipeline stages", ["stage"])
+YOUTUBE_API_CALLS = Counter("ytchat_youtube_api_calls_total", "YouTube Data API responses", ["endpoint", "status"])
+QUOTA_UNITS = Counter("ytchat_youtube_quota_units_total", "YouTube Data API quota units consumed", ["operation"])
+QUOTA_USED = Gauge("ytchat_youtube_quota_used_units", "Quota units used today (shared by all workers)")
+API_RATE = Gauge("ytchat_youtube_api_rate_per_second", "Current adaptive YouTube API call rate")
+CACHE_LOOKUPS = Counter("ytchat_cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"])
+DEMO_FALLBACKS = Counter("ytchat_demo_fallbacks_total", "Fallbacks to demo transcripts by reason", ["reason"])
+FETCH_FAILURES = Counter(
+    "ytchat_transcript_fetch_failures_total", "Videos whose transcript could not be fetched, by reason", ["reason"]
+)
+FETCH_RETRIES = Counter("ytchat_fetch_retries_total", "Retried upstream requests by host and reason", ["host", "reason"])
+CIRCUIT_STATE = Gauge("ytchat_circuit_state", "Upstream circuit breaker state (0 closed, 1 half-open, 2 open)", ["host"])
+HEDGED_REQUESTS = Counter("ytchat_hedged_requests_total", "Hedged timedtext downloads sent and won", ["outcome"])
+STARTUP_SECONDS = Gauge("ytchat_startup_phase_seconds", "Duration of startup and warm-up phases", ["phase"])
+READY = Gauge("ytchat_ready", "1 once startup and warm-up have finished")
+SCHEDULER_WAIT_SECONDS = Histogram(
+    "ytchat_fetch_slot_wait_seconds", "Time video fetches waited for a global fetch slot", ["priority"]
+)
+
+
+@contextmanager
+def span(stage: str, **fields) -> Iterator[Dict[str, object]]:
+    """
+    Time a pipeline stage into ``ytchat_stage_duration_seconds{stage=...}``
+    and emit a debug log record with its duration. Yields ``fields`` so the
+    block can attach results (e.g. a count) to the log record.
+    """
+    started = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(stage=stage).observe(elapsed)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("span", extra={"stage": stage, "duration_ms": round(elapsed * 1000, 3), **fields})
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from .logs import request_id_var
+from .metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
+
+logger = logging.getLogger("app.access")
+
+_VALID_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Scrapes and probes would drown out real traffic in the access log
+_QUIET_PATHS = {"/metrics", "/health", "/health/ready"}
+
+
+class RequestIdMiddleware:
+    """
+    Plain ASGI middleware (no response buffering, so streamed bodies pass
+    through untouched). Takes the caller's ``X-Request-ID`` or generates one,
+    exposes it to log records through a context variable, echoes it on the
+    response and records request count and latency per route template.
+    """
+
+    def __init__(self, app: Callable, header: str = "x-request-id"):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self._routes: Optional[Dict[Any, str]] = None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers") or []).get(self.header, b"").decode("latin-1")
+        request_id = incoming if _VALID_ID.match(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_id(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (self.header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            method = scope["method"]
+            route = self._route(scope)
+            HTTP_REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+            HTTP_REQUEST_SECONDS.labels(method=method, route=route).observe(elapsed)
+            if scope["path"] not in _QUIET_PATHS:
+                logger.info(
+                    "request",
+                    extra={
+                        "method": method,
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round(elapsed * 1000, 2),
+                    },
+                )
+            request_id_var.reset(token)
+
+    def _route(self, scope: Dict[str, Any]) -> str:
+        """Route template (``/api/jobs/{job_id}``) rather than the raw path, to bound label cardinality."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._routes is None:
+            app = scope.get("app")
+            self._routes = {
+                route.endpoint: route.path for route in getattr(app, "routes", []) if hasattr(route, "endpoint")
+            }
+        return self._routes.get(endpoint, "unmatched")
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List, Union
+from typing import List, Literal, Union
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
@@ -13,11 +13,146 @@ class Settings(BaseSettings):
         default="http://localhost:3000,http://127.0.0.1:3000"
     )
 
+    # Logging (records are written by a background thread; "json" for log shippers)
+    log_level: str = Field(default="INFO")
+    log_format: Literal["text", "json"] = Field(default="text")
+
     # Timeouts
     request_timeout_seconds: int = 60
 
+    # Startup: without warm-up, the server only accepts requests once everything is loaded
+    warmup_enabled: bool = Field(
+        default=False,
+        description="Start serving at once and load dependencies, connections and indexes in the background",
+    )
+    warmup_preconnect: bool = Field(
+        default=True, description="During startup, open pooled connections to the configured upstream hosts"
+    )
+
+    # Shared outbound HTTP client
+    http_max_connections: int = Field(default=20, ge=1)
+    http_max_keepalive_connections: int = Field(default=20, ge=0)
+    http_keepalive_expiry_seconds: float = Field(default=30.0, ge=0)
+    http2_enabled: bool = Field(default=True, description="Use HTTP/2 when the 'h2' package is installed")
+
     # YouTube Data API (optional for demo mode)
     youtube_api_key: str = Field(default="", description="YouTube Data API v3 key (optional for demo mode)")
+    youtube_api_base_url: str = Field(default="https://www.googleapis.com/youtube/v3")
+
+    # Transcript fetching
+    max_videos_per_channel: int = Field(default=2, ge=1, description="Upper bound on videos ingested per channel")
+    incremental_scan_limit: int = Field(
+        default=2000, ge=1, description="Max new uploads an incremental sync lists while looking for its watermark"
+    )
+    transcript_fetch_concurrency: int = Field(default=4, ge=1, description="Max videos fetched in parallel")
+    youtube_api_rate_per_second: float = Field(default=2.0, gt=0, description="Max sustained YouTube API calls per second")
+    youtube_api_min_rate_per_second: float = Field(default=0.1, gt=0, description="Floor the adaptive rate backs off to")
+    youtube_api_burst: int = Field(default=4, ge=1, description="Burst size for YouTube API calls")
+
+    # Upstream fetch resilience (429/5xx/timeouts are retried; other errors fail the video)
+    fetch_retry_attempts: int = Field(default=3, ge=1, description="Attempts per upstream request (1 = no retries)")
+    fetch_retry_base_delay_seconds: float = Field(
+        default=0.25, ge=0, description="First retry backoff; doubles per retry, with full jitter"
+    )
+    fetch_retry_max_delay_seconds: float = Field(default=8.0, ge=0)
+    fetch_retry_max_retry_after_seconds: float = Field(
+        default=30.0, ge=0, description="Fail instead of waiting out a longer Retry-After"
+    )
+    circuit_failure_threshold: int = Field(
+        default=5, ge=1, description="Consecutive failures that open a host's circuit"
+    )
+    circuit_reset_seconds: float = Field(default=30.0, gt=0, description="Open time before one probe request")
+    timedtext_hedge_enabled: bool = Field(
+        default=False, description="Send a second caption download when the first is slower than usual"
+    )
+    timedtext_hedge_quantile: float = Field(
+        default=0.95, gt=0, lt=1, description="Recent download latency quantile after which to hedge"
+    )
+    timedtext_hedge_min_delay_seconds: float = Field(default=0.05, ge=0)
+
+    # Quota accounting shared by all workers (resets at midnight Pacific Time)
+    youtube_daily_quota: int = Field(default=1000, ge=0, description="Conservative limit (10% of 10,000 daily quota)")
+    quota_db_path: str = Field(default="data/quota.sqlite3")
+
+    # Transcript cache (SQLite)
+    transcript_cache_enabled: bool = Field(default=True)
+    transcript_cache_path: str = Field(default="data/transcript_cache.sqlite3")
+    transcript_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, ge=0)
+    transcript_cache_max_bytes: int = Field(default=256 * 1024 * 1024, ge=0)
+
+    # Per-channel sync watermarks for incremental ingestion
+    channel_state_path: str = Field(default="data/channel_state.sqlite3")
+
+    # Per-channel compressed transcript corpus (paged/sliced reads without loading full text)
+    corpus_enabled: bool = Field(default=True)
+    corpus_path: str = Field(default="data/corpus", description="Directory of per-channel transcript corpora")
+    corpus_codec: Literal["auto", "zstd", "zlib", "none"] = Field(
+        default="auto", description="Block compression; auto = zstd, or zlib if 'zstandard' is missing"
+    )
+    corpus_block_segments: int = Field(default=256, ge=1, description="Caption segments per compressed block")
+
+    # Background ingestion jobs
+    jobs_db_path: str = Field(default="data/jobs.sqlite3")
+    ingest_workers: int = Field(default=2, ge=1, description="Concurrent interactive ingestion jobs")
+    batch_ingest_workers: int = Field(default=8, ge=1, description="Channels of batch ingestions processed at once")
+    ingest_global_concurrency: int = Field(
+        default=16, ge=1, description="Video fetches in flight across all channels, requests and jobs"
+    )
+    bulk_quota_reserve: int = Field(
+        default=100, ge=0, description="Daily quota units batch ingestion leaves for interactive requests"
+    )
+    job_lease_seconds: float = Field(
+        default=60.0, gt=0, description="Running jobs not renewed within this time are requeued"
+    )
+
+    # yt-dlp channel enumeration / metadata extraction
+    ytdlp_workers: int = Field(default=4, ge=1, description="Parallel yt-dlp extractions")
+    ytdlp_executor: Literal["thread", "process"] = Field(
+        default="thread", description="Run yt-dlp in a thread pool or a process pool"
+    )
+
+    # Chunking + embeddings
+    chunk_max_chars: int = Field(default=1000, ge=100, description="Max characters per transcript chunk")
+    chunk_overlap_chars: int = Field(default=200, ge=0, description="Trailing text repeated at the start of the next chunk")
+    embedding_provider: Literal["hashing", "sentence-transformers", "ollama"] = Field(default="hashing")
+    embedding_model: str = Field(default="", description="Model name for the provider (empty = provider default)")
+    embedding_dim: int = Field(default=384, ge=8, description="Vector size of the hashing embedder")
+    embedding_batch_size: int = Field(default=32, ge=1)
+    embedding_cache_enabled: bool = Field(default=True)
+    embedding_cache_path: str = Field(default="data/embeddings.sqlite3")
+    ollama_base_url: str = Field(default="http://localhost:11434")
+
+    # Vector store (one collection per channel)
+    vector_store: Literal["local", "qdrant"] = Field(default="local")
+    vector_store_path: str = Field(default="data/vectors", description="Directory of the local vector store")
+    vector_dtype: Literal["float32", "float16"] = Field(default="float32", description="On-disk type of local vectors (searched as float32)")
+    vector_ann_threshold: int = Field(
+        default=50_000, ge=0, description="Points per collection before an IVF index is built (0 = always exact)"
+    )
+    vector_ann_nprobe: int = Field(default=16, ge=1, description="IVF lists scanned per query")
+    qdrant_url: str = Field(default="http://localhost:6333")
+    qdrant_collection_prefix: str = Field(default="youtube_transcripts")
+
+    # Lexical (BM25) index and hybrid retrieval
+    lexical_index_path: str = Field(default="data/lexical", description="Directory of per-channel BM25 indexes")
+    bm25_k1: float = Field(default=1.2, ge=0)
+    bm25_b: float = Field(default=0.75, ge=0, le=1)
+    hybrid_rrf_k: int = Field(default=60, ge=1, description="Reciprocal rank fusion constant")
+    hybrid_lexical_weight: float = Field(default=1.0, ge=0, description="Weight of BM25 ranks relative to vector ranks")
+
+    # Question answering (streams from the LLM; the fake provider needs no model server)
+    llm_provider: Literal["ollama", "fake"] = Field(default="ollama")
+    llm_model: str = Field(default="llama3.2", description="Ollama chat model")
+    llm_temperature: float = Field(default=0.2, ge=0)
+    llm_max_tokens: int = Field(default=512, ge=1, description="Max tokens generated per answer")
+    llm_timeout_seconds: float = Field(default=120.0, gt=0, description="Max wait for the next streamed token")
+    fake_llm_token_delay_ms: float = Field(default=0.0, ge=0, description="Per-token delay of the fake LLM")
+    answer_cache_enabled: bool = Field(default=True)
+    answer_cache_path: str = Field(default="data/answers.sqlite3")
+    answer_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, ge=0)
+    answer_cache_similarity: float = Field(
+        default=0.92, gt=0, le=1, description="Min question embedding similarity for a near-duplicate cache hit"
+    )
 
     @field_validator('cors_allow_origins', mode='before')
     @classmethod
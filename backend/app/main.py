@@ -1,13 +1,221 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Dict, List, Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .core.settings import get_settings
+from .core import lazy
+from .core.http import create_http_client, warm_connections
+from .core.logs import configure_logging
+from .core.metrics import API_RATE, QUOTA_USED, READY, STARTUP_SECONDS
+from .core.middleware import RequestIdMiddleware
+from .core.settings import Settings, get_settings
+from .services.answers import AnswerService
+from .services.channel_sync import ChannelStateStore
+from .services.corpus import CorpusStore
+from .services.embeddings import EmbeddingPipeline
+from .services.fetch_policy import FetchPolicy
+from .services.jobs import JobManager
+from .services.lexical_index import LexicalStore
+from .services.llm import create_llm
+from .services.quota import QuotaManager
+from .services.retrieval import Retriever
+from .services.scheduler import FairScheduler
+from .services.singleflight import SingleFlight
+from .services.transcript_cache import TranscriptCache
+from .services.transcripts import TranscriptService
+from .services.vector_store import create_vector_store
+from .services.ytdlp_pool import YoutubeDLPool
+from .api.routes.ask import router as ask_router
+from .api.routes.corpus import router as corpus_router
+from .api.routes.health import router as health_router
+from .api.routes.jobs import router as jobs_router
+from .api.routes.metrics import router as metrics_router
+from .api.routes.retrieve import router as retrieve_router
 from .api.routes.transcripts import router as transcripts_router
 
+logger = logging.getLogger(__name__)
+
+
+async def _timed(report: Dict[str, Any], phase: str, step: Awaitable[Any], required: bool = False) -> Any:
+    """Await one startup step and record its duration; optional steps only log their failure."""
+    started = time.perf_counter()
+    try:
+        return await step
+    except Exception as e:
+        if required:
+            raise
+        report["errors"][phase] = f"{type(e).__name__}: {e}"
+        logger.warning("warm-up step failed", extra={"phase": phase, "error": report["errors"][phase]})
+    finally:
+        elapsed = round(time.perf_counter() - started, 4)
+        report["phases"][phase] = elapsed
+        STARTUP_SECONDS.set(elapsed, phase=phase)
+
+
+def _upstream_urls(settings: Settings) -> List[str]:
+    """Hosts the app will call, for pre-connecting the shared HTTP pool."""
+    urls = []
+    if settings.youtube_api_key:
+        urls.append(settings.youtube_api_base_url)
+    if settings.llm_provider == "ollama" or settings.embedding_provider == "ollama":
+        urls.append(settings.ollama_base_url)
+    if settings.vector_store == "qdrant":
+        urls.append(settings.qdrant_url)
+    return urls
+
+
+async def _build_state(app: FastAPI, settings: Settings) -> None:
+    # One pooled client for the whole app so outbound calls reuse connections
+    app.state.http_client = create_http_client(settings)
+    app.state.transcript_cache = (
+        TranscriptCache.from_settings(settings) if settings.transcript_cache_enabled else None
+    )
+    app.state.channel_state = ChannelStateStore.from_settings(settings)
+    # Compressed per-channel transcripts, read back page by page
+    app.state.corpus = CorpusStore.from_settings(settings) if settings.corpus_enabled else None
+    app.state.singleflight = SingleFlight()
+    app.state.quota = QuotaManager.from_settings(settings)
+    # Retries, per-host circuit breakers and hedged downloads for every upstream call
+    app.state.fetch_policy = FetchPolicy.from_settings(settings)
+    QUOTA_USED.set_function(app.state.quota.used_today)
+    API_RATE.set_function(lambda: app.state.quota.stats()["rate_per_second"])
+    app.state.ytdlp = YoutubeDLPool.from_settings(settings)
+    # Global video fetch slots: interactive requests first, channels interleaved fairly
+    app.state.scheduler = FairScheduler.from_settings(settings)
+    # Chunking + batched, hash-memoized embeddings for transcripts as they are ingested.
+    # Off the event loop: a local embedding model loads its weights here
+    app.state.embeddings = await asyncio.to_thread(EmbeddingPipeline.from_settings, settings, app.state.http_client)
+    app.state.vector_store = create_vector_store(settings, app.state.http_client)
+    app.state.lexical = LexicalStore(settings.lexical_index_path, k1=settings.bm25_k1, b=settings.bm25_b)
+    app.state.retriever = Retriever.from_settings(
+        settings, app.state.embeddings, app.state.vector_store, app.state.lexical
+    )
+    app.state.llm = create_llm(settings, app.state.http_client)
+    app.state.answers = AnswerService.from_settings(settings, app.state.retriever, app.state.llm)
+    app.state.job_manager = JobManager.from_settings(
+        settings,
+        service_factory=lambda **options: TranscriptService(
+            http_client=app.state.http_client,
+            cache=app.state.transcript_cache,
+            channel_state=app.state.channel_state,
+            singleflight=app.state.singleflight,
+            quota=app.state.quota,
+            ytdlp=app.state.ytdlp,
+            scheduler=app.state.scheduler,
+            corpus=app.state.corpus,
+            fetch_policy=app.state.fetch_policy,
+            **options,
+        ),
+        embeddings=app.state.embeddings,
+        vectors=app.state.vector_store,
+        lexical=app.state.lexical,
+        answers=app.state.answers.cache,
+        corpus=app.state.corpus,
+    )
+
+
+async def _start(app: FastAPI, settings: Settings) -> None:
+    """
+    Build the app state and, with warm-up enabled, load everything the first
+    requests would otherwise pay for: heavy modules before the state, then
+    warm yt-dlp instances, on-disk indexes, the embedding model and pooled
+    upstream connections while the API is already serving.
+    """
+    report = app.state.startup
+    warm = settings.warmup_enabled
+    if warm:
+        report["imports"] = await _timed(report, "imports", asyncio.to_thread(lazy.preload), required=True)
+    await _timed(report, "state", _build_state(app, settings), required=True)
+    await app.state.job_manager.start()
+    # The API serves from here; the steps below only make the first requests faster
+    app.state.started = True
+    if warm:
+        # What queries need first; yt-dlp instances are CPU-bound and would slow those down
+        steps = [
+            _timed(report, "vector_index", asyncio.to_thread(app.state.vector_store.warm_up)),
+            _timed(report, "lexical_index", asyncio.to_thread(app.state.lexical.warm_up)),
+            _timed(report, "embedder", app.state.embeddings.warm_up()),
+        ]
+        if settings.warmup_preconnect:
+            steps.append(
+                _timed(report, "connections", warm_connections(app.state.http_client, _upstream_urls(settings)))
+            )
+        await asyncio.gather(*steps)
+        await _timed(report, "ytdlp", app.state.ytdlp.warm_up())
+    report["ready_after_seconds"] = round(time.monotonic() - app.state.started_at, 4)
+    app.state.ready = True
+    READY.set(1)
+    logger.info("backend ready", extra={"warmup": warm, "ready_after_seconds": report["ready_after_seconds"]})
+
+
+async def _start_in_background(app: FastAPI, settings: Settings) -> None:
+    try:
+        await _start(app, settings)
+    except Exception as e:
+        # The server keeps running so /health can report why it never became ready
+        app.state.startup["error"] = f"{type(e).__name__}: {e}"
+        logger.exception("backend startup failed")
+
+
+async def _shutdown(app: FastAPI) -> None:
+    """Close whatever was built; a cancelled warm-up may have left the state partial."""
+    state = app.state
+    state.started = state.ready = False
+    READY.set(0)
+    if getattr(state, "job_manager", None) is not None:
+        await state.job_manager.stop()
+    QUOTA_USED.set_function(None)
+    API_RATE.set_function(None)
+    if getattr(state, "http_client", None) is not None:
+        await state.http_client.aclose()
+    if getattr(state, "ytdlp", None) is not None:
+        state.ytdlp.shutdown()
+    for name in ("channel_state", "quota", "embeddings", "answers"):
+        if getattr(state, name, None) is not None:
+            getattr(state, name).close()
+    if getattr(state, "vector_store", None) is not None:
+        await state.vector_store.close()
+    for name in ("transcript_cache", "corpus"):
+        if getattr(state, name, None) is not None:
+            getattr(state, name).close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    app.state.started = app.state.ready = False
+    app.state.started_at = time.monotonic()
+    app.state.startup = {
+        "warmup": settings.warmup_enabled,
+        "phases": {},
+        "errors": {},
+        "imports": {},
+        "ready_after_seconds": None,
+        "error": None,
+    }
+    startup: Optional[asyncio.Task] = None
+    if settings.warmup_enabled:
+        # Accept connections right away; the API answers 503 until the state is built
+        startup = asyncio.create_task(_start_in_background(app, settings), name="warmup")
+    else:
+        await _start(app, settings)
+    try:
+        yield
+    finally:
+        if startup is not None and not startup.done():
+            startup.cancel()
+            await asyncio.gather(startup, return_exceptions=True)
+        await _shutdown(app)
+
 
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title="YouTube Channel Q&A Backend", version="0.1.0")
+    configure_logging(settings.log_level, settings.log_format)
+    app = FastAPI(title="YouTube Channel Q&A Backend", version="0.1.0", lifespan=lifespan)
 
     # CORS
     app.add_middleware(
@@ -16,14 +224,21 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Request-ID"],
     )
+    # Outermost: every request (including CORS preflights) gets an id, access log and metrics
+    app.add_middleware(RequestIdMiddleware)
 
     # Routers
     app.include_router(transcripts_router, prefix="/api")
+    app.include_router(jobs_router, prefix="/api")
+    app.include_router(retrieve_router, prefix="/api")
+    app.include_router(ask_router, prefix="/api")
+    app.include_router(corpus_router, prefix="/api")
+    app.include_router(metrics_router)
+    app.include_router(health_router)
 
     return app
 
 
 app = create_app()
-
-
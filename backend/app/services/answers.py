@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from ..core.lazy import lazy_module
+from ..core.metrics import CACHE_LOOKUPS, STAGE_SECONDS, span
+from ..core.settings import Settings
+from .llm import LLM
+from .retrieval import Retriever
+from .vector_store import collection_for_channel
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key         TEXT PRIMARY KEY,
+    collection  TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    question    TEXT NOT NULL,
+    chunk_ids   TEXT NOT NULL,
+    answer      TEXT NOT NULL,
+    sources     TEXT NOT NULL,
+    vector      BLOB,
+    created_at  REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS answers_collection ON answers (collection, model);
+"""
+
+_SPACE_RE = re.compile(r"\s+")
+_TRAILING_RE = re.compile(r"[\s?!.,;:]+$")
+
+# A near-duplicate question must also be answered from mostly the same chunks
+_MIN_SOURCE_OVERLAP = 0.5
+
+
+def normalize_question(question: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a question."""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    return _TRAILING_RE.sub("", _SPACE_RE.sub(" ", text).strip())
+
+
+def answer_key(model: str, collection: str, question: str, chunk_ids: Sequence[str]) -> str:
+    raw = "\x1f".join([model, collection, normalize_question(question), *sorted(chunk_ids)])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class CachedAnswer:
+    key: str
+    question: str
+    answer: str
+    sources: List[Dict[str, Any]] = field(default_factory=list)
+    # "exact" (same normalized question and chunks) or "similar" (near-duplicate question)
+    match: str = "exact"
+    similarity: float = 1.0
+
+
+@dataclass
+class _QuestionIndex:
+    """In-memory question vectors of one (collection, model), for near-duplicate lookups."""
+
+    keys: List[str] = field(default_factory=list)
+    chunk_ids: List[frozenset] = field(default_factory=list)
+    vectors: List[np.ndarray] = field(default_factory=list)
+    _matrix: Optional[np.ndarray] = None
+
+    def add(self, key: str, chunk_ids: Sequence[str], vector: np.ndarray) -> None:
+        self.keys.append(key)
+        self.chunk_ids.append(frozenset(chunk_ids))
+        self.vectors.append(vector)
+        self._matrix = None
+
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.stack(self.vectors)
+        return self._matrix
+
+
+class AnswerCache:
+    """
+    Generated answers in SQLite, keyed by (model, channel collection,
+    normalized question, retrieved chunk ids). Each entry also stores the
+    question's embedding: a paraphrase of a cached question whose retrieval
+    lands on mostly the same chunks is served the cached answer.
+    Entries expire after ``ttl_seconds`` and a channel's entries are dropped
+    when it is re-ingested.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, similarity: float):
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._indexes: Dict[tuple, _QuestionIndex] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AnswerCache":
+        return cls(settings.answer_cache_path, settings.answer_cache_ttl_seconds, settings.answer_cache_similarity)
+
+    def _index(self, collection: str, model: str) -> _QuestionIndex:
+        # Caller holds the lock
+        index = self._indexes.get((collection, model))
+        if index is None:
+            index = _QuestionIndex()
+            rows = self._conn.execute(
+                "SELECT key, chunk_ids, vector FROM answers "
+                "WHERE collection = ? AND model = ? AND vector IS NOT NULL AND created_at >= ?",
+                (collection, model, time.time() - self.ttl_seconds),
+            ).fetchall()
+            for key, chunk_ids, blob in rows:
+                index.add(key, json.loads(chunk_ids), np.frombuffer(blob, dtype=np.float32))
+            self._indexes[(collection, model)] = index
+        return index
+
+    def _load(self, key: str) -> Optional[CachedAnswer]:
+        row = self._conn.execute(
+            "SELECT question, answer, sources, created_at FROM answers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[3] >= self.ttl_seconds:
+            return None
+        self._conn.execute("UPDATE answers SET hits = hits + 1 WHERE key = ?", (key,))
+        return CachedAnswer(key, row[0], row[1], json.loads(row[2]))
+
+    def get(
+        self,
+        model: str,
+        collection: str,
+        question: str,
+        chunk_ids: Sequence[str],
+        vector: Optional[np.ndarray] = None,
+    ) -> Optional[CachedAnswer]:
+        key = answer_key(model, collection, question, chunk_ids)
+        with self._lock:
+            cached = self._load(key)
+            if cached is not None:
+                self.exact_hits += 1
+                CACHE_LOOKUPS.labels(cache="answer", result="hit").inc()
+                return cached
+            if vector is not None and chunk_ids:
+                index = self._index(collection, model)
+                if index.keys and len(vector) == index.matrix().shape[1]:
+                    similar = self._nearest(index, vector, frozenset(chunk_ids))
+                    if similar is not None:
+                        cached = self._load(similar[0])
+                        if cached is not None:
+                            cached.match, cached.similarity = "similar", similar[1]
+                            self.similar_hits += 1
+                            CACHE_LOOKUPS.labels(cache="answer", result="similar").inc()
+                            return cached
+        self.misses += 1
+        CACHE_LOOKUPS.labels(cache="answer", result="miss").inc()
+        return None
+
+    def _nearest(self, index: _QuestionIndex, vector: np.ndarray, chunk_ids: frozenset) -> Optional[tuple]:
+        scores = index.matrix() @ vector
+        for row in np.argsort(-scores):
+            score = float(scores[row])
+            if score < self.similarity:
+                break
+            cached_ids = index.chunk_ids[row]
+            if len(cached_ids & chunk_ids) >= _MIN_SOURCE_OVERLAP * len(cached_ids):
+                return index.keys[row], round(score, 4)
+        return None
+
+    def put(
+        self,
+        model: str,
+        collection: str,
+        question: str,
+        chunk_ids: Sequence[str],
+        answer: str,
+        sources: List[Dict[str, Any]],
+        vector: Optional[np.ndarray] = None,
+    ) -> str:
+        key = answer_key(model, collection, question, chunk_ids)
+        blob = np.asarray(vector, dtype=np.float32).tobytes() if vector is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers "
+                "(key, collection, model, question, chunk_ids, answer, sources, vector, created_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    key, collection, model, question, json.dumps(list(chunk_ids)), answer,
+                    json.dumps(sources, ensure_ascii=False), blob, time.time(),
+                ),
+            )
+            index = self._indexes.get((collection, model))
+            if index is not None and vector is not None and key not in index.keys:
+                index.add(key, chunk_ids, np.asarray(vector, dtype=np.float32))
+        return key
+
+    def invalidate(self, collection: str) -> int:
+        """Drop a channel's answers, e.g. after new transcripts were indexed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM answers WHERE collection = ?", (collection,))
+            for index_key in [k for k in self._indexes if k[0] == collection]:
+                del self._indexes[index_key]
+        return max(cursor.rowcount, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "entries": entries,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class AnswerService:
+    """
+    Answers a question about a channel: retrieve the top chunks, then serve a
+    cached answer or stream a fresh one from the LLM (and cache it once the
+    generation completes).
+    """
+
+    def __init__(self, retriever: Retriever, llm: LLM, cache: Optional[AnswerCache] = None):
+        self.retriever = retriever
+        self.llm = llm
+        self.cache = cache
+        self.generations = 0
+        self.generation_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings, retriever: Retriever, llm: LLM) -> "AnswerService":
+        return cls(retriever, llm, AnswerCache.from_settings(settings) if settings.answer_cache_enabled else None)
+
+    async def ask(
+        self,
+        channel_url: str,
+        question: str,
+        top_k: int = 5,
+        mode: str = "hybrid",
+        use_cache: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Events: ``sources`` (retrieved chunks), then ``token`` fragments of the
+        answer, then ``done``. A cached answer arrives as a single token. Raises
+        ``LookupError`` before any event when the channel has nothing indexed.
+        """
+        started = time.perf_counter()
+        collection = collection_for_channel(channel_url)
+        # One embedding of the question serves both vector retrieval and the near-duplicate lookup
+        with span("retrieve", mode=mode) as fields:
+            vector = (await self.retriever.embeddings.embedder.embed([question]))[0]
+            chunks = await self.retriever.retrieve(channel_url, question, top_k, mode, query_vector=vector)
+            fields["chunks"] = len(chunks)
+        if not chunks:
+            raise LookupError("No indexed transcripts for this channel; ingest it first")
+        chunk_ids = [chunk["chunk_id"] for chunk in chunks]
+        model = self.llm.name
+
+        cache = self.cache if use_cache else None
+        cached = await asyncio.to_thread(cache.get, model, collection, question, chunk_ids, vector) if cache else None
+        if cached is not None:
+            yield {"type": "sources", "chunks": cached.sources, "cached": True}
+            yield {"type": "token", "text": cached.answer}
+            yield {
+                "type": "done",
+                "cached": True,
+                "match": cached.match,
+                "similarity": cached.similarity,
+                "cached_question": cached.question,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+            return
+
+        yield {"type": "sources", "chunks": chunks, "cached": False}
+        parts: List[str] = []
+        generation_started = time.perf_counter()
+        self.generations += 1
+        async for text in self.llm.stream(question, chunks):
+            if not parts:
+                STAGE_SECONDS.labels(stage="llm_first_token").observe(time.perf_counter() - generation_started)
+            parts.append(text)
+            yield {"type": "token", "text": text}
+        elapsed = time.perf_counter() - generation_started
+        STAGE_SECONDS.labels(stage="llm_generate").observe(elapsed)
+        self.generation_seconds += elapsed
+        # Only complete answers are cached; a client disconnect closes this generator before here
+        if cache is not None:
+            await asyncio.to_thread(cache.put, model, collection, question, chunk_ids, "".join(parts), chunks, vector)
+        yield {
+            "type": "done",
+            "cached": False,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def invalidate(self, channel_url: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(collection_for_channel(channel_url))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.llm.name,
+            "generations": self.generations,
+            "generation_seconds": round(self.generation_seconds, 4),
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import html
+import io
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+_TTML_OFFSET_RE = re.compile(r"^([\d.]+)(h|m|s|ms|f|t)$")
+
+
+@dataclass(slots=True)
+class Segment:
+    """One caption cue: start/end in seconds and its plain text."""
+
+    start: float
+    end: float
+    text: str
+
+    def to_dict(self) -> dict:
+        return {"start": round(self.start, 3), "end": round(self.end, 3), "text": self.text}
+
+
+def detect_format(body: str) -> str:
+    """Return one of ``vtt``, ``srt``, ``ttml``, ``srv3``, ``srv1`` or ``text``."""
+    head = body.lstrip("\ufeff \t\r\n")[:1024]
+    if head.startswith("WEBVTT"):
+        return "vtt"
+    if head.startswith("<"):
+        if "<timedtext" in head:
+            return "srv3"
+        if "<transcript" in head:
+            return "srv1"
+        if "<tt" in head:
+            return "ttml"
+    if "-->" in head:
+        return "srt"
+    return "text"
+
+
+def parse_captions(body: str) -> List[Segment]:
+    """Parse a caption document of any supported format into deduplicated segments."""
+    return list(iter_segments(body))
+
+
+def iter_segments(body: str) -> Iterator[Segment]:
+    fmt = detect_format(body)
+    if fmt in ("vtt", "srt"):
+        segments = _iter_cue_segments(body.splitlines())
+    elif fmt in ("ttml", "srv3", "srv1"):
+        segments = _iter_xml_segments(body)
+    else:
+        text = clean_text(body)
+        segments = iter([Segment(0.0, 0.0, text)] if text else [])
+    return _merge_repeats(segments)
+
+
+def segments_to_text(segments: Iterable[Segment]) -> str:
+    return " ".join(segment.text for segment in segments)
+
+
+def clean_text(raw: str) -> str:
+    """Strip inline markup (``<c>``, ``<00:00:01.000>``, ``<b>``...) and entities."""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub("", raw))).strip()
+
+
+def _parse_clock(value: str) -> float:
+    """``hh:mm:ss.mmm`` / ``mm:ss.mmm`` / SRT ``hh:mm:ss,mmm`` -> seconds."""
+    parts = value.strip().replace(",", ".").split(":")
+    seconds = float(parts[-1])
+    if len(parts) >= 2:
+        seconds += int(parts[-2]) * 60
+    if len(parts) >= 3:
+        seconds += int(parts[-3]) * 3600
+    return seconds
+
+
+def _iter_cue_segments(lines: Iterable[str]) -> Iterator[Segment]:
+    """
+    Single pass over VTT/SRT lines. YouTube ASR tracks repeat the previous
+    line at the top of every cue ("rolling" captions), so only lines that
+    were not shown in the previous cue are emitted.
+    """
+    previous_lines: List[str] = []
+    start = end = 0.0
+    cue_lines: Optional[List[str]] = None
+
+    def flush() -> Optional[Segment]:
+        nonlocal previous_lines
+        lines_ = [line for line in (clean_text(raw) for raw in cue_lines or []) if line]
+        shown = set(previous_lines)
+        new_lines = [line for line in lines_ if line not in shown]
+        if lines_:
+            previous_lines = lines_
+        if new_lines:
+            return Segment(start, end, " ".join(new_lines))
+        return None
+
+    for line in lines:
+        if "-->" in line:
+            if cue_lines is not None and (segment := flush()):
+                yield segment
+            begin, _, rest = line.partition("-->")
+            try:
+                start = _parse_clock(begin)
+                end = _parse_clock(rest.split()[0])
+            except (ValueError, IndexError):
+                cue_lines = None
+                continue
+            cue_lines = []
+        elif cue_lines is not None:
+            # Only a truly empty line ends a cue; ASR tracks use " " as a placeholder line
+            if line:
+                cue_lines.append(line)
+            else:
+                if segment := flush():
+                    yield segment
+                cue_lines = None
+    if cue_lines is not None and (segment := flush()):
+        yield segment
+
+
+def _parse_ttml_time(value: Optional[str], tick_rate: float) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    offset = _TTML_OFFSET_RE.match(value)
+    if offset:
+        number, unit = float(offset.group(1)), offset.group(2)
+        return {
+            "h": number * 3600,
+            "m": number * 60,
+            "s": number,
+            "ms": number / 1000,
+            "f": number / 30,
+            "t": number / tick_rate,
+        }[unit]
+    parts = value.split(":")
+    if len(parts) == 4:  # hh:mm:ss:frames
+        return _parse_clock(":".join(parts[:3])) + int(parts[3]) / 30
+    return _parse_clock(value)
+
+
+def _iter_xml_segments(body: str) -> Iterator[Segment]:
+    """
+    Streaming parse of TTML (``<p begin end|dur>``), srv3 (``<p t d>`` in ms)
+    and srv1 (``<text start dur>`` in seconds). Elements are cleared as soon as
+    they are consumed so memory stays bounded by a single cue.
+    """
+    tick_rate = 10_000_000.0
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(body.encode("utf-8")), events=("start", "end")):
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if tag == "tt":
+                    for name, value in elem.attrib.items():
+                        if name.endswith("tickRate"):
+                            tick_rate = float(value)
+                continue
+
+            start: Optional[float] = None
+            end: Optional[float] = None
+            if tag == "p" and "t" in elem.attrib:  # srv3
+                start = int(elem.attrib["t"]) / 1000
+                end = start + int(elem.attrib.get("d", 0)) / 1000
+            elif tag == "p":  # TTML
+                start = _parse_ttml_time(elem.attrib.get("begin"), tick_rate)
+                end = _parse_ttml_time(elem.attrib.get("end"), tick_rate)
+                duration = _parse_ttml_time(elem.attrib.get("dur"), tick_rate)
+                if end is None and start is not None and duration is not None:
+                    end = start + duration
+            elif tag == "text":  # srv1
+                start = float(elem.attrib.get("start", 0))
+                end = start + float(elem.attrib.get("dur", 0))
+            else:
+                continue
+
+            text = clean_text(" ".join(elem.itertext()))
+            elem.clear()
+            if text and start is not None:
+                yield Segment(start, end if end is not None else start, text)
+    except ET.ParseError:
+        return
+
+
+def _merge_repeats(segments: Iterable[Segment]) -> Iterator[Segment]:
+    """Collapse consecutive cues carrying identical text into one segment."""
+    pending: Optional[Segment] = None
+    for segment in segments:
+        if pending is not None and segment.text == pending.text:
+            pending.end = max(pending.end, segment.end)
+            continue
+        if pending is not None:
+            yield pending
+        pending = segment
+    if pending is not None:
+        yield pending
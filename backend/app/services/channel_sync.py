@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from ..core.settings import Settings
+
+# Channel sub-pages that all resolve to the same channel
+_CHANNEL_TABS = {"featured", "videos", "shorts", "streams", "playlists", "community", "about", "podcasts"}
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YTDLP_DATE_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})$")
+
+
+def normalize_published_at(value: Optional[str]) -> Optional[str]:
+    """
+    Upload date as a UTC ``YYYY-MM-DD``, the precision both enumeration paths
+    share: yt-dlp gives ``20240105``, the Data API ``2024-01-05T10:00:00Z``.
+    Unparseable values become None.
+    """
+    if not value:
+        return None
+    match = _YTDLP_DATE_RE.match(value)
+    if match:
+        return "-".join(match.groups())
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.date().isoformat()
+
+
+@dataclass
+class VideoRef:
+    """A video discovered in a channel's uploads, newest first."""
+
+    video_id: str
+    published_at: Optional[str] = None
+    title: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self.published_at = normalize_published_at(self.published_at)
+
+
+@dataclass
+class ChannelWatermark:
+    channel_key: str
+    last_video_id: str
+    last_published_at: Optional[str] = None
+    updated_at: float = 0.0
+
+    def __post_init__(self) -> None:
+        # Watermarks stored before dates were normalized hold the raw source format
+        self.last_published_at = normalize_published_at(self.last_published_at)
+
+
+def is_valid_video_id(video_id: str) -> bool:
+    return bool(_VIDEO_ID_RE.match(video_id or ""))
+
+
+def reached_watermark(video: VideoRef, watermark: Optional[ChannelWatermark]) -> bool:
+    """True once enumeration (newest first) hits the last video ingested previously."""
+    if watermark is None:
+        return False
+    if video.video_id == watermark.last_video_id:
+        return True
+    # The watermark video may have been deleted; fall back to upload dates. Dates
+    # are day-precise, so uploads from the watermark's own day are listed again
+    # (re-ingesting a video is idempotent; skipping a new one is not)
+    return bool(video.published_at and watermark.last_published_at
+                and video.published_at < watermark.last_published_at)
+
+
+def normalize_channel_url(channel_url: str) -> str:
+    """
+    Canonical form of a channel URL, used as the key for per-channel state.
+    ``https://m.youtube.com/@Foo/videos?x=1`` -> ``https://www.youtube.com/@foo``
+    """
+    parsed = urlparse(channel_url.strip())
+    host = (parsed.hostname or "").lower()
+    if host in {"youtube.com", "m.youtube.com"}:
+        host = "www.youtube.com"
+    parts = [p for p in parsed.path.split("/") if p]
+    if len(parts) > 1 and parts[-1].lower() in _CHANNEL_TABS:
+        parts = parts[:-1]
+    # Handles are case-insensitive; channel ids (UC...) are not
+    if parts and parts[0].startswith("@"):
+        parts[0] = parts[0].lower()
+    path = "/" + "/".join(parts) if parts else ""
+    if parsed.path.rstrip("/") == "/playlist" and parsed.query:
+        return f"https://{host}/playlist?{parsed.query}"
+    return f"https://{host}{path}"
+
+
+def uploads_tab_url(channel_url: str) -> str:
+    """URL of the channel's Videos tab, which yt-dlp can enumerate lazily newest-first."""
+    normalized = normalize_channel_url(channel_url)
+    if "/playlist?" in normalized:
+        return normalized
+    return f"{normalized}/videos"
+
+
+class ChannelStateStore:
+    """Per-channel sync watermarks (newest ingested video id + upload date) in SQLite."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS channel_watermarks ("
+            " channel_key TEXT PRIMARY KEY,"
+            " last_video_id TEXT NOT NULL,"
+            " last_published_at TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ChannelStateStore":
+        return cls(settings.channel_state_path)
+
+    def get_watermark(self, channel_url: str) -> Optional[ChannelWatermark]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT channel_key, last_video_id, last_published_at, updated_at "
+                "FROM channel_watermarks WHERE channel_key = ?",
+                (normalize_channel_url(channel_url),),
+            ).fetchone()
+        return ChannelWatermark(*row) if row else None
+
+    def set_watermark(self, channel_url: str, newest: VideoRef) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO channel_watermarks "
+                "(channel_key, last_video_id, last_published_at, updated_at) VALUES (?, ?, ?, ?)",
+                (normalize_channel_url(channel_url), newest.video_id, newest.published_at, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Deque, Iterable, Iterator, List
+
+from .captions import Segment
+
+if TYPE_CHECKING:
+    from .transcripts import TranscriptItem
+
+
+@dataclass(slots=True)
+class Chunk:
+    """A window of consecutive caption segments, the unit that gets embedded and retrieved."""
+
+    video_id: str
+    index: int
+    start: float
+    end: float
+    text: str
+    content_hash: str
+    title: str = ""
+    # Source segments (text joins to ``text``); used for timestamp lookups, not serialized
+    segments: List[Segment] = field(default_factory=list)
+
+    @property
+    def chunk_id(self) -> str:
+        return f"{self.video_id}:{self.index}"
+
+    def to_dict(self) -> dict:
+        return {
+            "chunk_id": self.chunk_id,
+            "video_id": self.video_id,
+            "title": self.title,
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "text": self.text,
+        }
+
+
+def content_hash(text: str) -> str:
+    """Stable key for a chunk's text; identical text anywhere shares one embedding."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def chunk_transcript(item: "TranscriptItem", max_chars: int = 1000, overlap_chars: int = 200) -> List[Chunk]:
+    return list(iter_chunks(item.video_id, item.segments, item.text, item.title, max_chars, overlap_chars))
+
+
+def iter_chunks(
+    video_id: str,
+    segments: Iterable[Segment],
+    text: str = "",
+    title: str = "",
+    max_chars: int = 1000,
+    overlap_chars: int = 200,
+) -> Iterator[Chunk]:
+    """
+    Pack whole caption segments into windows of at most ``max_chars``. Each
+    window repeats up to ``overlap_chars`` of trailing segments from the
+    previous one, so a sentence cut at a boundary appears whole in one chunk.
+    Chunk start/end are the first/last segment timestamps, which lets answers
+    link to the moment in the video. Text-only transcripts (demo mode) are
+    chunked as a single untimed segment.
+    """
+    overlap_chars = min(overlap_chars, max_chars // 2)
+    window: Deque[Segment] = deque()
+    size = 0
+    fresh = 0  # segments added since the last emitted chunk
+    index = 0
+
+    def emit() -> Chunk:
+        joined = " ".join(segment.text for segment in window)
+        return Chunk(
+            video_id, index, window[0].start, window[-1].end, joined, content_hash(joined), title, list(window)
+        )
+
+    source = segments if segments else ([Segment(0.0, 0.0, text)] if text else [])
+    for segment in _split_long(source, max_chars):
+        length = len(segment.text) + 1
+        if window and fresh and size + length > max_chars:
+            yield emit()
+            index += 1
+            fresh = 0
+            while window and size > overlap_chars:
+                size -= len(window.popleft().text) + 1
+            # The overlap plus this segment must still fit
+            while window and size + length > max_chars:
+                size -= len(window.popleft().text) + 1
+        window.append(segment)
+        size += length
+        fresh += 1
+    if window and fresh:
+        yield emit()
+
+
+def _split_long(segments: Iterable[Segment], max_chars: int) -> Iterator[Segment]:
+    """Split segments longer than ``max_chars`` at word boundaries, interpolating timestamps."""
+    for segment in segments:
+        if len(segment.text) <= max_chars:
+            yield segment
+            continue
+        total = len(segment.text)
+        duration = segment.end - segment.start
+        offset = 0
+        words: List[str] = []
+        length = 0
+        for word in segment.text.split():
+            if words and length + len(word) + 1 > max_chars:
+                piece = " ".join(words)
+                yield Segment(
+                    segment.start + duration * offset / total,
+                    segment.start + duration * (offset + len(piece)) / total,
+                    piece,
+                )
+                offset += len(piece) + 1
+                words, length = [], 0
+            words.append(word[:max_chars])
+            length += len(word) + 1
+        if words:
+            yield Segment(segment.start + duration * offset / total, segment.end, " ".join(words))
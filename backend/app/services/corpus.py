@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.lazy import lazy_module
+from ..core.settings import Settings
+from .captions import Segment, segments_to_text
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+# Block header: segment count, first start time (ms)
+_HEADER = struct.Struct("<Iq")
+# Decoded blocks kept per channel; a block is a few hundred segments
+_BLOCK_CACHE_SIZE = 32
+
+
+def _zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_codec(name: str) -> str:
+    """
+    ``auto`` picks zstd (``zstandard`` is in requirements.txt) and falls back to
+    zlib where the package is missing, e.g. a platform without a wheel.
+    """
+    if name == "auto":
+        return "zstd" if _zstd_available() else "zlib"
+    if name == "zstd" and not _zstd_available():
+        raise RuntimeError("APP_CORPUS_CODEC=zstd requires `pip install zstandard`")
+    return name
+
+
+def _compressor(codec: str) -> Callable[[bytes], bytes]:
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=9).compress
+    if codec == "zlib":
+        return lambda data: zlib.compress(data, 6)
+    return bytes
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return bytes(data)
+
+
+def encode_block(segments: List[Segment]) -> bytes:
+    """
+    Column-wise block: header, start deltas and durations in ms (int32),
+    UTF-8 text lengths (uint32), then the concatenated text. Deltas and
+    durations are small and repetitive, which is what makes them compress.
+    """
+    starts = np.fromiter((round(s.start * 1000) for s in segments), dtype=np.int64, count=len(segments))
+    ends = np.fromiter((round(s.end * 1000) for s in segments), dtype=np.int64, count=len(segments))
+    texts = [s.text.encode("utf-8") for s in segments]
+    return b"".join(
+        [
+            _HEADER.pack(len(segments), int(starts[0]) if len(segments) else 0),
+            np.diff(starts, prepend=starts[:1]).astype("<i4").tobytes(),
+            (ends - starts).astype("<i4").tobytes(),
+            np.fromiter(map(len, texts), dtype="<u4", count=len(texts)).tobytes(),
+            *texts,
+        ]
+    )
+
+
+def decode_block(data: bytes) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Inverse of ``encode_block``: start and end times in seconds, and the segment texts."""
+    count, first = _HEADER.unpack_from(data)
+    offset = _HEADER.size
+    deltas = np.frombuffer(data, dtype="<i4", count=count, offset=offset)
+    durations = np.frombuffer(data, dtype="<i4", count=count, offset=offset + 4 * count)
+    lengths = np.frombuffer(data, dtype="<u4", count=count, offset=offset + 8 * count)
+    starts_ms = first + np.cumsum(deltas, dtype=np.int64)
+    bounds = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))) + offset + 12 * count
+    view = memoryview(data)
+    texts = [str(view[bounds[i]:bounds[i + 1]], "utf-8") for i in range(count)]
+    return starts_ms / 1000.0, (starts_ms + durations) / 1000.0, texts
+
+
+@dataclass
+class CorpusEntry:
+    """Index record of one stored video; ``blocks`` are ``[offset, length, first_start, count]``."""
+
+    video_id: str
+    title: str
+    codec: str
+    segments: int
+    chars: int
+    duration: float
+    raw_bytes: int
+    blocks: List[List[Any]] = field(default_factory=list)
+    # Hash of the uncompressed blocks; re-ingesting unchanged captions writes nothing
+    digest: str = ""
+
+    @property
+    def stored_bytes(self) -> int:
+        return sum(block[1] for block in self.blocks)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "title": self.title,
+            "segments": self.segments,
+            "chars": self.chars,
+            "duration": round(self.duration, 3),
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "title": self.title,
+            "codec": self.codec,
+            "segments": self.segments,
+            "chars": self.chars,
+            "duration": self.duration,
+            "raw_bytes": self.raw_bytes,
+            "blocks": self.blocks,
+            "digest": self.digest,
+        }
+
+
+class ChannelCorpus:
+    """
+    One channel's caption transcripts on disk:
+
+    - ``segments.bin``: append-only compressed blocks of up to ``block_segments``
+      caption segments each (see ``encode_block``), memory-mapped for reads.
+    - ``index.jsonl``: one record per video (title, totals, and offset, size,
+      first start time and segment count of each block), replayed on open;
+      a later record for a video replaces the earlier one.
+
+    Listing videos touches only the index; a page or time window of a
+    transcript decompresses only the blocks it overlaps.
+    """
+
+    def __init__(self, path: Path, codec: str = "zlib", block_segments: int = 256):
+        self.path = path
+        self.codec = codec
+        self.block_segments = block_segments
+        self._lock = threading.Lock()
+        self._compress = _compressor(codec)
+        path.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, CorpusEntry] = {}
+        self._dead_bytes = 0
+        self._replay()
+        self._data = open(path / "segments.bin", "ab")
+        self._size = self._data.tell()
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._blocks: "OrderedDict[int, Tuple[np.ndarray, np.ndarray, List[str]]]" = OrderedDict()
+        live = sum(entry.stored_bytes for entry in self.entries.values())
+        if self._dead_bytes > max(live, 1 << 20):
+            self._compact()
+        self._index = open(path / "index.jsonl", "a", encoding="utf-8")
+
+    def _replay(self) -> None:
+        index_path = self.path / "index.jsonl"
+        if not index_path.exists():
+            return
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # torn write at the tail
+                    continue
+                previous = self.entries.pop(record["video_id"], None)
+                if previous is not None:
+                    self._dead_bytes += previous.stored_bytes
+                if not record.get("deleted"):
+                    self.entries[record["video_id"]] = CorpusEntry(**record)
+
+    # Writes -------------------------------------------------------------
+
+    def put(self, video_id: str, title: str, segments: List[Segment]) -> CorpusEntry:
+        """Store a video's segments (replacing any earlier version of it)."""
+        digest = hashlib.blake2b(digest_size=16)
+        encoded: List[Tuple[float, int, bytes]] = []
+        for i in range(0, len(segments), self.block_segments):
+            block = segments[i:i + self.block_segments]
+            raw = encode_block(block)
+            digest.update(raw)
+            encoded.append((round(block[0].start, 3), len(block), raw))
+        current = self.entries.get(video_id)
+        if current is not None and current.digest == digest.hexdigest() and current.title == title:
+            return current
+        # Compress outside the lock; only the append is serialized
+        raw_bytes = sum(len(raw) for _, _, raw in encoded)
+        compressed = [(first_start, count, self._compress(raw)) for first_start, count, raw in encoded]
+        with self._lock:
+            blocks = []
+            for first_start, count, data in compressed:
+                blocks.append([self._size, len(data), first_start, count])
+                self._data.write(data)
+                self._size += len(data)
+            self._data.flush()
+            entry = CorpusEntry(
+                video_id=video_id,
+                title=title,
+                codec=self.codec,
+                segments=len(segments),
+                # Length of the space-joined text (``TranscriptItem.text``)
+                chars=sum(len(s.text) for s in segments) + max(len(segments) - 1, 0),
+                duration=max((s.end for s in segments), default=0.0),
+                raw_bytes=raw_bytes,
+                blocks=blocks,
+                digest=digest.hexdigest(),
+            )
+            previous = self.entries.pop(video_id, None)
+            if previous is not None:
+                self._dead_bytes += previous.stored_bytes
+            self.entries[video_id] = entry
+            self._index.write(json.dumps(entry.to_record(), ensure_ascii=False) + "\n")
+            self._index.flush()
+        return entry
+
+    def delete(self, video_id: str) -> bool:
+        with self._lock:
+            entry = self.entries.pop(video_id, None)
+            if entry is None:
+                return False
+            self._dead_bytes += entry.stored_bytes
+            self._index.write(json.dumps({"video_id": video_id, "deleted": True}) + "\n")
+            self._index.flush()
+        return True
+
+    def _compact(self) -> None:
+        """Rewrite ``segments.bin`` and the index with live blocks only (copied, not recompressed)."""
+        self._close_map()
+        self._data.close()
+        source = self.path / "segments.bin"
+        with open(source, "rb") as old, open(self.path / "segments.bin.tmp", "wb") as new, open(
+            self.path / "index.jsonl.tmp", "w", encoding="utf-8"
+        ) as index:
+            offset = 0
+            for entry in self.entries.values():
+                for block in entry.blocks:
+                    old.seek(block[0])
+                    new.write(old.read(block[1]))
+                    block[0] = offset
+                    offset += block[1]
+                index.write(json.dumps(entry.to_record(), ensure_ascii=False) + "\n")
+        (self.path / "segments.bin.tmp").replace(source)
+        (self.path / "index.jsonl.tmp").replace(self.path / "index.jsonl")
+        self._data = open(source, "ab")
+        self._size = offset
+        self._dead_bytes = 0
+        self._blocks.clear()
+
+    # Reads --------------------------------------------------------------
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._mapped_size = 0
+
+    def _view(self, offset: int, length: int) -> memoryview:
+        # Caller holds the lock. Remap once appends have grown the file past the mapping
+        if self._map is None or offset + length > self._mapped_size:
+            self._close_map()
+            with open(self.path / "segments.bin", "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = len(self._map)
+        return memoryview(self._map)[offset:offset + length]
+
+    def _block(self, entry: CorpusEntry, index: int) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        offset, length = entry.blocks[index][0], entry.blocks[index][1]
+        with self._lock:
+            cached = self._blocks.get(offset)
+            if cached is not None:
+                self._blocks.move_to_end(offset)
+                return cached
+            view = self._view(offset, length)
+            try:
+                raw = _decompress(entry.codec, view)
+            finally:
+                view.release()
+            decoded = decode_block(raw)
+            self._blocks[offset] = decoded
+            if len(self._blocks) > _BLOCK_CACHE_SIZE:
+                self._blocks.popitem(last=False)
+            return decoded
+
+    def get(self, video_id: str) -> Optional[CorpusEntry]:
+        return self.entries.get(video_id)
+
+    def videos(self, offset: int = 0, limit: Optional[int] = None) -> List[CorpusEntry]:
+        """Stored videos in ingestion order."""
+        with self._lock:
+            entries = list(self.entries.values())
+        return entries[offset:offset + limit if limit is not None else None]
+
+    def segments(
+        self,
+        video_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Segment]:
+        """
+        Segments ``offset``..``offset + limit`` of a video, or, with ``start``/``end``
+        (seconds), the segments overlapping that window (then paged by offset/limit).
+        """
+        entry = self.entries.get(video_id)
+        if entry is None:
+            return []
+        if start is not None or end is not None:
+            return self._window(entry, start or 0.0, end)[offset:offset + limit if limit is not None else None]
+        stop = entry.segments if limit is None else min(entry.segments, offset + limit)
+        result: List[Segment] = []
+        first = 0
+        for index, block in enumerate(entry.blocks):
+            last = first + block[3]
+            if last > offset and first < stop:
+                starts, ends, texts = self._block(entry, index)
+                for i in range(max(offset - first, 0), min(stop, last) - first):
+                    result.append(Segment(float(starts[i]), float(ends[i]), texts[i]))
+            if last >= stop:
+                break
+            first = last
+        return result
+
+    def _window(self, entry: CorpusEntry, start: float, end: Optional[float]) -> List[Segment]:
+        # The block whose first segment starts at or before ``start`` may hold cues still running at ``start``
+        first_starts = [block[2] for block in entry.blocks]
+        index = max(bisect_right(first_starts, start) - 1, 0)
+        result: List[Segment] = []
+        for index in range(index, len(entry.blocks)):
+            if end is not None and entry.blocks[index][2] >= end:
+                break
+            starts, ends, texts = self._block(entry, index)
+            # Still running at ``start`` or starting inside the window
+            mask = (ends > start) | (starts >= start)
+            if end is not None:
+                mask &= starts < end
+            result.extend(Segment(float(starts[i]), float(ends[i]), texts[i]) for i in np.flatnonzero(mask))
+        return result
+
+    def text(self, video_id: str) -> Optional[str]:
+        entry = self.entries.get(video_id)
+        if entry is None:
+            return None
+        return segments_to_text(self.segments(video_id))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self.entries.values())
+            dead = self._dead_bytes
+        raw = sum(entry.raw_bytes for entry in entries)
+        stored = sum(entry.stored_bytes for entry in entries)
+        return {
+            "videos": len(entries),
+            "segments": sum(entry.segments for entry in entries),
+            "chars": sum(entry.chars for entry in entries),
+            "raw_bytes": raw,
+            "stored_bytes": stored,
+            "dead_bytes": dead,
+            "compression_ratio": round(raw / stored, 2) if stored else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_map()
+            self._blocks.clear()
+            self._data.close()
+            self._index.close()
+
+
+class CorpusStore:
+    """One ``ChannelCorpus`` per channel collection under ``root``, opened lazily."""
+
+    def __init__(self, root: str, codec: str = "auto", block_segments: int = 256):
+        self.root = Path(root)
+        self.codec = resolve_codec(codec)
+        self.block_segments = block_segments
+        self._corpora: Dict[str, ChannelCorpus] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "CorpusStore":
+        return cls(settings.corpus_path, settings.corpus_codec, settings.corpus_block_segments)
+
+    def corpus(self, collection: str) -> ChannelCorpus:
+        with self._lock:
+            corpus = self._corpora.get(collection)
+            if corpus is None:
+                corpus = self._corpora[collection] = ChannelCorpus(
+                    self.root / collection, self.codec, self.block_segments
+                )
+            return corpus
+
+    def exists(self, collection: str) -> bool:
+        return collection in self._corpora or (self.root / collection / "index.jsonl").exists()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            corpora = dict(self._corpora)
+        return {"codec": self.codec, "channels": {name: corpus.stats() for name, corpus in corpora.items()}}
+
+    def close(self) -> None:
+        with self._lock:
+            corpora, self._corpora = list(self._corpora.values()), {}
+        for corpus in corpora:
+            corpus.close()
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence
+
+from ..core.lazy import lazy_module
+from ..core.metrics import CACHE_LOOKUPS, span
+from ..core.settings import Settings
+from .chunking import Chunk, chunk_transcript
+
+if TYPE_CHECKING:
+    import httpx
+    import numpy as np
+
+    from .transcripts import TranscriptItem
+else:
+    httpx = lazy_module("httpx")
+    np = lazy_module("numpy")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model      TEXT NOT NULL,
+    hash       TEXT NOT NULL,
+    dim        INTEGER NOT NULL,
+    vector     BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, hash)
+);
+"""
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class Embedder(ABC):
+    """
+    Turns a batch of texts into an ``(n, dim)`` float32 array of L2-normalized
+    vectors, so cosine similarity is a dot product. ``name`` identifies the
+    model in the embedding cache; vectors from different models never mix.
+    """
+
+    name: str = ""
+    dim: int = 0
+
+    @abstractmethod
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder(Embedder):
+    """
+    Dependency-free local CPU embedder: signed feature hashing of word unigrams
+    and bigrams with sublinear term weights. Lexical rather than semantic, but
+    deterministic, fast and good enough for demo mode and benchmarks.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return await asyncio.to_thread(self.embed_sync, texts)
+
+    def embed_sync(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        rows: List[int] = []
+        hashes: List[int] = []
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            rows.extend([row] * len(features))
+            hashes.extend(zlib.crc32(feature.encode("utf-8")) for feature in features)
+        if hashes:
+            hashed = np.asarray(hashes, dtype=np.uint32)
+            # Low bits pick the column, the top bit the sign (keeps collisions unbiased)
+            columns = (hashed % self.dim).astype(np.intp)
+            signs = np.where(hashed >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors, (np.asarray(rows, dtype=np.intp), columns), signs)
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Local CPU/GPU model via the optional ``sentence-transformers`` package."""
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", device: str = "cpu"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "APP_EMBEDDING_PROVIDER=sentence-transformers requires `pip install sentence-transformers`"
+            ) from e
+        self.model = SentenceTransformer(model_name, device=device)
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+        self.name = f"st:{model_name}"
+        # Inference is CPU-bound and the model is not safe to call concurrently
+        self._lock = threading.Lock()
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return await asyncio.to_thread(self._encode, list(texts))
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            vectors = self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+class OllamaEmbedder(Embedder):
+    """Embeddings from an Ollama server (``/api/embed`` accepts a batch of inputs)."""
+
+    def __init__(self, base_url: str, model: str = "nomic-embed-text", http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.name = f"ollama:{model}"
+        self.http_client = http_client
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        payload = {"model": self.model, "input": list(texts)}
+        if self.http_client is not None:
+            r = await self.http_client.post(f"{self.base_url}/api/embed", json=payload)
+        else:
+            async with httpx.AsyncClient(timeout=120) as client:
+                r = await client.post(f"{self.base_url}/api/embed", json=payload)
+        r.raise_for_status()
+        vectors = np.asarray(r.json()["embeddings"], dtype=np.float32)
+        self.dim = vectors.shape[1]
+        return _normalize(vectors)
+
+
+def create_embedder(settings: Settings, http_client: Optional[httpx.AsyncClient] = None) -> Embedder:
+    provider = settings.embedding_provider
+    if provider == "sentence-transformers":
+        return SentenceTransformerEmbedder(settings.embedding_model or "sentence-transformers/all-MiniLM-L6-v2")
+    if provider == "ollama":
+        return OllamaEmbedder(settings.ollama_base_url, settings.embedding_model or "nomic-embed-text", http_client)
+    return HashingEmbedder(settings.embedding_dim)
+
+
+class EmbeddingCache:
+    """
+    Embeddings memoized by (model, chunk content hash) in SQLite, stored as raw
+    float32 blobs. Re-ingesting an unchanged video re-chunks to the same hashes
+    and costs no embedding compute.
+    """
+
+    def __init__(self, path: str):
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "EmbeddingCache":
+        return cls(settings.embedding_cache_path)
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for offset in range(0, len(unique), 500):
+                batch = unique[offset:offset + 500]
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                    (model, *batch),
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        CACHE_LOOKUPS.labels(cache="embedding", result="hit").inc(len(found))
+        CACHE_LOOKUPS.labels(cache="embedding", result="miss").inc(len(unique) - len(found))
+        return found
+
+    def put_many(self, model: str, items: Dict[str, np.ndarray]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model, key, vector.shape[0], np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in items.items()
+                ],
+            )
+            self._conn.execute("COMMIT")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class EmbeddedBatch:
+    chunks: List[Chunk]
+    vectors: np.ndarray  # (len(chunks), dim) float32, L2-normalized
+
+
+class EmbeddingPipeline:
+    """
+    Chunk transcripts as they stream out of ``TranscriptService`` and embed the
+    chunks in batches of ``batch_size``. Only chunks whose content hash is not
+    already cached reach the embedder.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 32,
+        max_chars: int = 1000,
+        overlap_chars: int = 200,
+    ):
+        self.embedder = embedder
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.overlap_chars = overlap_chars
+        self.chunks = 0
+        self.cache_hits = 0
+        self.embedded = 0
+        self.batches = 0
+        self.embed_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings, http_client: Optional[httpx.AsyncClient] = None) -> "EmbeddingPipeline":
+        return cls(
+            embedder=create_embedder(settings, http_client),
+            cache=EmbeddingCache.from_settings(settings) if settings.embedding_cache_enabled else None,
+            batch_size=settings.embedding_batch_size,
+            max_chars=settings.chunk_max_chars,
+            overlap_chars=settings.chunk_overlap_chars,
+        )
+
+    def chunk(self, item: "TranscriptItem") -> List[Chunk]:
+        return chunk_transcript(item, self.max_chars, self.overlap_chars)
+
+    async def process(self, items: AsyncIterable["TranscriptItem"]) -> AsyncIterator[EmbeddedBatch]:
+        """Consume transcripts as they arrive; yield each batch once it is embedded."""
+        pending: List[Chunk] = []
+        async for item in items:
+            pending.extend(self.chunk(item))
+            while len(pending) >= self.batch_size:
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                yield EmbeddedBatch(batch, await self.embed_chunks(batch))
+        if pending:
+            yield EmbeddedBatch(pending, await self.embed_chunks(pending))
+
+    async def embed_chunks(self, chunks: Sequence[Chunk]) -> np.ndarray:
+        """Vectors for ``chunks`` in order: cached ones looked up, the rest embedded in batches."""
+        self.chunks += len(chunks)
+        model = self.embedder.name
+        # SQLite reads and writes of the cache run in a thread, off the event loop
+        known: Dict[str, np.ndarray] = (
+            await asyncio.to_thread(self.cache.get_many, model, [chunk.content_hash for chunk in chunks])
+            if self.cache
+            else {}
+        )
+        self.cache_hits += sum(1 for chunk in chunks if chunk.content_hash in known)
+
+        # Identical text within the batch is embedded once
+        missing: Dict[str, str] = {}
+        for chunk in chunks:
+            if chunk.content_hash not in known:
+                missing.setdefault(chunk.content_hash, chunk.text)
+        if missing:
+            keys = list(missing)
+            fresh: Dict[str, np.ndarray] = {}
+            started = time.perf_counter()
+            for offset in range(0, len(keys), self.batch_size):
+                batch_keys = keys[offset:offset + self.batch_size]
+                with span("embed_batch", texts=len(batch_keys)):
+                    vectors = await self.embedder.embed([missing[key] for key in batch_keys])
+                fresh.update(zip(batch_keys, vectors))
+                self.batches += 1
+            self.embed_seconds += time.perf_counter() - started
+            self.embedded += len(fresh)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.put_many, model, fresh)
+            known.update(fresh)
+
+        if not chunks:
+            return np.zeros((0, self.embedder.dim), dtype=np.float32)
+        return np.stack([known[chunk.content_hash] for chunk in chunks])
+
+    async def warm_up(self) -> None:
+        """Embed one string so model loading and first-call setup happen before the first request."""
+        await self.embedder.embed(["warm up"])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.embedder.name,
+            "chunks": self.chunks,
+            "cache_hits": self.cache_hits,
+            "embedded": self.embedded,
+            "batches": self.batches,
+            "embed_seconds": round(self.embed_seconds, 4),
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from ..core.lazy import lazy_module
+from ..core.metrics import CIRCUIT_STATE, FETCH_RETRIES, HEDGED_REQUESTS
+from ..core.settings import Settings
+from .quota import parse_retry_after
+
+if TYPE_CHECKING:
+    import httpx
+else:
+    httpx = lazy_module("httpx")
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Throttling and server-side errors; anything else (4xx) will not change on retry
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}; next probe in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def failure_reason(error: BaseException) -> str:
+    """Short, low-cardinality label for a failed upstream call."""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, httpx.HTTPStatusError):
+        return "throttled" if error.response.status_code == 429 else f"http_{error.response.status_code}"
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.TransportError):
+        return "transport"
+    return "unexpected_error"
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def is_host_failure(error: BaseException) -> bool:
+    """Errors that say the host is unhealthy. 429s are left to the adaptive rate limiter."""
+    return is_retryable(error) and not (
+        isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429
+    )
+
+
+@dataclass
+class RetryPolicy:
+    """Bounded retries with capped exponential backoff and full jitter."""
+
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 8.0
+    # A longer Retry-After is not waited out; the call fails instead
+    max_retry_after: float = 30.0
+
+    def delay(self, retry: int, retry_after: Optional[float], rng: random.Random) -> Optional[float]:
+        """Seconds to sleep before retry number ``retry`` (1-based); None to give up."""
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            # Callers throttled together must not all come back at the same instant
+            return retry_after + rng.uniform(0, self.base_delay)
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host. After
+    ``failure_threshold`` failures in a row calls fail fast for
+    ``reset_seconds``; then a single probe is let through, which closes the
+    circuit on success or reopens it on failure.
+    """
+
+    def __init__(self, host: str, failure_threshold: int, reset_seconds: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self.rejected = 0
+        self._probing = False
+        CIRCUIT_STATE.set(0, host=host)
+
+    def allow(self) -> None:
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN:
+            retry_in = self.opened_at + self.reset_seconds - time.monotonic()
+            if retry_in > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, retry_in)
+            self._set_state(HALF_OPEN)
+        if self._probing:
+            self.rejected += 1
+            raise CircuitOpenError(self.host, 0.0)
+        self._probing = True
+
+    def record_success(self) -> None:
+        self._probing = False
+        self.failures = 0
+        if self.state != CLOSED:
+            logger.info("circuit closed", extra={"host": self.host})
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.opened_at = time.monotonic()
+            self.opens += 1
+            logger.warning("circuit opened", extra={"host": self.host, "failures": self.failures})
+            self._set_state(OPEN)
+
+    def abandon(self) -> None:
+        """The call was cancelled before it finished; let another caller probe."""
+        self._probing = False
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], host=self.host)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "opens": self.opens, "rejected": self.rejected}
+
+
+class _LatencyWindow:
+    """Durations of the most recent successful attempts against one host."""
+
+    def __init__(self, size: int = 256):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class FetchPolicy:
+    """
+    How upstream requests are made: bounded, jittered retries that honour
+    Retry-After, a circuit breaker per host and, optionally, hedged requests.
+    One instance is shared by the whole app so breakers and latency
+    histories see every caller. Single event loop only (no locking).
+    """
+
+    # Successful attempts needed before the hedge delay is trusted
+    min_hedge_samples = 20
+
+    def __init__(
+        self,
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        seed: Optional[int] = None,
+    ):
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self._rng = random.Random(seed)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, _LatencyWindow] = {}
+        self.retries = 0
+        self.gave_up = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FetchPolicy":
+        return cls(
+            retry=RetryPolicy(
+                attempts=settings.fetch_retry_attempts,
+                base_delay=settings.fetch_retry_base_delay_seconds,
+                max_delay=settings.fetch_retry_max_delay_seconds,
+                max_retry_after=settings.fetch_retry_max_retry_after_seconds,
+            ),
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_seconds=settings.circuit_reset_seconds,
+            hedge=settings.timedtext_hedge_enabled,
+            hedge_quantile=settings.timedtext_hedge_quantile,
+            hedge_min_delay=settings.timedtext_hedge_min_delay_seconds,
+        )
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlsplit(url).netloc or "unknown"
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = self.host(url)
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_seconds)
+        return breaker
+
+    async def call(
+        self,
+        url: str,
+        attempt: Callable[[], Awaitable[T]],
+        can_retry: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> T:
+        """
+        Run ``attempt`` (one request to ``url``'s host, raising on failure) until
+        it succeeds, a non-retryable error occurs, the attempts run out,
+        Retry-After exceeds the budget or ``can_retry`` says no (e.g. quota).
+        The last error is re-raised; CircuitOpenError while the host is shed.
+        """
+        breaker = self.breaker(url)
+        host = breaker.host
+        retry = 0
+        while True:
+            breaker.allow()
+            try:
+                result = await attempt()
+            except asyncio.CancelledError:
+                breaker.abandon()
+                raise
+            except Exception as e:
+                if is_host_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if not is_retryable(e):
+                    raise
+                retry += 1
+                retry_after = None
+                if isinstance(e, httpx.HTTPStatusError):
+                    retry_after = parse_retry_after(e.response.headers.get("retry-after"))
+                delay = self.retry.delay(retry, retry_after, self._rng) if retry < self.retry.attempts else None
+                if delay is None or (can_retry is not None and not await can_retry()):
+                    self.gave_up += 1
+                    raise
+                reason = failure_reason(e)
+                self.retries += 1
+                FETCH_RETRIES.labels(host=host, reason=reason).inc()
+                logger.info(
+                    "retrying upstream request",
+                    extra={"host": host, "reason": reason, "retry": retry, "delay_seconds": round(delay, 3)},
+                )
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    async def hedged(self, url: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``attempt``; with hedging enabled, start a second identical attempt
+        if the first has not finished after the host's recent latency quantile
+        and return whichever succeeds first. Only for idempotent requests that
+        cost no quota.
+        """
+        window = self._latency.setdefault(self.host(url), _LatencyWindow())
+        started = time.perf_counter()
+        if not self.hedge or len(window) < self.min_hedge_samples or self.breaker(url).state != CLOSED:
+            result = await attempt()
+            window.add(time.perf_counter() - started)
+            return result
+
+        delay = max(window.quantile(self.hedge_quantile), self.hedge_min_delay)
+        primary = asyncio.ensure_future(attempt())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done:
+            result = primary.result()
+            window.add(time.perf_counter() - started)
+            return result
+
+        self.hedges_sent += 1
+        HEDGED_REQUESTS.labels(outcome="sent").inc()
+        hedge = asyncio.ensure_future(attempt())
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                            HEDGED_REQUESTS.labels(outcome="won").inc()
+                        window.add(time.perf_counter() - started)
+                        return task.result()
+                    error = error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        assert error is not None
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "circuits": {host: breaker.stats() for host, breaker in self._breakers.items()},
+        }
@@ -0,0 +1,693 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from ..core.logs import request_id_var
+from ..core.metrics import span
+from ..core.settings import Settings
+from .answers import AnswerCache
+from .channel_sync import normalize_channel_url
+from .corpus import CorpusStore
+from .embeddings import EmbeddingPipeline
+from .lexical_index import LexicalStore
+from .scheduler import BULK, INTERACTIVE, PRIORITIES
+from .transcripts import STATUS_OK, TranscriptItem, TranscriptService
+from .vector_store import VectorStore, collection_for_channel
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    channel_key TEXT NOT NULL,
+    channel_url TEXT NOT NULL,
+    incremental INTEGER NOT NULL,
+    status      TEXT NOT NULL,
+    total       INTEGER,
+    completed   INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL,
+    priority    TEXT NOT NULL DEFAULT 'interactive',
+    weight      REAL NOT NULL DEFAULT 1,
+    owner       TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_videos (
+    job_id     TEXT NOT NULL,
+    position   INTEGER NOT NULL,
+    video_id   TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    transcript TEXT,
+    PRIMARY KEY (job_id, video_id)
+);
+CREATE TABLE IF NOT EXISTS batches (
+    id         TEXT PRIMARY KEY,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    batch_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    job_id   TEXT NOT NULL,
+    PRIMARY KEY (batch_id, position)
+);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+# Batch status when some of its channels failed and the rest succeeded
+PARTIAL = "partial"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+_JOB_COLUMNS = (
+    "id, channel_url, incremental, status, total, completed, error, "
+    "created_at, started_at, finished_at, priority, weight"
+)
+
+
+@dataclass
+class IngestJob:
+    id: str
+    channel_url: str
+    incremental: bool
+    status: str
+    total: Optional[int] = None
+    completed: int = 0
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    priority: str = INTERACTIVE
+    weight: float = 1.0
+    videos: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "channel_url": self.channel_url,
+            "incremental": self.incremental,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "priority": self.priority,
+            "weight": self.weight,
+            "videos": self.videos,
+        }
+
+
+class JobStore:
+    """Persistent ingestion jobs, their per-video progress/results and batches of jobs in SQLite."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "priority" not in columns:  # job databases created before batch ingestion
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN priority TEXT NOT NULL DEFAULT 'interactive'")
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN weight REAL NOT NULL DEFAULT 1")
+        if "owner" not in columns:  # job databases created before leased claims
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def create_or_get_active(
+        self, channel_url: str, incremental: bool, priority: str = INTERACTIVE, weight: float = 1.0
+    ) -> Tuple[IngestJob, bool, bool]:
+        """
+        Return the active job for this channel if there is one (coalesced=True),
+        else enqueue a new one. A coalesced job of a lower priority is raised to
+        ``priority`` (promoted=True); returns ``(job, coalesced, promoted)``.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job_id, coalesced, promoted = self._create_or_get_active(channel_url, incremental, priority, weight)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(job_id), coalesced, promoted  # type: ignore[return-value]
+
+    def _create_or_get_active(
+        self, channel_url: str, incremental: bool, priority: str, weight: float
+    ) -> Tuple[str, bool, bool]:
+        # Caller holds the lock inside a transaction
+        channel_key = normalize_channel_url(channel_url)
+        row = self._conn.execute(
+            "SELECT id, priority FROM jobs WHERE channel_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+            (channel_key, *ACTIVE_STATUSES),
+        ).fetchone()
+        if row is not None:
+            job_id, current = row
+            # An interactive request never waits behind a backfill of the same channel
+            if PRIORITIES.index(priority) < PRIORITIES.index(current):
+                self._conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, job_id))
+                return job_id, True, True
+            return job_id, True, False
+        job_id = uuid.uuid4().hex
+        self._conn.execute(
+            "INSERT INTO jobs (id, channel_key, channel_url, incremental, status, created_at, priority, weight) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, channel_key, channel_url, int(incremental), QUEUED, time.time(), priority, weight),
+        )
+        return job_id, False, False
+
+    def create_batch(self, channels: List[Tuple[str, bool, float]]) -> Tuple[str, List[Tuple[str, bool]]]:
+        """
+        Enqueue bulk jobs for ``(channel_url, incremental, weight)`` entries in one
+        transaction. Channels with an active job are coalesced onto it. Returns the
+        batch id and ``(job_id, coalesced)`` per entry.
+        """
+        batch_id = uuid.uuid4().hex
+        jobs: List[Tuple[str, bool]] = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT INTO batches (id, created_at) VALUES (?, ?)", (batch_id, time.time()))
+                for position, (channel_url, incremental, weight) in enumerate(channels):
+                    job_id, coalesced, _ = self._create_or_get_active(channel_url, incremental, BULK, weight)
+                    self._conn.execute(
+                        "INSERT INTO batch_jobs (batch_id, position, job_id) VALUES (?, ?, ?)",
+                        (batch_id, position, job_id),
+                    )
+                    jobs.append((job_id, coalesced))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return batch_id, jobs
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT created_at FROM batches WHERE id = ?", (batch_id,)).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM batch_jobs JOIN jobs ON jobs.id = batch_jobs.job_id "
+                "WHERE batch_id = ? ORDER BY position",
+                (batch_id,),
+            ).fetchall()
+        return {"created_at": row[0], "jobs": [self._job(job_row) for job_row in rows]}
+
+    def get(self, job_id: str, include_videos: bool = True) -> Optional[IngestJob]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            videos = self._conn.execute(
+                "SELECT video_id, status FROM job_videos WHERE job_id = ? ORDER BY position",
+                (job_id,),
+            ).fetchall() if include_videos else []
+        job = self._job(row)
+        job.videos = [{"video_id": video_id, "status": status} for video_id, status in videos]
+        return job
+
+    @staticmethod
+    def _job(row: tuple) -> IngestJob:
+        job = IngestJob(*row)
+        job.incremental = bool(job.incremental)
+        return job
+
+    def results(
+        self, job_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        ``(video_id, transcript)`` of finished videos in channel order; the
+        transcript is None when its text lives in the channel corpus.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT video_id, transcript FROM job_videos WHERE job_id = ? AND status != 'pending' "
+                "ORDER BY position LIMIT ? OFFSET ?",
+                (job_id, -1 if limit is None else limit, offset),
+            ).fetchall()
+        return [(video_id, json.loads(transcript) if transcript else None) for video_id, transcript in rows]
+
+    def queued_ids(self) -> List[Tuple[str, str]]:
+        """``(job_id, priority)`` of queued jobs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, priority FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def requeue_interrupted(self) -> List[Tuple[str, str]]:
+        """
+        Running jobs whose lease expired (their worker or process died) go back
+        to the queue; returns their ``(job_id, priority)``. Jobs whose owner
+        still renews its lease are left alone.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, priority FROM jobs WHERE status = ? AND (lease_until IS NULL OR lease_until < ?) "
+                    "ORDER BY created_at",
+                    (RUNNING, now),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_until = NULL "
+                    "WHERE id = ? AND status = ?",
+                    [(QUEUED, row[0], RUNNING) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(row[0], row[1]) for row in rows]
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Move a queued job to running under ``owner`` for ``lease_seconds``. Only
+        one caller wins a job; False when it is no longer queued.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, started_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, owner, now + lease_seconds, now, job_id, QUEUED),
+            )
+        return cursor.rowcount == 1
+
+    def renew_lease(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a running job; False when ``owner`` no longer holds it."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, owner, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, owner: str) -> None:
+        """Hand a running job held by ``owner`` back to the queue."""
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_until = NULL "
+            "WHERE id = ? AND owner = ? AND status = ?",
+            (QUEUED, job_id, owner, RUNNING),
+        )
+
+    def set_videos(self, job_id: str, video_ids: List[str]) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM job_videos WHERE job_id = ?", (job_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO job_videos (job_id, position, video_id, status) VALUES (?, ?, ?, 'pending')",
+                [(job_id, position, video_id) for position, video_id in enumerate(video_ids)],
+            )
+            self._conn.execute(
+                "UPDATE jobs SET total = ?, completed = 0 WHERE id = ?", (len(video_ids), job_id)
+            )
+
+    @staticmethod
+    def _video_status(transcript: Dict[str, Any]) -> str:
+        # Demo text and failed fetches stay distinguishable from real captions
+        if transcript.get("status") in ("demo", "failed"):
+            return transcript["status"]
+        return "done" if transcript.get("text") else "empty"
+
+    def record_video(self, job_id: str, transcript: Dict[str, Any], store_transcript: bool = True) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE job_videos SET status = ?, transcript = ? WHERE job_id = ? AND video_id = ?",
+                (
+                    self._video_status(transcript),
+                    json.dumps(transcript, ensure_ascii=False) if store_transcript else None,
+                    job_id,
+                    transcript["video_id"],
+                ),
+            )
+            self._conn.execute("UPDATE jobs SET completed = completed + 1 WHERE id = ?", (job_id,))
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+            (status, error, time.time(), job_id),
+        )
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobManager:
+    """
+    Background ingestion: ``submit`` persists a job and returns immediately,
+    a pool of asyncio worker tasks drains the queue. Submissions for a channel
+    that already has a queued or running job are coalesced onto that job; an
+    interactive submission raises a bulk job it joins to interactive priority.
+    ``submit_batch`` enqueues many channels as bulk jobs, drained by a separate
+    (larger) worker pool so a backfill never occupies the interactive workers;
+    their video fetches share the global fetch slots at bulk priority.
+    With an embedding pipeline and vector store, transcripts are chunked,
+    embedded and indexed into the channel's collection as they arrive (and
+    into its BM25 index when a lexical store is given). Cached answers of a
+    channel are dropped once new chunks of it are indexed. With a corpus the
+    job database keeps only per-video status for captioned videos; their
+    text is read back from the channel corpus.
+    A worker claims a job atomically and holds it under a lease it renews
+    while the job runs; jobs whose lease expired (their process died) are
+    requeued at start and by a periodic sweep, so a job runs once even when
+    several processes share the job database.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        service_factory: Callable[..., TranscriptService],
+        workers: int,
+        embeddings: Optional[EmbeddingPipeline] = None,
+        vectors: Optional[VectorStore] = None,
+        lexical: Optional[LexicalStore] = None,
+        answers: Optional[AnswerCache] = None,
+        batch_workers: int = 1,
+        corpus: Optional[CorpusStore] = None,
+        lease_seconds: float = 60.0,
+    ):
+        self.store = store
+        # Called with ``priority`` and ``weight`` keyword arguments of the job
+        self.service_factory = service_factory
+        self.worker_count = workers
+        self.batch_worker_count = batch_workers
+        self.embeddings = embeddings
+        self.vectors = vectors
+        self.lexical = lexical
+        self.answers = answers
+        self.corpus = corpus
+        self.lease_seconds = lease_seconds
+        # Identifies this process's claims in the shared job database
+        self.owner = uuid.uuid4().hex
+        self._queues: Dict[str, "asyncio.Queue[str]"] = {priority: asyncio.Queue() for priority in PRIORITIES}
+        # Transcript services of the jobs running in this process, by job id
+        self._services: Dict[str, TranscriptService] = {}
+        self._workers: List[asyncio.Task] = []
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        service_factory: Callable[..., TranscriptService],
+        embeddings: Optional[EmbeddingPipeline] = None,
+        vectors: Optional[VectorStore] = None,
+        lexical: Optional[LexicalStore] = None,
+        answers: Optional[AnswerCache] = None,
+        corpus: Optional[CorpusStore] = None,
+    ) -> "JobManager":
+        return cls(
+            JobStore(settings.jobs_db_path),
+            service_factory,
+            settings.ingest_workers,
+            embeddings,
+            vectors,
+            lexical,
+            answers,
+            settings.batch_ingest_workers,
+            corpus,
+            settings.job_lease_seconds,
+        )
+
+    async def start(self) -> None:
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            logger.info("requeued interrupted ingestion jobs", extra={"jobs": len(requeued)})
+        for job_id, priority in self.store.queued_ids():
+            self._queues[priority].put_nowait(job_id)
+        self._workers = [asyncio.create_task(self._requeue_expired(), name="ingest-lease-sweep")] + [
+            asyncio.create_task(self._worker(INTERACTIVE), name=f"ingest-worker-{i}") for i in range(self.worker_count)
+        ] + [
+            asyncio.create_task(self._worker(BULK), name=f"batch-worker-{i}") for i in range(self.batch_worker_count)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self.store.close()
+
+    @staticmethod
+    def _validate(channel_url: str) -> None:
+        # Validate early so bad URLs are rejected at submission time
+        if "youtube.com" not in channel_url and "youtu.be" not in channel_url:
+            raise ValueError(f"Invalid YouTube channel URL: {channel_url}")
+
+    def submit(self, channel_url: str, incremental: bool = False) -> Tuple[IngestJob, bool]:
+        self._validate(channel_url)
+        job, coalesced, promoted = self.store.create_or_get_active(channel_url, incremental)
+        if not coalesced:
+            self._queues[INTERACTIVE].put_nowait(job.id)
+        elif promoted:
+            self._promote(job)
+        return job, coalesced
+
+    def _promote(self, job: IngestJob) -> None:
+        """Serve a bulk job that an interactive request merged into at interactive priority."""
+        service = self._services.get(job.id)
+        if service is not None:
+            # Running here: its remaining video fetches take interactive slots (and drop the bulk quota reserve)
+            service.priority = job.priority
+        elif job.status == QUEUED:
+            # Still waiting behind the bulk queue: an interactive worker picks it up too;
+            # whichever worker claims it first runs it
+            self._queues[job.priority].put_nowait(job.id)
+        logger.info("ingestion job promoted", extra={"job_id": job.id, "priority": job.priority})
+
+    def submit_batch(self, channels: List[Tuple[str, bool, float]]) -> Tuple[str, List[Tuple[IngestJob, bool]]]:
+        """
+        Queue ``(channel_url, incremental, weight)`` entries as one batch of bulk
+        jobs. All URLs are validated before anything is queued.
+        """
+        for channel_url, _, _ in channels:
+            self._validate(channel_url)
+        batch_id, created = self.store.create_batch(channels)
+        jobs: List[Tuple[IngestJob, bool]] = []
+        for job_id, coalesced in created:
+            if not coalesced:
+                self._queues[BULK].put_nowait(job_id)
+            jobs.append((self.store.get(job_id, include_videos=False), coalesced))  # type: ignore[arg-type]
+        return batch_id, jobs
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self.store.get(job_id)
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Per-channel completion plus aggregate progress and throughput of a batch."""
+        batch = self.store.get_batch(batch_id)
+        if batch is None:
+            return None
+        entries: List[IngestJob] = batch["jobs"]
+        # A channel listed twice shares one job; count it once
+        jobs = list({job.id: job for job in entries}.values())
+        statuses = {job.status for job in jobs}
+        if statuses & set(ACTIVE_STATUSES):
+            status = QUEUED if statuses == {QUEUED} else RUNNING
+        elif FAILED in statuses:
+            status = FAILED if statuses == {FAILED} else PARTIAL
+        else:
+            status = SUCCEEDED
+        started = [job.started_at for job in jobs if job.started_at]
+        finished_at = max((job.finished_at or 0.0) for job in jobs) if status not in ACTIVE_STATUSES else None
+        elapsed = ((finished_at or time.time()) - min(started)) if started else 0.0
+        completed = sum(job.completed for job in jobs)
+        # Totals are known once a channel has been enumerated
+        enumerated = [job for job in jobs if job.total is not None]
+        return {
+            "batch_id": batch_id,
+            "status": status,
+            "created_at": batch["created_at"],
+            "started_at": min(started) if started else None,
+            "finished_at": finished_at,
+            "channels": len(jobs),
+            "channels_finished": sum(1 for job in jobs if job.status not in ACTIVE_STATUSES),
+            "videos_total": sum(job.total for job in enumerated) if len(enumerated) == len(jobs) else None,
+            "videos_completed": completed,
+            "elapsed_seconds": round(elapsed, 3),
+            "videos_per_second": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+            "jobs": [
+                {
+                    "job_id": job.id,
+                    "channel_url": job.channel_url,
+                    "status": job.status,
+                    "priority": job.priority,
+                    "weight": job.weight,
+                    "total": job.total,
+                    "completed": job.completed,
+                    "progress": round(job.completed / job.total, 4) if job.total else (1.0 if job.total == 0 else 0.0),
+                    "error": job.error,
+                    "started_at": job.started_at,
+                    "finished_at": job.finished_at,
+                }
+                for job in entries
+            ],
+        }
+
+    def results(
+        self, job_id: str, offset: int = 0, limit: Optional[int] = None, include_text: bool = True
+    ) -> List[Dict[str, Any]]:
+        """A page of the job's transcripts; without ``include_text`` only their text length is returned."""
+        job = self.store.get(job_id, include_videos=False)
+        if job is None:
+            return []
+        corpus = self.corpus.corpus(collection_for_channel(job.channel_url)) if self.corpus is not None else None
+        results = []
+        for video_id, transcript in self.store.results(job_id, offset, limit):
+            if transcript is None:
+                entry = corpus.get(video_id) if corpus is not None else None
+                if entry is None:  # corpus removed since the job ran
+                    continue
+                transcript = {"video_id": video_id, "title": entry.title}
+                if include_text:
+                    transcript["text"] = corpus.text(video_id)  # type: ignore[union-attr]
+                else:
+                    transcript["chars"] = entry.chars
+            elif not include_text:
+                transcript["chars"] = len(transcript.pop("text", ""))
+            results.append(transcript)
+        return results
+
+    async def _requeue_expired(self) -> None:
+        # Picks up jobs of processes that died after this one started
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            requeued = self.store.requeue_interrupted()
+            if requeued:
+                logger.info("requeued ingestion jobs with expired leases", extra={"jobs": len(requeued)})
+            for job_id, priority in requeued:
+                self._queues[priority].put_nowait(job_id)
+
+    async def _worker(self, priority: str) -> None:
+        queue = self._queues[priority]
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        if not self.store.claim(job_id, self.owner, self.lease_seconds):
+            return  # finished, or claimed by another worker or process
+        # Log records of this job carry its id in place of a request id
+        request_id_var.set(f"job-{job_id}")
+        work = asyncio.create_task(self._execute(job_id))
+        try:
+            while not work.done():
+                await asyncio.wait({work}, timeout=self.lease_seconds / 3)
+                if not work.done() and not self.store.renew_lease(job_id, self.owner, self.lease_seconds):
+                    # Another process requeued the job after our lease expired; it runs there now
+                    logger.warning("ingestion job lease lost", extra={"job_id": job_id})
+                    work.cancel()
+                    await asyncio.wait({work})
+        except asyncio.CancelledError:
+            # Shutdown: hand the job back so the next start (or another process) picks it up
+            work.cancel()
+            await asyncio.wait({work})
+            self.store.release(job_id, self.owner)
+            raise
+
+    async def _execute(self, job_id: str) -> None:
+        try:
+            # Read and registered without yielding, so a promotion lands either in
+            # the stored priority or on the registered service
+            job = self.store.get(job_id, include_videos=False)
+            assert job is not None
+            service = self._services[job_id] = self.service_factory(priority=job.priority, weight=job.weight)
+            transcripts = self._ingest(service, job_id, job.channel_url, job.incremental)
+            if self.embeddings is not None and self.vectors is not None:
+                await self._index(job.channel_url, transcripts)
+            else:
+                async for _ in transcripts:
+                    pass
+            self.store.finish(job_id, SUCCEEDED)
+        except Exception as e:
+            logger.error("ingestion job failed", extra={"job_id": job_id, "error": str(e)})
+            self.store.finish(job_id, FAILED, error=str(e))
+        finally:
+            self._services.pop(job_id, None)
+
+    async def _ingest(
+        self, service: TranscriptService, job_id: str, channel_url: str, incremental: bool
+    ) -> AsyncIterator[TranscriptItem]:
+        """Record progress/results of one job and pass each transcript on as it completes."""
+        # Segments are needed for timestamped chunks (and tell captioned videos, which
+        # the corpus holds, from demo text) but are not part of stored job results
+        segments = service.corpus is not None or (self.embeddings is not None and self.vectors is not None)
+        # Job store writes are SQLite transactions; they run in a thread, off the event loop
+        async for event in service.iter_ingest_events(channel_url, incremental=incremental, include_segments=segments):
+            if event["type"] == "start":
+                await asyncio.to_thread(self.store.set_videos, job_id, event["video_ids"])
+            elif event["type"] == "transcript":
+                transcript = event["transcript"]
+                item = TranscriptItem.from_dict(transcript)
+                transcript.pop("segments", None)
+                # The service already wrote captioned videos to the corpus
+                in_corpus = service.corpus is not None and bool(item.segments)
+                await asyncio.to_thread(self.store.record_video, job_id, transcript, not in_corpus)
+                yield item
+
+    async def _index(self, channel_url: str, transcripts: AsyncIterator[TranscriptItem]) -> None:
+        assert self.embeddings is not None and self.vectors is not None
+        collection = collection_for_channel(channel_url)
+        # Chunk ids are stable, so unchanged chunks are overwritten in place;
+        # chunks a re-ingested video no longer produces are pruned afterwards
+        chunk_ids: Dict[str, set] = {}
+        skipped = 0
+
+        async def captioned() -> AsyncIterator[TranscriptItem]:
+            # Demo text and failed fetches are in the job's progress but never indexed:
+            # they would replace (and prune) the chunks of the video's real captions
+            nonlocal skipped
+            async for item in transcripts:
+                if item.status == STATUS_OK:
+                    yield item
+                else:
+                    skipped += 1
+
+        async for batch in self.embeddings.process(captioned()):
+            ids = [chunk.chunk_id for chunk in batch.chunks]
+            with span("index_batch", chunks=len(ids)):
+                await self.vectors.upsert(collection, ids, batch.vectors, [chunk.to_dict() for chunk in batch.chunks])
+                if self.lexical is not None:
+                    await asyncio.to_thread(self.lexical.add_chunks, collection, batch.chunks)
+            for chunk in batch.chunks:
+                chunk_ids.setdefault(chunk.video_id, set()).add(chunk.chunk_id)
+        for video_id, keep in chunk_ids.items():
+            await self.vectors.delete_video(collection, video_id, keep)
+            if self.lexical is not None:
+                await asyncio.to_thread(self.lexical.delete_video, collection, video_id, keep)
+        if self.lexical is not None and chunk_ids:
+            with span("lexical_flush", collection=collection):
+                await asyncio.to_thread(self.lexical.flush, collection)
+        if self.answers is not None and chunk_ids:
+            await asyncio.to_thread(self.answers.invalidate, collection)
+        logger.info(
+            "indexed chunks",
+            extra={
+                "collection": collection,
+                "chunks": sum(len(ids) for ids in chunk_ids.values()),
+                "skipped_videos": skipped,
+            },
+        )
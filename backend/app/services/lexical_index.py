@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Collection, Dict, Iterable, List, Optional, Tuple
+
+from ..core.lazy import lazy_module
+from .chunking import Chunk
+from .vector_store import SearchHit
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Skipped in ranked queries (still indexed, so phrases containing them match)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or so that the this to "
+    "was we were what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over transcript chunks (the same units, and ids, as
+    the vector store), built incrementally as videos are ingested.
+
+    Postings are per-term ``array`` buffers (doc numbers, term frequencies and
+    flattened token positions) appended in doc order, so adding a video never
+    rewrites existing postings. Queries score with NumPy over cached frozen
+    copies of the touched postings. Positions support exact phrase lookups;
+    each doc keeps its segment boundaries so a match maps back to a timestamp.
+    Replaced or deleted docs are tombstoned and dropped on compaction.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        # Per term
+        self._docs: List[array] = []
+        self._tfs: List[array] = []
+        self._pos_off: List[array] = []
+        self._pos: List[array] = []
+        self._frozen: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._frozen_keys: Dict[int, np.ndarray] = {}
+        # Per doc
+        self.doc_ids: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.doc_len = array("I")
+        self.live = bytearray()
+        self.seg_tok: List[array] = []  # token index where each segment starts
+        self.seg_time: List[array] = []  # start time of each segment
+        self.doc_of: Dict[str, int] = {}
+        self.by_video: Dict[str, List[int]] = {}
+        self.live_docs = 0
+        self.live_tokens = 0
+        self._doc_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    # Updates ------------------------------------------------------------
+
+    def add_chunks(self, chunks: Iterable[Chunk]) -> int:
+        added = 0
+        for chunk in chunks:
+            segments = chunk.segments or []
+            tokens: List[str] = []
+            seg_tok = array("I")
+            seg_time = array("d")
+            for segment in segments:
+                seg_tok.append(len(tokens))
+                seg_time.append(segment.start)
+                tokens.extend(tokenize(segment.text))
+            if not segments:
+                seg_tok.append(0)
+                seg_time.append(chunk.start)
+                tokens = tokenize(chunk.text)
+            self._add_doc(chunk.chunk_id, chunk.to_dict(), tokens, seg_tok, seg_time)
+            added += 1
+        return added
+
+    def _add_doc(self, doc_id: str, payload: Dict[str, Any], tokens: List[str], seg_tok: array, seg_time: array) -> None:
+        previous = self.doc_of.get(doc_id)
+        if previous is not None:
+            self._kill(previous)
+        doc = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.payloads.append(payload)
+        self.doc_len.append(len(tokens))
+        self.live.append(1)
+        self.seg_tok.append(seg_tok)
+        self.seg_time.append(seg_time)
+        self.doc_of[doc_id] = doc
+        self.by_video.setdefault(payload["video_id"], []).append(doc)
+        self.live_docs += 1
+        self.live_tokens += len(tokens)
+
+        positions: Dict[int, List[int]] = {}
+        for position, token in enumerate(tokens):
+            term = self.vocab.get(token)
+            if term is None:
+                term = self.vocab[token] = len(self._docs)
+                self._docs.append(array("I"))
+                self._tfs.append(array("I"))
+                self._pos_off.append(array("I", [0]))
+                self._pos.append(array("I"))
+            positions.setdefault(term, []).append(position)
+        for term, term_positions in positions.items():
+            self._docs[term].append(doc)
+            self._tfs[term].append(len(term_positions))
+            self._pos[term].extend(term_positions)
+            self._pos_off[term].append(len(self._pos[term]))
+            self._frozen.pop(term, None)
+            self._frozen_keys.pop(term, None)
+        self._doc_arrays = None
+
+    def _kill(self, doc: int) -> None:
+        if self.live[doc]:
+            self.live[doc] = 0
+            self.live_docs -= 1
+            self.live_tokens -= self.doc_len[doc]
+            del self.doc_of[self.doc_ids[doc]]
+            self._doc_arrays = None
+
+    def delete_video(self, video_id: str, keep: Collection[str] = ()) -> int:
+        removed = 0
+        for doc in self.by_video.get(video_id, []):
+            if self.live[doc] and self.doc_ids[doc] not in keep:
+                self._kill(doc)
+                removed += 1
+        self.by_video[video_id] = [doc for doc in self.by_video.get(video_id, []) if self.live[doc]]
+        return removed
+
+    @property
+    def dead_docs(self) -> int:
+        return len(self.doc_ids) - self.live_docs
+
+    def compacted(self) -> "LexicalIndex":
+        """A new index holding only live docs (tombstones and their postings dropped)."""
+        fresh = LexicalIndex(self.k1, self.b)
+        for doc, doc_id in enumerate(self.doc_ids):
+            if self.live[doc]:
+                fresh._add_doc(doc_id, self.payloads[doc], tokenize(self.payloads[doc]["text"]),
+                               self.seg_tok[doc], self.seg_time[doc])
+        return fresh
+
+    # Queries ------------------------------------------------------------
+
+    def _postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            frozen = self._frozen[term] = (
+                np.frombuffer(self._docs[term], dtype=np.uint32).astype(np.intp),
+                np.frombuffer(self._tfs[term], dtype=np.uint32).astype(np.float32),
+            )
+        return frozen
+
+    def _doc_state(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._doc_arrays is None:
+            self._doc_arrays = (
+                np.frombuffer(self.doc_len, dtype=np.uint32).astype(np.float32),
+                np.frombuffer(bytes(self.live), dtype=np.uint8).astype(bool),
+            )
+        return self._doc_arrays
+
+    def search(self, query: str, top_k: int = 10) -> List[SearchHit]:
+        tokens = tokenize(query)
+        content = [token for token in tokens if token not in _STOPWORDS] or tokens
+        terms = {self.vocab[token] for token in content if token in self.vocab}
+        if not terms or not self.live_docs:
+            return []
+        doc_len, live = self._doc_state()
+        avgdl = self.live_tokens / self.live_docs or 1.0
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        for term in terms:
+            docs, tfs = self._postings(term)
+            # Tombstoned docs stay in the postings until compaction; they do not count
+            df = int(np.count_nonzero(live[docs]))
+            if not df:
+                continue
+            idf = math.log(1.0 + (self.live_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * doc_len[docs] / avgdl)
+            scores[docs] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+        scores[~live] = 0.0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [SearchHit(self.doc_ids[doc], float(scores[doc]), self.payloads[doc]) for doc in candidates]
+
+    def phrase(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Chunks containing the exact token sequence, with the timestamp of the first match."""
+        tokens = tokenize(text)
+        if not tokens or any(token not in self.vocab for token in tokens):
+            return []
+        terms = [self.vocab[token] for token in tokens]
+        # Candidate phrase starts come from the rarest term, shifted back to token 0,
+        # then every other term must occur at its offset: all (doc << 32 | position) keys
+        anchor = min(range(len(terms)), key=lambda i: len(self._pos[terms[i]]))
+        starts = self._keys(terms[anchor]) - np.uint64(anchor)
+        for offset, term in enumerate(terms):
+            if offset == anchor or len(starts) == 0:
+                continue
+            keys = self._keys(term)
+            wanted = starts + np.uint64(offset)
+            found = np.searchsorted(keys, wanted)
+            found[found == len(keys)] = 0
+            starts = starts[keys[found] == wanted] if len(keys) else starts[:0]
+        if len(starts) == 0:
+            return []
+        docs = (starts >> np.uint64(32)).astype(np.intp)
+        # Keys are sorted, so the first key per doc is its earliest match
+        docs, first = np.unique(docs, return_index=True)
+        _, live = self._doc_state()
+        matches: List[Dict[str, Any]] = []
+        for doc, i in zip(docs, first):
+            if not live[doc]:
+                continue
+            position = int(starts[i] & np.uint64(0xFFFFFFFF))
+            matches.append({**self.payloads[doc], "match_time": round(self._time_of(int(doc), position), 3)})
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def _keys(self, term: int) -> np.ndarray:
+        """Sorted ``doc << 32 | position`` for every occurrence of ``term`` (cached until it changes)."""
+        keys = self._frozen_keys.get(term)
+        if keys is None:
+            docs, tfs = self._postings(term)
+            positions = np.frombuffer(self._pos[term], dtype=np.uint32).astype(np.uint64)
+            keys = (np.repeat(docs.astype(np.uint64), tfs.astype(np.intp)) << np.uint64(32)) | positions
+            self._frozen_keys[term] = keys
+        return keys
+
+    def _time_of(self, doc: int, position: int) -> float:
+        segment = bisect_right(self.seg_tok[doc], position) - 1
+        return self.seg_time[doc][max(segment, 0)]
+
+    def at_time(self, video_id: str, seconds: float) -> Optional[Dict[str, Any]]:
+        """The chunk of ``video_id`` whose time range covers ``seconds`` (nearest start otherwise)."""
+        best: Optional[int] = None
+        for doc in self.by_video.get(video_id, []):
+            if not self.live[doc]:
+                continue
+            payload = self.payloads[doc]
+            if payload["start"] <= seconds <= payload["end"]:
+                return payload
+            if best is None or abs(payload["start"] - seconds) < abs(self.payloads[best]["start"] - seconds):
+                best = doc
+        return self.payloads[best] if best is not None else None
+
+    # Persistence --------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        """Snapshot as one ``.npz`` of concatenated arrays plus JSON vocab/payloads."""
+        index = self.compacted() if self.dead_docs else self
+        terms = sorted(index.vocab, key=index.vocab.__getitem__)
+        docs, term_off = _concat(index._docs, np.uint32)
+        pos_off, pos_off_off = _concat(index._pos_off, np.uint32)
+        positions, pos_term_off = _concat(index._pos, np.uint32)
+        seg_tok, seg_off = _concat(index.seg_tok, np.uint32)
+        meta = json.dumps({"terms": terms, "payloads": index.payloads}, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                meta=np.frombuffer(meta, dtype=np.uint8),
+                docs=docs,
+                tfs=_concat(index._tfs, np.uint32)[0],
+                term_off=term_off,
+                pos_off=pos_off,
+                pos_off_off=pos_off_off,
+                positions=positions,
+                pos_term_off=pos_term_off,
+                doc_len=np.frombuffer(index.doc_len, dtype=np.uint32),
+                seg_tok=seg_tok,
+                seg_time=_concat(index.seg_time, np.float64)[0],
+                seg_off=seg_off,
+            )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, k1: float = 1.2, b: float = 0.75) -> "LexicalIndex":
+        index = cls(k1, b)
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            docs, tfs, term_off = data["docs"], data["tfs"], data["term_off"]
+            pos_off, pos_off_off = data["pos_off"], data["pos_off_off"]
+            positions, pos_term_off = data["positions"], data["pos_term_off"]
+            seg_tok, seg_time, seg_off = data["seg_tok"], data["seg_time"], data["seg_off"]
+            for term, token in enumerate(meta["terms"]):
+                index.vocab[token] = term
+                index._docs.append(array("I", docs[term_off[term]:term_off[term + 1]].tobytes()))
+                index._tfs.append(array("I", tfs[term_off[term]:term_off[term + 1]].tobytes()))
+                index._pos_off.append(array("I", pos_off[pos_off_off[term]:pos_off_off[term + 1]].tobytes()))
+                index._pos.append(array("I", positions[pos_term_off[term]:pos_term_off[term + 1]].tobytes()))
+            index.doc_len = array("I", data["doc_len"].tobytes())
+            for doc, payload in enumerate(meta["payloads"]):
+                index.doc_ids.append(payload["chunk_id"])
+                index.payloads.append(payload)
+                index.seg_tok.append(array("I", seg_tok[seg_off[doc]:seg_off[doc + 1]].tobytes()))
+                index.seg_time.append(array("d", seg_time[seg_off[doc]:seg_off[doc + 1]].tobytes()))
+                index.doc_of[payload["chunk_id"]] = doc
+                index.by_video.setdefault(payload["video_id"], []).append(doc)
+        index.live = bytearray([1]) * len(index.doc_ids)
+        index.live_docs = len(index.doc_ids)
+        index.live_tokens = sum(index.doc_len)
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        postings = sum(len(docs) for docs in self._docs)
+        positions = sum(len(pos) for pos in self._pos)
+        return {
+            "docs": self.live_docs,
+            "dead_docs": self.dead_docs,
+            "terms": len(self.vocab),
+            "postings": postings,
+            # doc ids + tfs + positions + position offsets, 4 bytes each
+            "postings_bytes": 4 * (3 * postings + positions + len(self._docs)),
+        }
+
+
+def _concat(arrays: List[array], dtype: Any) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(a) for a in arrays])
+    if not arrays:
+        return np.zeros(0, dtype=dtype), offsets
+    return np.concatenate([np.frombuffer(a, dtype=dtype) for a in arrays]), offsets
+
+
+class LexicalStore:
+    """
+    One ``LexicalIndex`` per channel collection, loaded lazily from
+    ``root/<collection>.npz`` and snapshotted after each ingestion.
+    """
+
+    def __init__(self, root: str, k1: float = 1.2, b: float = 0.75):
+        self.root = Path(root)
+        self.k1 = k1
+        self.b = b
+        self._indexes: Dict[str, LexicalIndex] = {}
+        self._lock = threading.RLock()
+
+    def _path(self, collection: str) -> Path:
+        return self.root / f"{collection}.npz"
+
+    def index(self, collection: str) -> LexicalIndex:
+        with self._lock:
+            index = self._indexes.get(collection)
+            if index is None:
+                path = self._path(collection)
+                index = LexicalIndex.load(path, self.k1, self.b) if path.exists() else LexicalIndex(self.k1, self.b)
+                self._indexes[collection] = index
+            return index
+
+    def add_chunks(self, collection: str, chunks: Iterable[Chunk]) -> int:
+        with self._lock:
+            return self.index(collection).add_chunks(chunks)
+
+    def delete_video(self, collection: str, video_id: str, keep: Collection[str] = ()) -> int:
+        with self._lock:
+            return self.index(collection).delete_video(video_id, keep)
+
+    def search(self, collection: str, query: str, top_k: int = 10) -> List[SearchHit]:
+        with self._lock:
+            return self.index(collection).search(query, top_k)
+
+    def phrase(self, collection: str, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.index(collection).phrase(text, limit)
+
+    def at_time(self, collection: str, video_id: str, seconds: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.index(collection).at_time(video_id, seconds)
+
+    def flush(self, collection: str) -> None:
+        """Persist the collection; compacts away tombstones once they outnumber live docs."""
+        with self._lock:
+            index = self._indexes.get(collection)
+            if index is None:
+                return
+            if index.dead_docs > index.live_docs:
+                index = self._indexes[collection] = index.compacted()
+            self.root.mkdir(parents=True, exist_ok=True)
+            index.save(self._path(collection))
+
+    def warm_up(self) -> int:
+        """Blocking: load every index already on disk; returns how many were loaded."""
+        if not self.root.exists():
+            return 0
+        names = [path.stem for path in self.root.glob("*.npz")]
+        for name in names:
+            self.index(name)
+        return len(names)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: index.stats() for name, index in self._indexes.items()}
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from ..core.lazy import lazy_module
+from ..core.settings import Settings
+
+if TYPE_CHECKING:
+    import httpx
+else:
+    httpx = lazy_module("httpx")
+
+SYSTEM_PROMPT = (
+    "You answer questions about a YouTube channel using only the transcript excerpts provided. "
+    "Cite the videos you use by title. If the excerpts do not contain the answer, say so."
+)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _timestamp(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def build_prompt(question: str, chunks: Sequence[Dict[str, Any]]) -> str:
+    """User prompt: numbered transcript excerpts (title + time range) followed by the question."""
+    context = "\n\n".join(
+        f"[{i}] {chunk.get('title') or chunk['video_id']} ({_timestamp(chunk['start'])}-{_timestamp(chunk['end'])})\n"
+        f"{chunk['text']}"
+        for i, chunk in enumerate(chunks, 1)
+    )
+    return f"Transcript excerpts:\n\n{context}\n\nQuestion: {question}"
+
+
+class LLM(ABC):
+    """
+    A chat model that streams its answer as text fragments. ``name`` identifies
+    the model in the answer cache; answers from different models never mix.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def stream(self, question: str, chunks: Sequence[Dict[str, Any]]) -> AsyncIterator[str]:
+        ...
+
+
+class OllamaLLM(LLM):
+    """Ollama ``/api/chat`` with ``stream: true`` (one JSON object per line, each with a token fragment)."""
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str = "llama3.2",
+        http_client: Optional[httpx.AsyncClient] = None,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        timeout: float = 120.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.name = f"ollama:{model}"
+        self.http_client = http_client
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        # Generation can stall between tokens while the model loads; the shared client's timeouts are for APIs
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+
+    async def stream(self, question: str, chunks: Sequence[Dict[str, Any]]) -> AsyncIterator[str]:
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": build_prompt(question, chunks)},
+            ],
+            "stream": True,
+            "options": {"temperature": self.temperature, "num_predict": self.max_tokens},
+        }
+        client = self.http_client or httpx.AsyncClient()
+        try:
+            async with client.stream(
+                "POST", f"{self.base_url}/api/chat", json=payload, timeout=self.timeout
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    if message.get("error"):
+                        raise RuntimeError(f"Ollama error: {message['error']}")
+                    text = message.get("message", {}).get("content", "")
+                    if text:
+                        yield text
+                    if message.get("done"):
+                        break
+        finally:
+            if self.http_client is None:
+                await client.aclose()
+
+
+class FakeLLM(LLM):
+    """
+    Offline stand-in for tests, demos and benchmarks: "answers" with the
+    leading sentence of each of the top excerpts, streamed word by word with an
+    optional per-token delay to mimic generation speed. ``calls`` counts
+    generations, so tests can assert that cached answers skip the model.
+    """
+
+    name = "fake"
+
+    def __init__(self, token_delay: float = 0.0, max_sources: int = 2):
+        self.token_delay = token_delay
+        self.max_sources = max_sources
+        self.calls = 0
+
+    def answer(self, question: str, chunks: Sequence[Dict[str, Any]]) -> str:
+        if not chunks:
+            return "I could not find anything about that in this channel's transcripts."
+        parts: List[str] = []
+        for chunk in chunks[:self.max_sources]:
+            sentence = _SENTENCE_RE.split(chunk["text"].strip(), maxsplit=1)[0]
+            parts.append(f'In "{chunk.get("title") or chunk["video_id"]}" at {_timestamp(chunk["start"])}: {sentence}')
+        return "\n".join(parts)
+
+    async def stream(self, question: str, chunks: Sequence[Dict[str, Any]]) -> AsyncIterator[str]:
+        self.calls += 1
+        for i, word in enumerate(self.answer(question, chunks).split(" ")):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield word if i == 0 else " " + word
+
+
+def create_llm(settings: Settings, http_client: Optional[httpx.AsyncClient] = None) -> LLM:
+    if settings.llm_provider == "fake":
+        return FakeLLM(settings.fake_llm_token_delay_ms / 1000)
+    return OllamaLLM(
+        settings.ollama_base_url,
+        settings.llm_model,
+        http_client,
+        temperature=settings.llm_temperature,
+        max_tokens=settings.llm_max_tokens,
+        timeout=settings.llm_timeout_seconds,
+    )
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..core.metrics import STAGE_SECONDS
+from ..core.settings import Settings
+
+try:
+    from zoneinfo import ZoneInfo
+
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:  # pragma: no cover - no tz database available
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    day   TEXT PRIMARY KEY,
+    units INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rate_state (
+    id            INTEGER PRIMARY KEY CHECK (id = 1),
+    rate          REAL NOT NULL,
+    tat           REAL NOT NULL,
+    blocked_until REAL NOT NULL,
+    throttles     INTEGER NOT NULL
+);
+"""
+
+
+class QuotaExhausted(Exception):
+    """Today's quota (less the caller's reserve) cannot cover the call."""
+
+
+def quota_day(now: Optional[float] = None) -> str:
+    """YouTube Data API quota resets at midnight Pacific Time."""
+    moment = datetime.fromtimestamp(now if now is not None else time.time(), tz=_QUOTA_TZ)
+    return moment.date().isoformat()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as delta-seconds or an HTTP date -> seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaManager:
+    """
+    Process-wide YouTube API quota accounting and call pacing, persisted in
+    SQLite so every service instance, uvicorn worker and restart shares one
+    budget. Each operation is a single ``BEGIN IMMEDIATE`` transaction, which
+    SQLite serializes across processes.
+
+    Pacing is GCRA (a token bucket expressed as a "theoretical arrival time")
+    with an adaptive rate: a 429 halves the rate and blocks all callers until
+    Retry-After, successes raise it additively back to the configured maximum.
+
+    Methods block on SQLite (a contending writer waits up to the busy timeout);
+    async callers run them in a thread with ``asyncio.to_thread``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        daily_limit: int,
+        max_rate: float,
+        burst: int,
+        min_rate: float = 0.1,
+        recovery_step: float = 0.05,
+    ):
+        self.daily_limit = daily_limit
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.burst = burst
+        # Fraction of max_rate regained per successful call after throttling
+        self.recovery_step = recovery_step
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps NORMAL durable against app crashes; only an OS crash can lose the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO rate_state (id, rate, tat, blocked_until, throttles) VALUES (1, ?, 0, 0, 0)",
+            (max_rate,),
+        )
+        # The configured maximum may have been lowered since the state was written
+        self._conn.execute("UPDATE rate_state SET rate = MIN(rate, ?) WHERE id = 1", (max_rate,))
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "QuotaManager":
+        return cls(
+            path=settings.quota_db_path,
+            daily_limit=settings.youtube_daily_quota,
+            max_rate=settings.youtube_api_rate_per_second,
+            burst=settings.youtube_api_burst,
+            min_rate=settings.youtube_api_min_rate_per_second,
+        )
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # Quota --------------------------------------------------------------
+
+    def used_today(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT units FROM quota_usage WHERE day = ?", (quota_day(),)).fetchone()
+        return row[0] if row else 0
+
+    def has_remaining(self, units: int) -> bool:
+        return self.used_today() + units <= self.daily_limit
+
+    def try_consume(self, units: int, reserve: int = 0) -> Optional[int]:
+        """
+        Charge ``units`` if today's budget still covers them plus ``reserve``;
+        returns the new total, or None (nothing charged) when it does not.
+        Check and charge are one transaction, so concurrent callers in any
+        process can never overspend the limit between them.
+        """
+        day = quota_day()
+
+        def apply(conn: sqlite3.Connection) -> Optional[int]:
+            row = conn.execute("SELECT units FROM quota_usage WHERE day = ?", (day,)).fetchone()
+            used = row[0] if row else 0
+            if used + units + reserve > self.daily_limit:
+                return None
+            conn.execute(
+                "INSERT INTO quota_usage (day, units) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET units = units + excluded.units",
+                (day, units),
+            )
+            conn.execute("DELETE FROM quota_usage WHERE day < ?", (day,))
+            return used + units
+
+        return self._transaction(apply)
+
+    def consume(self, units: int) -> int:
+        """Record ``units`` against today's budget; returns the new total."""
+        day = quota_day()
+
+        def apply(conn: sqlite3.Connection) -> int:
+            conn.execute(
+                "INSERT INTO quota_usage (day, units) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET units = units + excluded.units",
+                (day, units),
+            )
+            # Older days are never read again
+            conn.execute("DELETE FROM quota_usage WHERE day < ?", (day,))
+            return conn.execute("SELECT units FROM quota_usage WHERE day = ?", (day,)).fetchone()[0]
+
+        return self._transaction(apply)
+
+    # Pacing -------------------------------------------------------------
+
+    def reserve_slot(self) -> float:
+        """Claim the next call slot; returns how many seconds to wait before calling."""
+
+        def apply(conn: sqlite3.Connection) -> float:
+            now = time.time()
+            rate, tat, blocked_until = conn.execute(
+                "SELECT rate, tat, blocked_until FROM rate_state WHERE id = 1"
+            ).fetchone()
+            interval = 1.0 / rate
+            tolerance = (self.burst - 1) * interval
+            start = max(tat, now, blocked_until)
+            wait = max(start - tolerance - now, blocked_until - now, 0.0)
+            conn.execute("UPDATE rate_state SET tat = ? WHERE id = 1", (start + interval,))
+            return wait
+
+        return self._transaction(apply)
+
+    async def wait_for_slot(self) -> float:
+        wait = await asyncio.to_thread(self.reserve_slot)
+        STAGE_SECONDS.labels(stage="rate_limit_wait").observe(wait)
+        if wait > 0:
+            logger.debug("rate limiting", extra={"wait_seconds": round(wait, 3)})
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_success(self) -> None:
+        """Additive increase back towards ``max_rate`` after a throttle."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE rate_state SET rate = MIN(?, rate + ?) WHERE id = 1 AND rate < ?",
+                (self.max_rate, self.max_rate * self.recovery_step, self.max_rate),
+            )
+
+    def record_throttle(self, retry_after: Optional[float]) -> None:
+        """Multiplicative decrease on 429; honour Retry-After for every caller."""
+        pause = retry_after if retry_after is not None else 1.0 / self.min_rate
+
+        def apply(conn: sqlite3.Connection) -> None:
+            now = time.time()
+            conn.execute(
+                "UPDATE rate_state SET rate = MAX(?, rate / 2), blocked_until = MAX(blocked_until, ?), "
+                "tat = MAX(tat, ?), throttles = throttles + 1 WHERE id = 1",
+                (self.min_rate, now + pause, now + pause),
+            )
+
+        self._transaction(apply)
+        logger.warning("throttled by YouTube API; halving request rate", extra={"pause_seconds": round(pause, 3)})
+
+    def stats(self) -> Dict[str, Any]:
+        used = self.used_today()
+        with self._lock:
+            rate, blocked_until, throttles = self._conn.execute(
+                "SELECT rate, blocked_until, throttles FROM rate_state WHERE id = 1"
+            ).fetchone()
+        return {
+            "day": quota_day(),
+            "used": used,
+            "limit": self.daily_limit,
+            "remaining": max(self.daily_limit - used, 0),
+            "rate_per_second": round(rate, 3),
+            "max_rate_per_second": self.max_rate,
+            "blocked_for_seconds": round(max(blocked_until - time.time(), 0.0), 3),
+            "throttles": throttles,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..core.lazy import lazy_module
+from ..core.settings import Settings
+from .embeddings import EmbeddingPipeline
+from .lexical_index import LexicalStore
+from .vector_store import SearchHit, VectorStore, collection_for_channel
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_module("numpy")
+
+MODES = ("hybrid", "vector", "lexical")
+
+
+def reciprocal_rank_fusion(
+    vector_hits: List[SearchHit],
+    lexical_hits: List[SearchHit],
+    k: int = 60,
+    lexical_weight: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """
+    Fuse two rankings by ``sum(weight / (k + rank))``. Rank-based, so BM25 and
+    cosine scores need no calibration against each other.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for weight, key, hits in ((1.0, "vector_score", vector_hits), (lexical_weight, "lexical_score", lexical_hits)):
+        for rank, hit in enumerate(hits, 1):
+            entry = fused.setdefault(hit.id, {**hit.payload, "score": 0.0, "vector_score": None, "lexical_score": None})
+            entry["score"] += weight / (k + rank)
+            entry[key] = round(hit.score, 6)
+    ranked = sorted(fused.values(), key=lambda entry: entry["score"], reverse=True)
+    for entry in ranked:
+        entry["score"] = round(entry["score"], 6)
+    return ranked
+
+
+def _ranked(hits: List[SearchHit], key: str) -> List[Dict[str, Any]]:
+    return [{**hit.payload, "score": round(hit.score, 6), key: round(hit.score, 6)} for hit in hits]
+
+
+class Retriever:
+    """Top-k transcript chunks of a channel by vector similarity, BM25, or both fused."""
+
+    def __init__(
+        self,
+        embeddings: EmbeddingPipeline,
+        vectors: VectorStore,
+        lexical: Optional[LexicalStore],
+        rrf_k: int = 60,
+        lexical_weight: float = 1.0,
+    ):
+        self.embeddings = embeddings
+        self.vectors = vectors
+        self.lexical = lexical
+        self.rrf_k = rrf_k
+        self.lexical_weight = lexical_weight
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, embeddings: EmbeddingPipeline, vectors: VectorStore, lexical: Optional[LexicalStore]
+    ) -> "Retriever":
+        return cls(embeddings, vectors, lexical, settings.hybrid_rrf_k, settings.hybrid_lexical_weight)
+
+    async def _vector_hits(
+        self, collection: str, query: str, limit: int, vector: Optional[np.ndarray] = None
+    ) -> List[SearchHit]:
+        if vector is None:
+            vector = (await self.embeddings.embedder.embed([query]))[0]
+        return await self.vectors.search(collection, vector, limit)
+
+    async def retrieve(
+        self,
+        channel_url: str,
+        query: str,
+        top_k: int = 5,
+        mode: str = "hybrid",
+        query_vector: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """``query_vector``: the query's embedding, when the caller already has it."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if mode != "vector" and self.lexical is None:
+            mode = "vector"
+        collection = collection_for_channel(channel_url)
+
+        if mode == "lexical":
+            assert self.lexical is not None
+            return _ranked(self.lexical.search(collection, query, top_k), "lexical_score")
+        if mode == "vector":
+            return _ranked(await self._vector_hits(collection, query, top_k, query_vector), "vector_score")
+
+        # Fuse deeper candidate lists than requested so either ranking can promote a chunk
+        depth = max(top_k * 4, 20)
+        assert self.lexical is not None
+        vector_hits, lexical_hits = await asyncio.gather(
+            self._vector_hits(collection, query, depth, query_vector),
+            asyncio.to_thread(self.lexical.search, collection, query, depth),
+        )
+        return reciprocal_rank_fusion(vector_hits, lexical_hits, self.rrf_k, self.lexical_weight)[:top_k]
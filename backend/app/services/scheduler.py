@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from ..core.metrics import SCHEDULER_WAIT_SECONDS
+from ..core.settings import Settings
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+# Highest priority first
+PRIORITIES = (INTERACTIVE, BULK)
+
+
+@dataclass
+class _Flow:
+    """Waiters of one channel within one priority class."""
+
+    weight: float
+    # Virtual time of the next grant; advances by 1/weight per grant
+    finish: float
+    # Arrival order, breaks ties between flows at the same virtual time
+    seq: int
+    waiters: Deque[asyncio.Future] = field(default_factory=deque)
+
+
+class FairScheduler:
+    """
+    Global admission control for video fetches: at most ``slots`` run at once
+    across every channel, request and job. A freed slot goes to interactive
+    waiters before bulk ones; within a priority class channels are served by
+    stride scheduling, so each waiting channel gets a share of the slots
+    proportional to its weight no matter how many videos it has queued.
+
+    Single event loop only (no locking); callers use ``async with slot(...)``.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.in_flight = 0
+        self._flows: Dict[Tuple[str, str], _Flow] = {}
+        self._seq = itertools.count()
+        self._virtual_time: Dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._granted: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._waited: Dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FairScheduler":
+        return cls(settings.ingest_global_concurrency)
+
+    @asynccontextmanager
+    async def slot(self, flow: str, priority: str = INTERACTIVE, weight: float = 1.0) -> AsyncIterator[None]:
+        await self.acquire(flow, priority, weight)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, flow: str, priority: str = INTERACTIVE, weight: float = 1.0) -> None:
+        if priority not in self._virtual_time:
+            raise ValueError(f"Unknown priority {priority!r}")
+        key = (priority, flow)
+        state = self._flows.get(key)
+        if state is None:
+            # A channel (re)joining starts at the current virtual time: idle time earns no credit
+            state = self._flows[key] = _Flow(max(weight, 1e-3), self._virtual_time[priority], next(self._seq))
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        state.waiters.append(future)
+        started = time.perf_counter()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted and cancelled in the same tick: hand the slot on
+                self.release()
+            elif future in state.waiters:
+                state.waiters.remove(future)
+                self._prune(key)
+            raise
+        waited = time.perf_counter() - started
+        self._waited[priority] += waited
+        SCHEDULER_WAIT_SECONDS.labels(priority=priority).observe(waited)
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.slots:
+            picked = self._next_flow()
+            if picked is None:
+                return
+            key, state = picked
+            future = state.waiters.popleft()
+            self._virtual_time[key[0]] = state.finish
+            state.finish += 1.0 / state.weight
+            self._prune(key)
+            if future.cancelled():
+                continue
+            future.set_result(None)
+            self.in_flight += 1
+            self._granted[key[0]] += 1
+
+    def _next_flow(self) -> Optional[Tuple[Tuple[str, str], _Flow]]:
+        for priority in PRIORITIES:
+            # Few channels are active at once, so a scan beats maintaining a heap
+            candidates = [(state.finish, state.seq, key) for key, state in self._flows.items() if key[0] == priority]
+            if candidates:
+                key = min(candidates)[2]
+                return key, self._flows[key]
+        return None
+
+    def _prune(self, key: Tuple[str, str]) -> None:
+        state = self._flows.get(key)
+        if state is not None and not state.waiters:
+            del self._flows[key]
+
+    def stats(self) -> Dict[str, Any]:
+        waiting = {priority: 0 for priority in PRIORITIES}
+        for (priority, _), state in self._flows.items():
+            waiting[priority] += len(state.waiters)
+        return {
+            "slots": self.slots,
+            "in_flight": self.in_flight,
+            "waiting": waiting,
+            "waiting_channels": len(self._flows),
+            "granted": dict(self._granted),
+            "mean_wait_ms": {
+                priority: round(self._waited[priority] / granted * 1000, 3) if granted else 0.0
+                for priority, granted in self._granted.items()
+            },
+        }
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key: while a call for ``key`` is in
+    flight, later callers await the same result instead of starting their own.
+
+    The shared call runs in its own task, so one caller being cancelled (e.g. a
+    disconnected client) does not cancel the work for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._calls: Dict[str, int] = defaultdict(int)
+        self._coalesced: Dict[str, int] = defaultdict(int)
+
+    async def do(self, namespace: str, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        full_key = f"{namespace}:{key}"
+        self._calls[namespace] += 1
+        future = self._inflight.get(full_key)
+        if future is not None:
+            self._coalesced[namespace] += 1
+        else:
+            future = asyncio.ensure_future(fn())
+            self._inflight[full_key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(full_key, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            namespace: {
+                "calls": calls,
+                "coalesced": self._coalesced[namespace],
+                "in_flight": sum(1 for key in self._inflight if key.startswith(f"{namespace}:")),
+            }
+            for namespace, calls in self._calls.items()
+        }
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.metrics import CACHE_LOOKUPS
+from ..core.settings import Settings
+from .captions import Segment
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id      TEXT NOT NULL,
+    track         TEXT NOT NULL,
+    title         TEXT NOT NULL,
+    text          TEXT NOT NULL,
+    segments      TEXT,
+    source_url    TEXT,
+    etag          TEXT,
+    last_modified TEXT,
+    size          INTEGER NOT NULL,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL,
+    PRIMARY KEY (video_id, track)
+);
+CREATE INDEX IF NOT EXISTS transcripts_accessed_at ON transcripts (accessed_at);
+"""
+
+
+@dataclass
+class CachedTranscript:
+    video_id: str
+    track: str
+    title: str
+    text: str = ""
+    segments: List[Segment] = field(default_factory=list)
+    source_url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    fresh: bool = False
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.source_url and (self.etag or self.last_modified))
+
+
+class TranscriptCache:
+    """
+    Persistent transcript cache in SQLite, keyed by (video_id, caption track).
+
+    Entries younger than ``ttl_seconds`` are served without any API call.
+    Older entries that carry an ETag/Last-Modified can be revalidated with a
+    conditional timedtext request (no quota). Total stored text is bounded by
+    ``max_bytes``; once a write crosses it, expired entries that cannot be
+    revalidated go first, then least recently used ones.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(transcripts)")}
+        if "segments" not in columns:  # caches created before segments were stored
+            self._conn.execute("ALTER TABLE transcripts ADD COLUMN segments TEXT")
+        # Running total of ``size``, so writes under the bound never scan the table
+        self._bytes: int = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TranscriptCache":
+        return cls(
+            path=settings.transcript_cache_path,
+            ttl_seconds=settings.transcript_cache_ttl_seconds,
+            max_bytes=settings.transcript_cache_max_bytes,
+        )
+
+    def get(self, video_id: str) -> Optional[CachedTranscript]:
+        """Return the most recently fetched track for a video, fresh or stale."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT video_id, track, title, text, segments, source_url, etag, last_modified, fetched_at "
+                "FROM transcripts WHERE video_id = ? ORDER BY fetched_at DESC LIMIT 1",
+                (video_id,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                CACHE_LOOKUPS.labels(cache="transcript", result="miss").inc()
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET accessed_at = ? WHERE video_id = ? AND track = ?",
+                (now, row[0], row[1]),
+            )
+
+        video_id, track, title, text, segments, source_url, etag, last_modified, fetched_at = row
+        entry = CachedTranscript(
+            video_id=video_id,
+            track=track,
+            title=title,
+            text=text,
+            segments=[Segment(*values) for values in json.loads(segments)] if segments else [],
+            source_url=source_url,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
+        )
+        entry.fresh = now - entry.fetched_at < self.ttl_seconds
+        if entry.fresh:
+            self.hits += 1
+            CACHE_LOOKUPS.labels(cache="transcript", result="hit").inc()
+        else:
+            self.stale += 1
+            CACHE_LOOKUPS.labels(cache="transcript", result="stale").inc()
+        return entry
+
+    def put(self, entry: CachedTranscript) -> None:
+        now = time.time()
+        # Segments are stored as compact [start, end, text] triples
+        segments = json.dumps(
+            [[round(s.start, 3), round(s.end, 3), s.text] for s in entry.segments],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ) if entry.segments else None
+        size = len(entry.text.encode("utf-8")) + len((segments or "").encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM transcripts WHERE video_id = ? AND track = ?", (entry.video_id, entry.track)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(video_id, track, title, text, segments, source_url, etag, last_modified, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.video_id, entry.track, entry.title, entry.text, segments, entry.source_url,
+                    entry.etag, entry.last_modified, size, now, now,
+                ),
+            )
+            self._bytes += size - (previous[0] if previous else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def mark_revalidated(self, entry: CachedTranscript) -> None:
+        """Restart the TTL of an entry the origin confirmed unchanged (HTTP 304)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE transcripts SET fetched_at = ?, accessed_at = ? WHERE video_id = ? AND track = ?",
+                (now, now, entry.video_id, entry.track),
+            )
+        entry.fetched_at = now
+        entry.fresh = True
+        self.revalidated += 1
+        CACHE_LOOKUPS.labels(cache="transcript", result="revalidated").inc()
+
+    def _evict(self) -> None:
+        # Caller holds the lock. Only reached over the bound: re-read the true total
+        # (another process may share the file), then free space
+        cutoff = time.time() - self.ttl_seconds
+        # Expired entries without validators can never be revalidated; drop them first
+        cursor = self._conn.execute(
+            "DELETE FROM transcripts WHERE fetched_at < ? AND etag IS NULL AND last_modified IS NULL",
+            (cutoff,),
+        )
+        self.evictions += max(cursor.rowcount, 0)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if self._bytes <= self.max_bytes:
+            return
+        for video_id, track, size in self._conn.execute(
+            "SELECT video_id, track, size FROM transcripts ORDER BY accessed_at ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM transcripts WHERE video_id = ? AND track = ?", (video_id, track))
+            self.evictions += 1
+            self._bytes -= size
+            if self._bytes <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "stale": self.stale,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.revalidated) / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
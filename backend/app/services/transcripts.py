@@ -1,41 +1,196 @@
 from __future__ import annotations
 
 import asyncio
-import time
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict, Any, Tuple
 
-import yt_dlp
-import httpx
+from ..core.http import connection_stats
+from ..core.lazy import lazy_module
+from ..core.metrics import DEMO_FALLBACKS, FETCH_FAILURES, QUOTA_UNITS, YOUTUBE_API_CALLS, span
+from ..core.settings import Settings, get_settings
+from .captions import Segment, parse_captions, segments_to_text
+from .channel_sync import (
+    ChannelStateStore,
+    ChannelWatermark,
+    VideoRef,
+    is_valid_video_id,
+    normalize_channel_url,
+    reached_watermark,
+)
+from .corpus import CorpusStore
+from .fetch_policy import RETRYABLE_STATUS, FetchPolicy, failure_reason
+from .quota import QuotaExhausted, QuotaManager, parse_retry_after
+from .scheduler import BULK, INTERACTIVE, FairScheduler
+from .singleflight import SingleFlight
+from .transcript_cache import CachedTranscript, TranscriptCache
+from .vector_store import collection_for_channel
+from .ytdlp_pool import YoutubeDLPool
 
-from ..core.settings import get_settings
+if TYPE_CHECKING:
+    import httpx
+else:
+    httpx = lazy_module("httpx")
+
+logger = logging.getLogger(__name__)
+
+# Where a TranscriptItem's text came from
+STATUS_OK = "ok"  # the video's captions
+STATUS_DEMO = "demo"  # placeholder text (no API key, quota exhausted, no captions)
+STATUS_FAILED = "failed"  # fetching failed after retries; no text
+
+
+class ChannelUnavailable(Exception):
+    """The channel's videos cannot be listed right now (quota exhausted, enumeration failed)."""
+
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
 
 
-@dataclass
 class TranscriptItem:
-    video_id: str
-    title: str
-    text: str
+    """
+    A video's transcript. Fetched captions are kept as timestamped segments and
+    ``text`` is joined from them on first access; demo transcripts carry text only.
+    ``status`` says whether the text is real, demo or missing (with ``reason``).
+    """
+
+    __slots__ = ("video_id", "title", "segments", "_text", "status", "reason")
+
+    def __init__(
+        self,
+        video_id: str,
+        title: str,
+        text: Optional[str] = None,
+        segments: Optional[List[Segment]] = None,
+        status: str = STATUS_OK,
+        reason: Optional[str] = None,
+    ):
+        self.video_id = video_id
+        self.title = title
+        self.segments = segments or []
+        self._text = text
+        self.status = status
+        self.reason = reason
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = segments_to_text(self.segments)
+        return self._text
+
+    def to_dict(self, include_segments: bool = False, include_text: bool = True) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"video_id": self.video_id, "title": self.title, "status": self.status}
+        if self.reason:
+            data["reason"] = self.reason
+        if include_text:
+            data["text"] = self.text
+        else:
+            data["chars"] = len(self.text)
+        if include_segments:
+            data["segments"] = [segment.to_dict() for segment in self.segments]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TranscriptItem":
+        segments = [Segment(s["start"], s["end"], s["text"]) for s in data.get("segments") or []]
+        return cls(
+            data["video_id"],
+            data["title"],
+            None if segments else data.get("text", ""),
+            segments,
+            data.get("status", STATUS_OK),
+            data.get("reason"),
+        )
 
 
 class TranscriptService:
-    def __init__(self):
-        self.last_api_call_time = 0
-        self.min_delay_between_calls = 2.0  # 2 seconds between calls to avoid per-minute limits
-        self.quota_used_today = 0
-        self.max_daily_quota = 1000  # Conservative limit (10% of 10,000 daily quota)
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TranscriptCache] = None,
+        channel_state: Optional[ChannelStateStore] = None,
+        singleflight: Optional[SingleFlight] = None,
+        quota: Optional[QuotaManager] = None,
+        ytdlp: Optional[YoutubeDLPool] = None,
+        scheduler: Optional[FairScheduler] = None,
+        priority: str = INTERACTIVE,
+        weight: float = 1.0,
+        corpus: Optional[CorpusStore] = None,
+        fetch_policy: Optional[FetchPolicy] = None,
+    ):
+        self.settings = settings or get_settings()
+        # Application-scoped pooled client; when absent each call opens its own
+        self.http_client = http_client
+        self.cache = cache
+        self.channel_state = channel_state
+        # Process-wide request coalescing shared by all service instances
+        self.singleflight = singleflight
+        # Persisted quota budget and adaptive pacing, shared across requests, workers and restarts
+        self.quota = quota or QuotaManager.from_settings(self.settings)
+        # Bounded executor with warm YoutubeDL instances for enumeration and titles
+        self.ytdlp = ytdlp or YoutubeDLPool.shared(self.settings)
+        # Global fetch slots shared with every other channel; priority and weight set this instance's share
+        self.scheduler = scheduler
+        # May be raised while running (an interactive request joined this bulk job)
+        self.priority = priority
+        self.weight = weight
+        # Fetched captions are also written to the channel's on-disk corpus
+        self.corpus = corpus
+        # Retries, per-host circuit breakers and hedging; app-scoped so breakers see every caller
+        self.fetch_policy = fetch_policy or FetchPolicy.from_settings(self.settings)
     
+    @property
+    def quota_reserve(self) -> int:
+        """Bulk ingestion stops short of the daily limit so interactive requests keep some quota."""
+        return self.settings.bulk_quota_reserve if self.priority == BULK else 0
+
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        if self.http_client is not None:
+            yield self.http_client
+            return
+        async with httpx.AsyncClient(timeout=self.settings.request_timeout_seconds) as client:
+            yield client
+
     async def _rate_limit_delay(self):
-        """Implement rate limiting between API calls."""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call_time
-        
-        if time_since_last_call < self.min_delay_between_calls:
-            delay = self.min_delay_between_calls - time_since_last_call
-            print(f"⏳ Rate limiting: waiting {delay:.1f}s before next API call...")
-            await asyncio.sleep(delay)
-        
-        self.last_api_call_time = time.time()
+        """Wait for the next call slot from the shared, adaptive rate limiter."""
+        await self.quota.wait_for_slot()
+
+    async def _api_get(
+        self, client: httpx.AsyncClient, url: str, operation: Optional[str] = None, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Paced Data API GET, retried per the fetch policy on 429s, 5xx and timeouts.
+        Every attempt waits for a call slot and is charged as ``operation``
+        before it is sent; a retry is only made while the quota covers it.
+        A 429 slows every caller down (honouring Retry-After); successes let
+        the rate recover. Raises QuotaExhausted when the first attempt is not
+        covered and the HTTP error for non-2xx responses once retries are
+        exhausted.
+        """
+        endpoint = url.split("?", 1)[0].rsplit("/", 1)[-1]
+        if operation is not None and not await self._charge_quota(operation):
+            raise QuotaExhausted(operation)
+
+        async def attempt() -> httpx.Response:
+            await self._rate_limit_delay()
+            r = await client.get(url, **kwargs)
+            YOUTUBE_API_CALLS.labels(endpoint=endpoint, status=str(r.status_code)).inc()
+            # Quota state is shared SQLite; its writes never run on the event loop
+            if r.status_code == 429:
+                await asyncio.to_thread(self.quota.record_throttle, parse_retry_after(r.headers.get("retry-after")))
+            elif r.is_success:
+                await asyncio.to_thread(self.quota.record_success)
+            r.raise_for_status()
+            return r
+
+        async def can_retry() -> bool:
+            # Charged here, just before the retry is sent
+            return operation is None or await self._charge_quota(operation)
+
+        return await self.fetch_policy.call(url, attempt, can_retry)
     
     def _estimate_quota_usage(self, operation: str) -> int:
         """Estimate quota usage for different operations."""
@@ -43,199 +198,499 @@ class TranscriptService:
             "captions_list": 1,  # captions.list costs 1 unit
             "timedtext_download": 0,  # timedtext downloads are free
             "video_list": 1,  # channels.list costs 1 unit per video
+            "channels_list": 1,  # channels.list (handle -> uploads playlist)
+            "playlist_items_list": 1,  # playlistItems.list costs 1 unit per page of 50
         }
         return quota_map.get(operation, 1)
     
-    def _check_quota_limit(self, estimated_usage: int) -> bool:
-        """Check if we can make the API call without exceeding quota."""
-        if self.quota_used_today + estimated_usage > self.max_daily_quota:
-            print(f"⚠️ Quota limit reached ({self.quota_used_today}/{self.max_daily_quota}). Using demo mode.")
+    async def _check_quota_limit(self, estimated_usage: int) -> bool:
+        """
+        Whether today's shared quota still covers ``estimated_usage``. Only an
+        early out before starting work; calls are charged by ``_charge_quota``.
+        """
+        if not await asyncio.to_thread(self.quota.has_remaining, estimated_usage + self.quota_reserve):
+            await self._log_quota_limit()
             return False
         return True
-    
-    def _record_quota_usage(self, operation: str):
-        """Record quota usage for tracking."""
-        usage = self._estimate_quota_usage(operation)
-        self.quota_used_today += usage
-        print(f"📊 Quota used: {self.quota_used_today}/{self.max_daily_quota} units")
 
-    async def fetch_channel_transcripts(self, channel_url: str) -> List[TranscriptItem]:
+    async def _charge_quota(self, operation: str) -> bool:
+        """Atomically charge one ``operation`` against today's shared budget; False if it does not fit."""
+        units = self._estimate_quota_usage(operation)
+        used = await asyncio.to_thread(self.quota.try_consume, units, self.quota_reserve)
+        if used is None:
+            await self._log_quota_limit()
+            return False
+        QUOTA_UNITS.labels(operation=operation).inc(units)
+        logger.debug(
+            "quota used", extra={"operation": operation, "units": units, "used": used, "limit": self.quota.daily_limit}
+        )
+        return True
+
+    async def _log_quota_limit(self) -> None:
+        used = await asyncio.to_thread(self.quota.used_today)
+        logger.warning(
+            "quota limit reached", extra={"used": used, "limit": self.quota.daily_limit, "reserve": self.quota_reserve}
+        )
+
+    async def fetch_channel_transcripts(
+        self,
+        channel_url: str,
+        incremental: bool = False,
+        include_segments: bool = False,
+        include_text: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch transcripts for a channel's newest videos. With ``incremental`` only
+        videos uploaded after the channel's stored watermark are fetched; with
+        ``include_segments`` each item also carries its timestamped caption segments.
+        Without ``include_text`` items carry only their text length (read the
+        text page by page from the corpus instead).
+        """
+        try:
+            videos = await self._resolve_channel_videos(channel_url, incremental)
+        except ChannelUnavailable as e:
+            return self._get_demo_transcripts(e.reason)
+        video_ids = [video.video_id for video in videos]
+
+        connections_before = connection_stats(self.http_client) if self.http_client else {}
+        titles = self._titles_from(videos)
+        fetched = {
+            item.video_id: self._store(channel_url, self._apply_title(item, titles))
+            async for item in self.iter_video_transcripts(video_ids, flow=normalize_channel_url(channel_url))
+        }
+        # Completion order is arbitrary; return items in channel order
+        results = [fetched[video_id] for video_id in video_ids if video_id in fetched]
+        fields: Dict[str, Any] = {
+            "channel_url": channel_url,
+            "fetched": sum(1 for item in results if item.status == STATUS_OK),
+            "demo": sum(1 for item in results if item.status == STATUS_DEMO),
+            "failed": sum(1 for item in results if item.status == STATUS_FAILED),
+            "videos": len(video_ids),
+        }
+        if connections_before:
+            connections_after = connection_stats(self.http_client)
+            fields["requests"] = connections_after["requests"] - connections_before["requests"]
+            fields["new_connections"] = connections_after["tcp_connects"] - connections_before["tcp_connects"]
+        logger.info("channel transcripts fetched", extra=fields)
+        if incremental:
+            self._advance_watermark(channel_url, videos, sum(1 for item in results if self._needs_retry(item)))
+
+        # Convert to dicts for Pydantic compatibility
+        return [item.to_dict(include_segments, include_text) for item in results]
+
+    async def iter_channel_transcripts(self, channel_url: str, incremental: bool = False) -> AsyncIterator[TranscriptItem]:
+        """Yield transcripts for a channel as each video finishes fetching."""
+        try:
+            videos = await self._resolve_channel_videos(channel_url, incremental)
+        except ChannelUnavailable as e:
+            for demo in self._get_demo_transcripts(e.reason):
+                yield TranscriptItem(**demo)
+            return
+
+        titles = self._titles_from(videos)
+        video_ids = [video.video_id for video in videos]
+        pending = 0
+        async for item in self.iter_video_transcripts(video_ids, flow=normalize_channel_url(channel_url)):
+            pending += self._needs_retry(item)
+            yield self._store(channel_url, self._apply_title(item, titles))
+        if incremental:
+            self._advance_watermark(channel_url, videos, pending)
+
+    async def iter_ingest_events(
+        self, channel_url: str, incremental: bool = False, include_segments: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Ingestion as a stream of events for streaming endpoints:
+        ``start`` (video ids to fetch), then ``transcript`` + ``progress`` per video as
+        it completes, then ``done``. Nothing is buffered, so memory stays flat.
+        Raises ValueError before the first event for an invalid channel URL.
+        """
+        titles: Dict[str, str] = {}
+        try:
+            videos: Optional[List[VideoRef]] = await self._resolve_channel_videos(channel_url, incremental)
+        except ChannelUnavailable as e:
+            # Demo items are streamed back but never stored and never move the watermark
+            videos = None
+            items = [TranscriptItem(**demo) for demo in self._get_demo_transcripts(e.reason)]
+            video_ids = [item.video_id for item in items]
+        else:
+            items = None
+            video_ids = [video.video_id for video in videos]
+            titles = self._titles_from(videos)
+        total = len(video_ids)
+        yield {"type": "start", "channel_url": channel_url, "total": total, "video_ids": video_ids}
+
+        stream = (
+            self._iter_items(items)
+            if items is not None
+            else self.iter_video_transcripts(video_ids, flow=normalize_channel_url(channel_url))
+        )
+        completed = failed = pending = 0
+        async for item in stream:
+            completed += 1
+            failed += item.status == STATUS_FAILED
+            pending += self._needs_retry(item)
+            if videos:
+                self._store(channel_url, self._apply_title(item, titles))
+            yield {"type": "transcript", "transcript": item.to_dict(include_segments)}
+            yield {"type": "progress", "completed": completed, "total": total}
+
+        if videos and incremental:
+            self._advance_watermark(channel_url, videos, pending)
+        yield {"type": "done", "completed": completed, "failed": failed, "total": total}
+
+    @staticmethod
+    def _titles_from(videos: List[VideoRef]) -> Dict[str, str]:
+        """Titles come free with channel enumeration (yt-dlp flat entries / playlistItems snippet)."""
+        return {video.video_id: video.title for video in videos if video.title}
+
+    @staticmethod
+    def _apply_title(item: TranscriptItem, titles: Dict[str, str]) -> TranscriptItem:
+        # Only replace the placeholder; fallback titles such as "(quota exceeded)" stay visible
+        if item.title == f"Video {item.video_id}" and item.video_id in titles:
+            item.title = titles[item.video_id]
+        return item
+
+    def _store(self, channel_url: str, item: TranscriptItem) -> TranscriptItem:
+        # Only fetched captions; demo text is never persisted as a channel's transcript
+        if self.corpus is not None and item.segments:
+            self.corpus.corpus(collection_for_channel(channel_url)).put(item.video_id, item.title, item.segments)
+        return item
+
+    @staticmethod
+    async def _iter_items(items: List[TranscriptItem]) -> AsyncIterator[TranscriptItem]:
+        for item in items:
+            yield item
+
+    async def iter_video_transcripts(
+        self, video_ids: List[str], flow: Optional[str] = None
+    ) -> AsyncIterator[TranscriptItem]:
+        """
+        Fetch transcripts with at most ``transcript_fetch_concurrency`` videos in flight.
+        With a scheduler each fetch also waits for a global slot, queued under
+        ``flow`` (the channel) so concurrent channels are interleaved fairly.
+        Pacing between API calls is handled by the shared token bucket, so workers
+        never sleep a fixed interval. Items are yielded in completion order.
+        """
+        semaphore = asyncio.Semaphore(self.settings.transcript_fetch_concurrency)
+        flow = flow or "videos"
+
+        async def worker(video_id: str) -> TranscriptItem:
+            async with semaphore:
+                if self.scheduler is None:
+                    return await self._fetch_video_shared(video_id)
+                async with self.scheduler.slot(flow, self.priority, self.weight):
+                    return await self._fetch_video_shared(video_id)
+
+        tasks = [asyncio.create_task(worker(video_id)) for video_id in video_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early (e.g. client disconnected); don't leak workers
+            for task in tasks:
+                task.cancel()
+
+    async def _resolve_channel_videos(self, channel_url: str, incremental: bool = False) -> List[VideoRef]:
+        """
+        Validate the channel URL and discover the videos to ingest, newest first.
+        Raises ChannelUnavailable when they cannot be listed (callers fall back to demo mode).
+        """
         # Validate early
         if "youtube.com" not in channel_url and "youtu.be" not in channel_url:
             raise ValueError("Invalid YouTube channel URL")
 
         # Check quota before starting
-        if not self._check_quota_limit(1):  # Check if we can at least list videos
-            print("🔄 Using demo mode due to quota limits")
-            return self._get_demo_transcripts()
+        if not await self._check_quota_limit(1):  # Check if we can at least list videos
+            DEMO_FALLBACKS.labels(reason="channel_quota_exhausted").inc()
+            logger.warning("using demo transcripts for channel", extra={"channel_url": channel_url, "reason": "quota"})
+            raise ChannelUnavailable("channel_quota_exhausted")
+
+        watermark = None
+        if incremental and self.channel_state is not None:
+            watermark = self.channel_state.get_watermark(channel_url)
+            if watermark:
+                logger.info(
+                    "incremental sync", extra={"channel_url": channel_url, "watermark": watermark.last_video_id}
+                )
         
         # Discover video IDs from channel
-        video_ids = await self._list_recent_video_ids_stub(channel_url)
-        
-        if not video_ids:
-            print(f"No videos found for channel: {channel_url}")
+        try:
+            videos = await self._list_channel_uploads_shared(channel_url, watermark)
+        except ChannelUnavailable as e:
+            DEMO_FALLBACKS.labels(reason=e.reason).inc()
+            logger.warning("using demo transcripts for channel", extra={"channel_url": channel_url, "reason": e.reason})
+            raise
+
+        if not videos:
+            logger.info("no new videos", extra={"channel_url": channel_url})
             return []
 
-        print(f"Found {len(video_ids)} videos for channel: {channel_url}")
+        await self._fill_missing_titles(videos)
+        logger.info("processing channel videos", extra={"channel_url": channel_url, "videos": len(videos)})
+        return videos
 
-        # Limit to 2 videos to stay within quota
-        video_ids = video_ids[:2]
-        print(f"Processing {len(video_ids)} videos (limited for quota management)")
+    async def _fill_missing_titles(self, videos: List[VideoRef]) -> None:
+        """Enumeration usually carries titles; resolve the rest in one parallel batch."""
+        missing = [video for video in videos if not video.title]
+        if not missing:
+            return
+        titles = await self._get_video_titles([video.video_id for video in missing])
+        for video in missing:
+            video.title = titles.get(video.video_id)
 
-        # Fetch transcripts with rate limiting (process one at a time)
-        items = []
-        
-        for i, video_id in enumerate(video_ids):
-            print(f"Processing video {i+1}/{len(video_ids)}: {video_id}")
-            
-            # Check quota before each video
-            if not self._check_quota_limit(1):  # 1 unit for captions.list
-                print(f"⚠️ Quota limit reached. Using demo transcript for remaining videos.")
-                item = TranscriptItem(
-                    video_id=video_id,
-                    title=f"Video {video_id} (quota exceeded)",
-                    text=self._get_demo_transcript(video_id)
-                )
-            else:
-                item = await self._fetch_single_transcript(video_id)
-            
-            items.append(item)
-            
-            # Add delay between videos to avoid rate limiting
-            if i < len(video_ids) - 1:
-                print(f"⏳ Waiting 2 seconds before next video...")
-                await asyncio.sleep(2)
-
-        results: List[TranscriptItem] = []
-        successful_count = 0
-        
-        for result in items:
-            if isinstance(result, TranscriptItem):
-                results.append(result)
-                if result.text:  # Only count as successful if we got transcript text
-                    successful_count += 1
-        
-        print(f"Successfully fetched {successful_count}/{len(video_ids)} transcripts")
-        
-        # Convert dataclass to dict for Pydantic compatibility
-        return [
-            {
-                "video_id": item.video_id,
-                "title": item.title,
-                "text": item.text
-            }
-            for item in results
-        ]
+    @staticmethod
+    def _needs_retry(item: TranscriptItem) -> bool:
+        """Failed fetches and temporary demo fallbacks (quota, no key); a video without captions stays so."""
+        return item.status == STATUS_FAILED or (item.status == STATUS_DEMO and item.reason != "no_captions")
+
+    def _advance_watermark(self, channel_url: str, videos: List[VideoRef], pending: int = 0) -> None:
+        """
+        Remember the newest ingested video so the next incremental sync stops there
+        (incremental syncs only; a full fetch says nothing about what was synced).
+        Not while ``pending`` videos still need a retry (failed or demo in place of
+        captions): the next sync fetches them again (cached videos cost nothing).
+        """
+        if pending:
+            logger.info("watermark kept; videos pending", extra={"channel_url": channel_url, "pending": pending})
+            return
+        if self.channel_state is not None and videos:
+            self.channel_state.set_watermark(channel_url, videos[0])
+
+    async def _fetch_video_shared(self, video_id: str) -> TranscriptItem:
+        """Concurrent requests for the same video await one in-flight fetch."""
+        if self.singleflight is None:
+            return await self._fetch_video(video_id)
+        return await self.singleflight.do("video", video_id, lambda: self._fetch_video(video_id))
+
+    async def _list_channel_uploads_shared(
+        self, channel_url: str, watermark: Optional[ChannelWatermark] = None
+    ) -> List[VideoRef]:
+        """Concurrent listings of the same channel (and watermark) share one enumeration."""
+        if self.singleflight is None:
+            return await self._list_channel_uploads(channel_url, watermark)
+        key = f"{normalize_channel_url(channel_url)}@{watermark.last_video_id if watermark else ''}"
+        return await self.singleflight.do(
+            "channel", key, lambda: self._list_channel_uploads(channel_url, watermark)
+        )
+
+    async def _fetch_video(self, video_id: str) -> TranscriptItem:
+        # Cached transcripts cost no quota: serve fresh entries directly and
+        # revalidate stale ones with a conditional timedtext request.
+        # SQLite reads and segment decoding run in a thread, off the event loop
+        cached = await asyncio.to_thread(self.cache.get, video_id) if self.cache else None
+        if cached is not None and (cached.fresh or await self._revalidate_cached(cached)):
+            return TranscriptItem(
+                video_id=video_id,
+                title=cached.title,
+                text=None if cached.segments else cached.text,
+                segments=cached.segments,
+            )
+
+        return await self._fetch_single_transcript(video_id)
 
     async def _list_recent_video_ids_stub(self, channel_url: str) -> List[str]:
-        """Discover video IDs from a YouTube channel using yt-dlp."""
+        """Discover the newest video IDs of a YouTube channel."""
+        return [video.video_id for video in await self._list_channel_uploads(channel_url)]
+
+    async def _list_channel_uploads(
+        self, channel_url: str, watermark: Optional[ChannelWatermark] = None
+    ) -> List[VideoRef]:
+        """
+        Enumerate the channel's uploads lazily, newest first, stopping after
+        ``max_videos_per_channel`` videos or as soon as the watermark is reached,
+        so re-syncs cost O(new videos) rather than O(channel size).
+
+        With a watermark the whole delta is listed (up to ``incremental_scan_limit``)
+        and its *oldest* ``max_videos_per_channel`` videos are returned: the
+        watermark then advances to the newest of those, and uploads newer than it
+        are picked up by the next sync instead of being skipped for good.
+
+        Uses the Data API uploads playlist when a key is configured, else yt-dlp.
+        Raises ChannelUnavailable when both fail; there is no placeholder listing,
+        so a failed enumeration can never become the channel's watermark.
+        """
+        limit = self.settings.max_videos_per_channel
+        scan = max(limit, self.settings.incremental_scan_limit) if watermark else limit
         try:
-            # Configure yt-dlp options
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,  # Only extract metadata, don't download
-                'playlistend': 2,  # Limit to first 2 videos to avoid rate limiting
-                'ignoreerrors': True,  # Continue on errors
-            }
-            
-            # Extract video IDs from channel
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Get channel info and extract video IDs
-                info = await asyncio.to_thread(ydl.extract_info, channel_url)
-                
-                if not info or 'entries' not in info:
-                    print(f"No entries found in channel info for {channel_url}")
-                    return []
-                
-                video_ids = []
-                for entry in info['entries']:
-                    if entry and 'id' in entry and entry['id']:
-                        # Validate video ID format (should be 11 characters)
-                        video_id = entry['id']
-                        if len(video_id) == 11 and video_id.replace('-', '').replace('_', '').isalnum():
-                            video_ids.append(video_id)
-                            print(f"Found valid video ID: {video_id}")
-                        else:
-                            print(f"Skipping invalid video ID: {video_id}")
-                
-                print(f"Extracted {len(video_ids)} valid video IDs")
-                return video_ids
-                
+            with span("channel_enumeration", channel_url=channel_url) as fields:
+                if self._has_api_key():
+                    try:
+                        videos = await self._list_uploads_via_api(channel_url, scan, watermark)
+                        fields.update(source="data_api", videos=len(videos))
+                        return self._oldest_of_delta(channel_url, videos, limit, scan)
+                    except QuotaExhausted as e:
+                        raise ChannelUnavailable("channel_quota_exhausted") from e
+                    except ValueError as e:
+                        logger.warning("falling back to yt-dlp", extra={"channel_url": channel_url, "error": str(e)})
+                videos = await self.ytdlp.list_uploads(channel_url, scan, watermark)
+                fields.update(source="yt-dlp", videos=len(videos))
+                return self._oldest_of_delta(channel_url, videos, limit, scan)
+        except ChannelUnavailable:
+            raise
         except Exception as e:
-            # Log error but don't fail completely
-            print(f"Error discovering videos from {channel_url}: {e}")
-            # Return demo video IDs for testing
-            return ["dQw4w9WgXcQ", "jNQXAC9IVRw"]  # Demo video IDs
+            logger.error("channel enumeration failed", extra={"channel_url": channel_url, "error": str(e)})
+            raise ChannelUnavailable("enumeration_failed", str(e)) from e
+
+    @staticmethod
+    def _oldest_of_delta(channel_url: str, videos: List[VideoRef], limit: int, scan: int) -> List[VideoRef]:
+        if len(videos) <= limit:
+            return videos
+        if len(videos) >= scan:
+            # The watermark lies beyond the scan window; the gap cannot be bridged,
+            # so this sync starts over from the newest uploads like a first one
+            logger.warning(
+                "watermark not reached within scan limit", extra={"channel_url": channel_url, "scanned": len(videos)}
+            )
+            return videos[:limit]
+        logger.info(
+            "incremental sync capped; newer videos left for the next sync",
+            extra={"channel_url": channel_url, "new_videos": len(videos), "limit": limit},
+        )
+        return videos[-limit:]
+
+    async def _list_uploads_via_api(
+        self, channel_url: str, limit: int, watermark: Optional[ChannelWatermark]
+    ) -> List[VideoRef]:
+        """Page through the uploads playlist with playlistItems.list (1 unit per 50 videos)."""
+        base = self.settings.youtube_api_base_url
+        api_key = self.settings.youtube_api_key
+        videos: List[VideoRef] = []
+        async with self._client() as client:
+            playlist_id = await self._uploads_playlist_id(channel_url, client)
+            page_token = ""
+            while len(videos) < limit:
+                try:
+                    r = await self._api_get(
+                        client,
+                        f"{base}/playlistItems",
+                        "playlist_items_list",
+                        params={
+                            # snippet carries the title at no extra quota cost
+                            "part": "snippet,contentDetails",
+                            "playlistId": playlist_id,
+                            "maxResults": min(50, limit - len(videos)),
+                            "pageToken": page_token,
+                            "key": api_key,
+                        },
+                    )
+                except QuotaExhausted:
+                    if not videos:
+                        raise
+                    break  # keep the pages already listed
+                data: Dict[str, Any] = r.json()
+                for item in data.get("items", []):
+                    details = item.get("contentDetails", {})
+                    video = VideoRef(
+                        details.get("videoId", ""),
+                        details.get("videoPublishedAt"),
+                        item.get("snippet", {}).get("title"),
+                    )
+                    if not is_valid_video_id(video.video_id):
+                        continue
+                    if reached_watermark(video, watermark):
+                        return videos
+                    videos.append(video)
+                    if len(videos) >= limit:
+                        break
+                page_token = data.get("nextPageToken", "")
+                if not page_token:
+                    break
+        logger.info("listed uploads via Data API", extra={"channel_url": channel_url, "videos": len(videos)})
+        return videos
+
+    async def _uploads_playlist_id(self, channel_url: str, client: httpx.AsyncClient) -> str:
+        normalized = normalize_channel_url(channel_url)
+        if "/playlist?" in normalized:
+            return normalized.split("list=", 1)[1].split("&", 1)[0]
+        path = normalized.split("youtube.com", 1)[-1].strip("/")
+        head, _, rest = path.partition("/")
+        if head == "channel" and rest.startswith("UC"):
+            # The uploads playlist id is derived from the channel id; no lookup needed
+            return "UU" + rest[2:]
+        if head.startswith("@"):
+            params = {"forHandle": head}
+        elif head == "user" and rest:
+            params = {"forUsername": rest}
+        else:
+            raise ValueError(f"Cannot resolve channel via Data API: {channel_url}")
+
+        r = await self._api_get(
+            client,
+            f"{self.settings.youtube_api_base_url}/channels",
+            "channels_list",
+            params={**params, "part": "contentDetails", "key": self.settings.youtube_api_key},
+        )
+        items = r.json().get("items", [])
+        if not items:
+            raise ValueError(f"Channel not found via Data API: {channel_url}")
+        return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    def _has_api_key(self) -> bool:
+        api_key = self.settings.youtube_api_key
+        return bool(api_key) and api_key != "your_youtube_api_key_here"
 
     async def _fetch_single_transcript(self, video_id: str) -> TranscriptItem:
         """Fetch transcript for a single video using only YouTube Data API v3."""
+        # Check if we have a YouTube API key
+        if not self._has_api_key():
+            return self._demo_fallback(video_id, "no_api_key")
         try:
-            # Skip title fetching to avoid ffmpeg dependency and rate limiting
-            title = f"Video {video_id}"
-            transcript_text = ""
-            
-            # Check if we have a YouTube API key
-            settings = get_settings()
-            has_api_key = settings.youtube_api_key and settings.youtube_api_key != "your_youtube_api_key_here"
-            
-            if not has_api_key:
-                print(f"🔄 No YouTube API key - using demo transcript for {video_id}")
-                transcript_text = self._get_demo_transcript(video_id)
-            else:
-                try:
-                    # Use YouTube Data API to list captions and download English tracks (uploaded or ASR)
-                    transcript_text = await self._fetch_via_youtube_api(video_id)
-                    if transcript_text:
-                        print(f"✅ Successfully got transcript via YouTube API for {video_id}")
-                    else:
-                        print(f"❌ No captions found via YouTube API for {video_id}")
-                        transcript_text = self._get_demo_transcript(video_id)
-                    
-                except Exception as e:
-                    print(f"❌ YouTube API failed for {video_id}: {str(e)[:100]}...")
-                    
-                    # If rate limited, API key invalid, or any other error, use demo transcript
-                    if "Too Many Requests" in str(e) or "429" in str(e) or "API key" in str(e) or "quota" in str(e).lower():
-                        print(f"🔄 API issue - using demo transcript for {video_id}")
-                    else:
-                        print(f"🔄 Unexpected error - using demo transcript for {video_id}")
-                    
-                    transcript_text = self._get_demo_transcript(video_id)
-            
-            return TranscriptItem(
-                video_id=video_id, 
-                title=title, 
-                text=transcript_text
-            )
-            
+            # Use YouTube Data API to list captions and download English tracks (uploaded or ASR)
+            segments = await self._fetch_via_youtube_api(video_id)
+        except QuotaExhausted:
+            return self._demo_fallback(video_id, "quota_exhausted", title=f"Video {video_id} (quota exceeded)")
         except Exception as e:
-            # Log error and return demo transcript
-            print(f"Error fetching transcript for {video_id}: {e}")
-            return TranscriptItem(
-                video_id=video_id, 
-                title=f"Video {video_id} (transcript unavailable)", 
-                text=self._get_demo_transcript(video_id)
-            )
+            # Retries ran out, the host's circuit is open or the request was rejected:
+            # report the failure rather than substitute demo text for the video
+            return self._fetch_failed(video_id, e)
+        if not segments:
+            return self._demo_fallback(video_id, "no_captions")
+        logger.debug("transcript fetched", extra={"video_id": video_id, "segments": len(segments)})
+        # Skip title fetching to avoid ffmpeg dependency and rate limiting
+        return TranscriptItem(video_id=video_id, title=f"Video {video_id}", segments=segments)
+
+    def _demo_fallback(self, video_id: str, reason: str, title: Optional[str] = None) -> TranscriptItem:
+        """Demo transcript in place of real captions, marked as such and counted per reason."""
+        DEMO_FALLBACKS.labels(reason=reason).inc()
+        logger.warning("using demo transcript", extra={"video_id": video_id, "reason": reason})
+        return TranscriptItem(
+            video_id=video_id,
+            title=title or f"Video {video_id}",
+            text=self._get_demo_transcript(video_id),
+            status=STATUS_DEMO,
+            reason=reason,
+        )
+
+    def _fetch_failed(self, video_id: str, error: Exception) -> TranscriptItem:
+        reason = failure_reason(error)
+        FETCH_FAILURES.labels(reason=reason).inc()
+        logger.warning("transcript fetch failed", extra={"video_id": video_id, "reason": reason, "error": str(error)[:200]})
+        return TranscriptItem(
+            video_id=video_id,
+            title=f"Video {video_id} (transcript unavailable)",
+            text="",
+            status=STATUS_FAILED,
+            reason=reason,
+        )
     
     async def _get_video_title(self, video_id: str) -> str:
-        """Get video title using yt-dlp."""
+        """Get video title using the shared yt-dlp pool."""
+        titles = await self._get_video_titles([video_id])
+        return titles.get(video_id, f"Video {video_id}")
+
+    async def _get_video_titles(self, video_ids: List[str]) -> Dict[str, str]:
+        """Resolve many titles in parallel on the yt-dlp pool; unresolved ids are omitted."""
+        if not video_ids:
+            return {}
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-            }
-            
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.to_thread(ydl.extract_info, video_url)
-                return info.get('title', f"Video {video_id}") if info else f"Video {video_id}"
-                
+            with span("title_lookup", videos=len(video_ids)):
+                return await self.ytdlp.fetch_titles(video_ids)
         except Exception as e:
-            print(f"Error fetching title for {video_id}: {e}")
-            return f"Video {video_id}"
+            logger.error("title lookup failed", extra={"videos": len(video_ids), "error": str(e)})
+            return {}
 
-    async def _fetch_via_youtube_api(self, video_id: str) -> str:
+    async def _fetch_via_youtube_api(self, video_id: str) -> List[Segment]:
         """
         Use YouTube Data API v3 to list captions and download English captions.
         Strategy:
@@ -245,14 +700,7 @@ class TranscriptService:
         - Download via timedtext endpoint when baseUrl is provided; otherwise attempt standard timedtext.
         Note: captions.download generally requires OAuth; we avoid it by using timedtext URLs when available.
         """
-        # Apply rate limiting before API call
-        await self._rate_limit_delay()
-        
-        # Record quota usage
-        self._record_quota_usage("captions_list")
-        
-        settings = get_settings()
-        api_key = settings.youtube_api_key
+        api_key = self.settings.youtube_api_key
 
         # Candidates of English language codes and name hints
         english_lang_codes = {
@@ -260,19 +708,19 @@ class TranscriptService:
         }
 
         list_url = (
-            f"https://www.googleapis.com/youtube/v3/captions?part=snippet&videoId={video_id}&key={api_key}"
+            f"{self.settings.youtube_api_base_url}/captions?part=snippet&videoId={video_id}&key={api_key}"
         )
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                r = await client.get(list_url)
-                r.raise_for_status()
-                data: Dict[str, Any] = r.json()
-                items = data.get("items", [])
-                print(f"🔍 Found {len(items)} caption tracks for {video_id}")
+            async with self._client() as client:
+                with span("captions_list", video_id=video_id) as fields:
+                    r = await self._api_get(client, list_url, "captions_list")
+                    data: Dict[str, Any] = r.json()
+                    items = data.get("items", [])
+                    fields["tracks"] = len(items)
                 if not items:
-                    print(f"❌ No caption tracks found for {video_id}")
-                    return ""
+                    logger.info("no caption tracks", extra={"video_id": video_id})
+                    return []
 
                 # Rank: uploaded English first, then ASR English, then others
                 def rank(item: Dict[str, Any]) -> int:
@@ -293,46 +741,94 @@ class TranscriptService:
                     snip = cap.get("snippet", {})
                     lang = snip.get("language")
                     track_kind = snip.get("trackKind", "")
-                    print(f"🎯 Trying caption: lang={lang}, trackKind={track_kind}")
                     if not (lang in english_lang_codes or (lang or "").startswith("en")):
-                        print(f"⏭️ Skipping non-English caption: {lang}")
+                        logger.info("skipping non-English captions", extra={"video_id": video_id, "lang": lang})
                         continue
 
                     # Use only the baseUrl from Data API v3 (no internal timedtext calls)
                     base_url = snip.get("baseUrl")  # This is the official way
                     if base_url:
-                        print(f"📥 Downloading via official baseUrl from Data API v3")
-                        text = await self._download_timedtext(base_url, client)
-                        if text:
-                            return text
+                        segments, etag, last_modified = await self._download_timedtext(base_url, client)
+                        if segments:
+                            if self.cache is not None:
+                                await asyncio.to_thread(self.cache.put, CachedTranscript(
+                                    video_id=video_id,
+                                    track=f"{lang}:{track_kind or 'standard'}",
+                                    title=f"Video {video_id}",
+                                    segments=segments,
+                                    source_url=base_url,
+                                    etag=etag,
+                                    last_modified=last_modified,
+                                ))
+                            return segments
                     else:
-                        print(f"⚠️ No baseUrl available in Data API v3 response - captions may require OAuth")
+                        logger.warning(
+                            "no caption baseUrl in Data API response (captions may require OAuth)",
+                            extra={"video_id": video_id},
+                        )
 
+        except QuotaExhausted:
+            raise
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                print(f"❌ Rate limited (429) for {video_id}. Using demo transcript.")
-                raise e
-            else:
-                print(f"❌ HTTP error {e.response.status_code} for {video_id}")
-                raise e
+            logger.warning("captions request failed", extra={"video_id": video_id, "status": e.response.status_code})
+            raise e
         except Exception as e:
-            print(f"❌ Unexpected error for {video_id}: {e}")
+            logger.error("captions request failed", extra={"video_id": video_id, "error": str(e)})
             raise e
 
-        return ""
+        return []
 
-    async def _download_timedtext(self, url: str, client: httpx.AsyncClient) -> str:
+    async def _download_timedtext(
+        self, url: str, client: httpx.AsyncClient
+    ) -> Tuple[List[Segment], Optional[str], Optional[str]]:
+        """
+        Download and parse a caption track; returns (segments, etag, last_modified).
+        Timeouts, 429s and 5xx are retried (each attempt hedged when enabled) and
+        raise once retries run out; other responses without captions return no segments.
+        """
+
+        async def attempt() -> httpx.Response:
+            with span("timedtext_download") as fields:
+                resp = await client.get(url)
+                fields.update(status=resp.status_code, bytes=len(resp.content))
+            if resp.status_code in RETRYABLE_STATUS:
+                resp.raise_for_status()
+            return resp
+
+        resp = await self.fetch_policy.call(url, lambda: self.fetch_policy.hedged(url, attempt))
+        if resp.status_code == 200 and resp.text and "<html" not in resp.text[:1024].lower():
+            # VTT/SRT/TTML/srv3 -> compact (start, end, text) segments, ASR rolling lines deduplicated.
+            # Long tracks take tens of ms to parse; keep them off the event loop.
+            body = resp.text
+            with span("caption_parse", bytes=len(body)) as fields:
+                if len(body) > 64_000:
+                    segments = await asyncio.to_thread(parse_captions, body)
+                else:
+                    segments = parse_captions(body)
+                fields["segments"] = len(segments)
+            return segments, resp.headers.get("etag"), resp.headers.get("last-modified")
+        return [], None, None
+
+    async def _revalidate_cached(self, cached: CachedTranscript) -> bool:
+        """Conditional GET of the cached track's timedtext URL; True if unchanged (304)."""
+        if self.cache is None or not cached.has_validators:
+            return False
+        headers = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
         try:
-            resp = await client.get(url)
-            if resp.status_code == 200 and resp.text and "<html" not in resp.text.lower():
-                # Convert VTT/SRT/TTML-ish to plaintext by stripping tags; minimal for v1
-                text = resp.text
-                # crude cleanup:
-                text = text.replace("\r", "\n")
-                return text
-        except Exception:
-            return ""
-        return ""
+            with span("timedtext_revalidate", video_id=cached.video_id):
+                async with self._client() as client:
+                    resp = await client.get(cached.source_url, headers=headers)
+        except Exception as e:
+            logger.warning("cache revalidation failed", extra={"video_id": cached.video_id, "error": str(e)})
+            return False
+        if resp.status_code == 304:
+            await asyncio.to_thread(self.cache.mark_revalidated, cached)
+            return True
+        return False
 
     def _get_demo_transcript(self, video_id: str) -> str:
         """Generate a demo transcript for testing purposes."""
@@ -345,17 +841,21 @@ class TranscriptService:
         
         return demo_transcripts.get(video_id, f"This is a demo transcript for video {video_id}. In a real implementation, this would contain the actual transcript text from the YouTube video. The video appears to be about technology and programming topics, which would be useful for answering questions about the channel's content.")
 
-    def _get_demo_transcripts(self) -> List[Dict[str, str]]:
-        """Return demo transcripts for testing when quota is exceeded."""
+    def _get_demo_transcripts(self, reason: str = "channel_quota_exhausted") -> List[Dict[str, Any]]:
+        """Demo transcripts in place of a channel whose videos cannot be listed (``reason``)."""
         return [
             {
                 "video_id": "demo1",
                 "title": "Demo Video 1",
+                "status": STATUS_DEMO,
+                "reason": reason,
                 "text": "This is a demo transcript about financial planning and investment strategies. The video covers topics like portfolio diversification, risk management, and long-term wealth building."
             },
             {
-                "video_id": "demo2", 
+                "video_id": "demo2",
                 "title": "Demo Video 2",
+                "status": STATUS_DEMO,
+                "reason": reason,
                 "text": "This is a demo transcript about machine learning and artificial intelligence. The video explores different ML algorithms, data preprocessing techniques, and model evaluation methods."
             }
         ]
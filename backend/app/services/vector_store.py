@@ -0,0 +1,611 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Collection, Dict, List, Optional, Sequence
+
+from ..core.lazy import lazy_module
+from ..core.settings import Settings
+from .channel_sync import normalize_channel_url
+
+if TYPE_CHECKING:
+    import httpx
+    import numpy as np
+else:
+    httpx = lazy_module("httpx")
+    np = lazy_module("numpy")
+
+# Rows converted to float32 per step (IVF assignment, float16 working copies)
+_SCORE_BLOCK = 16_384
+
+
+@dataclass
+class SearchHit:
+    id: str
+    score: float
+    payload: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "score": round(self.score, 6), **self.payload}
+
+
+def collection_for_channel(channel_url: str) -> str:
+    """Filesystem- and Qdrant-safe collection name for a channel (one collection per channel)."""
+    key = normalize_channel_url(channel_url)
+    slug = re.sub(r"[^a-z0-9]+", "_", key.split("youtube.com", 1)[-1].lower()).strip("_")[:48]
+    return f"{slug or 'channel'}_{hashlib.blake2b(key.encode(), digest_size=4).hexdigest()}"
+
+
+class VectorStore(ABC):
+    """
+    Per-collection storage of L2-normalized vectors with a JSON payload per
+    point, searched by cosine similarity. Point ids are chunk ids, so
+    upserting a re-ingested chunk replaces it.
+    """
+
+    @abstractmethod
+    async def upsert(
+        self, collection: str, ids: Sequence[str], vectors: np.ndarray, payloads: Sequence[Dict[str, Any]]
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_video(self, collection: str, video_id: str, keep: Collection[str] = ()) -> None:
+        """Remove the points of ``video_id`` except ids in ``keep`` (stale chunks after re-indexing)."""
+
+    @abstractmethod
+    async def search(self, collection: str, vector: np.ndarray, top_k: int = 5) -> List[SearchHit]:
+        ...
+
+    @abstractmethod
+    async def count(self, collection: str) -> int:
+        ...
+
+    @abstractmethod
+    async def drop(self, collection: str) -> None:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def warm_up(self) -> int:
+        """Blocking: open the collections already on disk; returns how many were loaded."""
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index: spherical k-means centroids partition the rows,
+    a query scores only the rows in its ``nprobe`` nearest lists. Rows added
+    after the build are assigned to their nearest centroid incrementally.
+    """
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray):
+        self.centroids = centroids.astype(np.float32, copy=False)
+        self.assignments = assignments.astype(np.int32, copy=False)  # per row, -1 = unassigned
+        self.built_rows = int((self.assignments >= 0).sum())
+        self._lists: Optional[List[np.ndarray]] = None
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, rows: int, valid: np.ndarray, iterations: int = 8, seed: int = 0) -> "IVFIndex":
+        live = np.flatnonzero(valid[:rows])
+        nlist = max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(live, size=min(len(live), nlist * 64), replace=False))
+        sample = np.asarray(matrix[sample_rows], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty lists with random sample points
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = sums / norms
+        assignments = np.full(rows, -1, dtype=np.int32)
+        index = cls(centroids, assignments)
+        index.assign(matrix, live)
+        index.built_rows = len(live)
+        return index
+
+    def assign(self, matrix: np.ndarray, rows: np.ndarray) -> None:
+        if len(rows) == 0:
+            return
+        needed = int(rows.max()) + 1
+        if needed > len(self.assignments):
+            grown = np.full(max(needed, 2 * len(self.assignments)), -1, dtype=np.int32)
+            grown[: len(self.assignments)] = self.assignments
+            self.assignments = grown
+        for offset in range(0, len(rows), _SCORE_BLOCK):
+            block = rows[offset:offset + _SCORE_BLOCK]
+            vectors = np.asarray(matrix[block], dtype=np.float32)
+            self.assignments[block] = np.argmax(vectors @ self.centroids.T, axis=1)
+        self._lists = None
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            assigned = self.assignments[order]
+            bounds = np.searchsorted(assigned, np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        nprobe = min(nprobe, len(self.centroids))
+        nearest = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.sort(np.concatenate([self._lists[i] for i in nearest]))
+
+    def save(self, path: Path) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, centroids=self.centroids, assignments=self.assignments)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["IVFIndex"]:
+        try:
+            with np.load(path) as data:
+                return cls(data["centroids"], data["assignments"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @property
+    def nbytes(self) -> int:
+        return self.centroids.nbytes + self.assignments.nbytes
+
+
+class LocalCollection:
+    """
+    One collection on disk:
+
+    - ``vectors.bin``: a raw ``(capacity, dim)`` float32/float16 matrix, memory-mapped,
+      grown by doubling; only touched pages are resident. float16 halves the
+      file, but CPUs multiply it about 15x slower than float32, so a float16
+      collection is searched through a float32 copy in memory, built on the
+      first search: it saves disk and load I/O, not resident memory.
+    - ``points.jsonl``: append-only log of ``{id, row, payload}`` / ``{id, deleted}``
+      records, replayed on open and compacted when mostly dead.
+    - ``meta.json``: dim, dtype, rows used and capacity.
+    - ``ivf.npz``: optional IVF index once the collection reaches ``ann_threshold`` points.
+    """
+
+    def __init__(self, path: Path, dtype: str = "float32", ann_threshold: int = 0, nprobe: int = 16):
+        self.path = path
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        path.mkdir(parents=True, exist_ok=True)
+
+        meta_path = path / "meta.json"
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        self.dim: int = meta.get("dim", 0)
+        self.dtype = np.dtype(meta.get("dtype", dtype))
+        self.rows: int = meta.get("rows", 0)
+        self.capacity: int = meta.get("capacity", 0)
+        self.matrix: Optional[np.memmap] = None
+        # float32 copy of a float16 matrix that searches score against (None until needed)
+        self._working: Optional[np.ndarray] = None
+        if self.capacity:
+            self.matrix = np.memmap(path / "vectors.bin", dtype=self.dtype, mode="r+", shape=(self.capacity, self.dim))
+
+        self.ids: List[Optional[str]] = [None] * self.rows
+        self.payloads: List[Optional[Dict[str, Any]]] = [None] * self.rows
+        self.row_of: Dict[str, int] = {}
+        self.valid = np.zeros(max(self.capacity, 1), dtype=bool)
+        dead_records = self._replay()
+
+        self.index: Optional[IVFIndex] = IVFIndex.load(path / "ivf.npz") if (path / "ivf.npz").exists() else None
+        if dead_records > max(len(self.row_of), 1024) or self.rows - len(self.row_of) > max(len(self.row_of), 1024):
+            self._compact()
+            self._maybe_index(np.empty(0, dtype=np.intp))
+        self._log = open(path / "points.jsonl", "a", encoding="utf-8")
+
+    def _replay(self) -> int:
+        dead = 0
+        log_path = self.path / "points.jsonl"
+        if not log_path.exists():
+            return 0
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:  # torn write at the tail
+                    dead += 1
+                    continue
+                point_id = record["id"]
+                previous = self.row_of.pop(point_id, None)
+                if previous is not None:
+                    self.valid[previous] = False
+                    self.ids[previous] = self.payloads[previous] = None
+                    dead += 1
+                if record.get("deleted"):
+                    dead += 1
+                    continue
+                row = record["row"]
+                if row >= self.rows:  # vectors never made it to meta.json
+                    continue
+                self.ids[row] = point_id
+                self.payloads[row] = record["payload"]
+                self.row_of[point_id] = row
+                self.valid[row] = True
+        return dead
+
+    def _write_meta(self) -> None:
+        meta = {"dim": self.dim, "dtype": self.dtype.name, "rows": self.rows, "capacity": self.capacity}
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        tmp.replace(self.path / "meta.json")
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+        capacity = max(1024, self.capacity * 2, needed)
+        if self.matrix is not None:
+            self.matrix.flush()
+            del self.matrix
+        # Rebuilt at the new capacity by the next search
+        self._working = None
+        with open(self.path / "vectors.bin", "ab") as f:
+            f.truncate(capacity * self.dim * self.dtype.itemsize)
+        self.matrix = np.memmap(self.path / "vectors.bin", dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+        valid = np.zeros(capacity, dtype=bool)
+        valid[: len(self.valid)] = self.valid[:capacity]
+        self.valid = valid
+        self.capacity = capacity
+
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray, payloads: Sequence[Dict[str, Any]]) -> None:
+        if len(ids) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(set(ids)) < len(ids):
+            # A repeated id within the batch: the last occurrence wins, as with separate upserts
+            last = {point_id: i for i, point_id in enumerate(ids)}
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            vectors = vectors[keep]
+            payloads = [payloads[i] for i in keep]
+        with self._lock:
+            if not self.dim:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Vector size {vectors.shape[1]} does not match collection size {self.dim}")
+            rows = np.empty(len(ids), dtype=np.intp)
+            for i, point_id in enumerate(ids):
+                row = self.row_of.get(point_id)
+                if row is None:
+                    row = self.rows
+                    self.rows += 1
+                    self.ids.append(point_id)
+                    self.payloads.append(None)
+                rows[i] = row
+            self._ensure_capacity(self.rows)
+            assert self.matrix is not None
+            self.matrix[rows] = vectors.astype(self.dtype)
+            self.matrix.flush()
+            if self._working is not None:
+                # Scored as stored, so results match a fresh copy
+                self._working[rows] = self.matrix[rows]
+            for i, point_id in enumerate(ids):
+                row = int(rows[i])
+                self.ids[row] = point_id
+                self.payloads[row] = payloads[i]
+                self.row_of[point_id] = row
+                self.valid[row] = True
+                self._log.write(json.dumps({"id": point_id, "row": row, "payload": payloads[i]}, ensure_ascii=False) + "\n")
+            self._log.flush()
+            self._write_meta()
+            self._maybe_index(rows)
+
+    def delete_video(self, video_id: str, keep: Collection[str] = ()) -> int:
+        with self._lock:
+            doomed = [
+                point_id for point_id, row in self.row_of.items()
+                if (self.payloads[row] or {}).get("video_id") == video_id and point_id not in keep
+            ]
+            for point_id in doomed:
+                row = self.row_of.pop(point_id)
+                self.valid[row] = False
+                self.ids[row] = self.payloads[row] = None
+                self._log.write(json.dumps({"id": point_id, "deleted": True}) + "\n")
+            self._log.flush()
+        return len(doomed)
+
+    def _maybe_index(self, new_rows: np.ndarray) -> None:
+        live = len(self.row_of)
+        if not self.ann_threshold or live < self.ann_threshold:
+            return
+        assert self.matrix is not None
+        if self.index is None or live > 2 * self.index.built_rows:
+            # (Re)train once the collection has doubled since the last build
+            self.index = IVFIndex.build(self.matrix, self.rows, self.valid)
+        else:
+            self.index.assign(self.matrix, new_rows)
+        self.index.save(self.path / "ivf.npz")
+
+    def search(self, query: np.ndarray, top_k: int) -> List[SearchHit]:
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if not self.row_of or self.matrix is None:
+                return []
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Query vector size {query.shape[0]} does not match collection size {self.dim}")
+            if self.index is not None:
+                rows = self.index.candidates(query, self.nprobe)
+                rows = rows[(rows < self.rows) & self.valid[rows]]
+                scores = self._scoring_matrix()[rows] @ query
+            else:
+                rows = None
+                scores = self._score_all(query)
+            k = min(top_k, len(scores))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            hits = []
+            for i in top:
+                row = int(rows[i]) if rows is not None else int(i)
+                if scores[i] == -np.inf or not self.valid[row]:
+                    continue
+                hits.append(SearchHit(self.ids[row], float(scores[i]), self.payloads[row] or {}))  # type: ignore[arg-type]
+            return hits
+
+    def _scoring_matrix(self) -> np.ndarray:
+        # Caller holds the lock
+        assert self.matrix is not None
+        if self.dtype == np.float32:
+            return self.matrix
+        if self._working is None:
+            working = np.empty((self.capacity, self.dim), dtype=np.float32)
+            for offset in range(0, self.rows, _SCORE_BLOCK):
+                stop = min(offset + _SCORE_BLOCK, self.rows)
+                working[offset:stop] = self.matrix[offset:stop]
+            self._working = working
+        return self._working
+
+    def _score_all(self, query: np.ndarray) -> np.ndarray:
+        scores = self._scoring_matrix()[: self.rows] @ query
+        scores[~self.valid[: self.rows]] = -np.inf
+        return scores
+
+    def _compact(self) -> None:
+        """Rewrite vectors and the point log without deleted/overwritten rows."""
+        live_rows = np.flatnonzero(self.valid[: self.rows])
+        records = [(self.ids[row], self.payloads[row]) for row in live_rows]
+        vectors = np.asarray(self.matrix[live_rows], dtype=self.dtype) if self.matrix is not None else None
+        if self.matrix is not None:
+            del self.matrix
+            self.matrix = None
+        self._working = None
+        (self.path / "vectors.bin").unlink(missing_ok=True)
+        (self.path / "ivf.npz").unlink(missing_ok=True)
+        self.index = None
+        self.rows = self.capacity = 0
+        self.ids, self.payloads, self.row_of = [], [], {}
+        self.valid = np.zeros(1, dtype=bool)
+        with open(self.path / "points.jsonl.tmp", "w", encoding="utf-8") as f:
+            for row, (point_id, payload) in enumerate(records):
+                f.write(json.dumps({"id": point_id, "row": row, "payload": payload}, ensure_ascii=False) + "\n")
+        if records and vectors is not None:
+            self._ensure_capacity(len(records))
+            assert self.matrix is not None
+            self.matrix[: len(records)] = vectors
+            self.matrix.flush()
+            for row, (point_id, payload) in enumerate(records):
+                self.ids.append(point_id)
+                self.payloads.append(payload)
+                self.row_of[point_id] = row  # type: ignore[index]
+                self.valid[row] = True
+            self.rows = len(records)
+        (self.path / "points.jsonl.tmp").replace(self.path / "points.jsonl")
+        self._write_meta()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "points": len(self.row_of),
+            "rows": self.rows,
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "matrix_bytes": self.rows * self.dim * self.dtype.itemsize,
+            "working_bytes": self._working.nbytes if self._working is not None else 0,
+            "ann": self.index is not None,
+            "ann_bytes": self.index.nbytes if self.index is not None else 0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
+            if self.matrix is not None:
+                self.matrix.flush()
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process stand-in for Qdrant: one ``LocalCollection`` directory per
+    channel under ``root``. Exact top-k is a single vectorized matrix-vector
+    product; collections above ``ann_threshold`` points switch to an IVF index.
+    """
+
+    def __init__(self, root: str, dtype: str = "float32", ann_threshold: int = 0, nprobe: int = 16):
+        self.root = Path(root)
+        self.dtype = dtype
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self._collections: Dict[str, LocalCollection] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> LocalCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = LocalCollection(
+                    self.root / name, self.dtype, self.ann_threshold, self.nprobe
+                )
+            return collection
+
+    async def upsert(
+        self, collection: str, ids: Sequence[str], vectors: np.ndarray, payloads: Sequence[Dict[str, Any]]
+    ) -> None:
+        await asyncio.to_thread(self.collection(collection).upsert, ids, vectors, payloads)
+
+    async def delete_video(self, collection: str, video_id: str, keep: Collection[str] = ()) -> None:
+        await asyncio.to_thread(self.collection(collection).delete_video, video_id, keep)
+
+    async def search(self, collection: str, vector: np.ndarray, top_k: int = 5) -> List[SearchHit]:
+        if not (self.root / collection).exists():
+            return []
+        return await asyncio.to_thread(self.collection(collection).search, vector, top_k)
+
+    async def count(self, collection: str) -> int:
+        if not (self.root / collection).exists():
+            return 0
+        return len(self.collection(collection).row_of)
+
+    async def drop(self, collection: str) -> None:
+        with self._lock:
+            existing = self._collections.pop(collection, None)
+        if existing is not None:
+            existing.close()
+        path = self.root / collection
+        if path.exists():
+            for child in path.iterdir():
+                child.unlink()
+            path.rmdir()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            collections = dict(self._collections)
+        return {"backend": "local", "collections": {name: c.stats() for name, c in collections.items()}}
+
+    def warm_up(self) -> int:
+        if not self.root.exists():
+            return 0
+        names = [path.name for path in self.root.iterdir() if (path / "meta.json").exists()]
+        for name in names:
+            self.collection(name)
+        return len(names)
+
+    async def close(self) -> None:
+        with self._lock:
+            collections, self._collections = list(self._collections.values()), {}
+        for collection in collections:
+            collection.close()
+
+
+class QdrantVectorStore(VectorStore):
+    """Same interface over Qdrant's REST API (cosine distance, one collection per channel)."""
+
+    def __init__(self, url: str, prefix: str = "youtube_transcripts", http_client: Optional[httpx.AsyncClient] = None):
+        self.url = url.rstrip("/")
+        self.prefix = prefix
+        self.http_client = http_client
+        self._owns_client = http_client is None
+        self._known: set = set()
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(timeout=30)
+        return self.http_client
+
+    def _name(self, collection: str) -> str:
+        return f"{self.prefix}_{collection}"
+
+    @staticmethod
+    def _point_id(point_id: str) -> str:
+        # Qdrant ids must be integers or UUIDs
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, point_id))
+
+    async def _ensure_collection(self, collection: str, dim: int) -> None:
+        name = self._name(collection)
+        if name in self._known:
+            return
+        r = await self._client().get(f"{self.url}/collections/{name}")
+        if r.status_code == 404:
+            r = await self._client().put(
+                f"{self.url}/collections/{name}",
+                json={"vectors": {"size": dim, "distance": "Cosine"}},
+            )
+        r.raise_for_status()
+        self._known.add(name)
+
+    async def upsert(
+        self, collection: str, ids: Sequence[str], vectors: np.ndarray, payloads: Sequence[Dict[str, Any]]
+    ) -> None:
+        if len(ids) == 0:
+            return
+        await self._ensure_collection(collection, int(vectors.shape[1]))
+        points = [
+            {"id": self._point_id(point_id), "vector": vector.tolist(), "payload": {**payload, "point_id": point_id}}
+            for point_id, vector, payload in zip(ids, np.asarray(vectors, dtype=np.float32), payloads)
+        ]
+        r = await self._client().put(
+            f"{self.url}/collections/{self._name(collection)}/points", params={"wait": "true"}, json={"points": points}
+        )
+        r.raise_for_status()
+
+    async def delete_video(self, collection: str, video_id: str, keep: Collection[str] = ()) -> None:
+        selector: Dict[str, Any] = {"must": [{"key": "video_id", "match": {"value": video_id}}]}
+        if keep:
+            selector["must_not"] = [{"key": "point_id", "match": {"any": list(keep)}}]
+        r = await self._client().post(
+            f"{self.url}/collections/{self._name(collection)}/points/delete",
+            params={"wait": "true"},
+            json={"filter": selector},
+        )
+        if r.status_code != 404:
+            r.raise_for_status()
+
+    async def search(self, collection: str, vector: np.ndarray, top_k: int = 5) -> List[SearchHit]:
+        r = await self._client().post(
+            f"{self.url}/collections/{self._name(collection)}/points/search",
+            json={"vector": np.asarray(vector, dtype=np.float32).tolist(), "limit": top_k, "with_payload": True},
+        )
+        if r.status_code == 404:
+            return []
+        r.raise_for_status()
+        hits = []
+        for point in r.json().get("result", []):
+            payload = dict(point.get("payload") or {})
+            hits.append(SearchHit(payload.pop("point_id", str(point["id"])), float(point["score"]), payload))
+        return hits
+
+    async def count(self, collection: str) -> int:
+        r = await self._client().post(
+            f"{self.url}/collections/{self._name(collection)}/points/count", json={"exact": True}
+        )
+        if r.status_code == 404:
+            return 0
+        r.raise_for_status()
+        return int(r.json()["result"]["count"])
+
+    async def drop(self, collection: str) -> None:
+        name = self._name(collection)
+        r = await self._client().delete(f"{self.url}/collections/{name}")
+        if r.status_code != 404:
+            r.raise_for_status()
+        self._known.discard(name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "qdrant", "url": self.url, "collections": sorted(self._known)}
+
+    async def close(self) -> None:
+        if self._owns_client and self.http_client is not None:
+            await self.http_client.aclose()
+
+
+def create_vector_store(settings: Settings, http_client: Optional[httpx.AsyncClient] = None) -> VectorStore:
+    if settings.vector_store == "qdrant":
+        return QdrantVectorStore(settings.qdrant_url, settings.qdrant_collection_prefix, http_client)
+    return LocalVectorStore(
+        settings.vector_store_path,
+        dtype=settings.vector_dtype,
+        ann_threshold=settings.vector_ann_threshold,
+        nprobe=settings.vector_ann_nprobe,
+    )
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from ..core.lazy import lazy_module
+from ..core.settings import Settings
+from .channel_sync import ChannelWatermark, VideoRef, is_valid_video_id, reached_watermark, uploads_tab_url
+
+if TYPE_CHECKING:
+    import yt_dlp
+else:
+    yt_dlp = lazy_module("yt_dlp")
+
+logger = logging.getLogger(__name__)
+
+# Option profiles; each worker keeps one warm YoutubeDL per profile
+_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Channel/playlist enumeration: metadata only, next page fetched only while iterating
+    "flat": {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": True,
+        "lazy_playlist": True,
+        "ignoreerrors": True,
+    },
+    # Single video metadata (title etc.) without resolving formats for download
+    "video": {
+        "quiet": True,
+        "no_warnings": True,
+        "skip_download": True,
+        "ignoreerrors": True,
+    },
+}
+
+# YoutubeDL instances are not thread-safe, so warm instances are per worker thread
+# (and, in a process pool, per worker process)
+_local = threading.local()
+
+
+def _instance(profile: str) -> yt_dlp.YoutubeDL:
+    instances = getattr(_local, "instances", None)
+    if instances is None:
+        instances = _local.instances = {}
+    ydl = instances.get(profile)
+    if ydl is None:
+        ydl = instances[profile] = yt_dlp.YoutubeDL(_PROFILES[profile])
+    return ydl
+
+
+def _warm(barrier: Optional[threading.Barrier] = None) -> None:
+    """Create this worker's instances; the barrier keeps each call on a different thread."""
+    for profile in _PROFILES:
+        _instance(profile)
+    if barrier is not None:
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+
+def list_uploads(channel_url: str, limit: int, watermark: Optional[ChannelWatermark] = None) -> List[VideoRef]:
+    """Blocking: walk the channel's Videos tab newest first until ``limit`` or the watermark."""
+    ydl = _instance("flat")
+    # process=False keeps ``entries`` a lazy generator instead of resolving the whole channel
+    info = ydl.extract_info(uploads_tab_url(channel_url), download=False, process=False)
+    if not info or "entries" not in info:
+        logger.warning("no entries in channel info", extra={"channel_url": channel_url})
+        return []
+
+    videos: List[VideoRef] = []
+    for entry in info["entries"]:
+        if not entry or not entry.get("id"):
+            continue
+        if not is_valid_video_id(entry["id"]):
+            logger.debug("skipping invalid video id", extra={"video_id": entry["id"]})
+            continue
+        video = VideoRef(entry["id"], entry.get("upload_date"), entry.get("title"))
+        if reached_watermark(video, watermark):
+            break
+        videos.append(video)
+        if len(videos) >= limit:
+            break
+    logger.info("listed uploads via yt-dlp", extra={"channel_url": channel_url, "videos": len(videos)})
+    return videos
+
+
+def video_title(video_id: str) -> Optional[str]:
+    """Blocking: title of a single video, or None if it cannot be resolved."""
+    info = _instance("video").extract_info(
+        f"https://www.youtube.com/watch?v={video_id}", download=False, process=False
+    )
+    return info.get("title") if info else None
+
+
+class YoutubeDLPool:
+    """
+    Dedicated, bounded executor for yt-dlp work with warm YoutubeDL instances.
+
+    Keeps blocking extraction off the event loop and out of the default
+    executor, and supports batched metadata extraction (many channels or many
+    video titles at once) with ``workers`` calls in parallel. ``kind`` selects
+    a thread pool (default) or a process pool for CPU-heavy extraction.
+    """
+
+    _shared: Optional["YoutubeDLPool"] = None
+
+    def __init__(self, workers: int = 4, kind: str = "thread"):
+        self.workers = workers
+        self.kind = kind
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ytdlp")
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "YoutubeDLPool":
+        return cls(workers=settings.ytdlp_workers, kind=settings.ytdlp_executor)
+
+    @classmethod
+    def shared(cls, settings: Settings) -> "YoutubeDLPool":
+        """Process-wide pool for callers outside the app lifespan (scripts, benchmarks)."""
+        if cls._shared is None:
+            cls._shared = cls.from_settings(settings)
+        return cls._shared
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def list_uploads(
+        self, channel_url: str, limit: int, watermark: Optional[ChannelWatermark] = None
+    ) -> List[VideoRef]:
+        return await self._run(list_uploads, channel_url, limit, watermark)
+
+    async def list_uploads_many(self, channel_urls: Sequence[str], limit: int) -> Dict[str, List[VideoRef]]:
+        """Enumerate several channels in parallel; failed channels map to an empty list."""
+        results = await asyncio.gather(
+            *(self.list_uploads(url, limit) for url in channel_urls), return_exceptions=True
+        )
+        return {
+            url: result if isinstance(result, list) else []
+            for url, result in zip(channel_urls, results)
+        }
+
+    async def fetch_titles(self, video_ids: Sequence[str]) -> Dict[str, str]:
+        """Resolve titles for many videos in parallel; unresolved ids are omitted."""
+        results = await asyncio.gather(
+            *(self._run(video_title, video_id) for video_id in video_ids), return_exceptions=True
+        )
+        return {
+            video_id: title
+            for video_id, title in zip(video_ids, results)
+            if isinstance(title, str) and title
+        }
+
+    async def warm_up(self, timeout: float = 10.0) -> None:
+        """Import yt-dlp and build the YoutubeDL instances of every worker ahead of the first request."""
+        # Barriers cannot cross processes; there each call lands on whichever worker is free
+        barrier = threading.Barrier(self.workers, timeout=timeout) if self.kind == "thread" else None
+        await asyncio.gather(*(self._run(_warm, barrier) for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if YoutubeDLPool._shared is self:
+            YoutubeDLPool._shared = None
@@ -0,0 +1,105 @@
+"""
+Benchmark: caption parse throughput and output-size reduction per format.
+
+Generates large synthetic caption files (YouTube ASR-style rolling WebVTT with
+inline word timings, SRT, TTML and srv3) and reports MB/s parsed plus the size
+of the plain text and compact segments relative to the raw markup.
+
+Run from ``backend/``:  python -m benchmarks.bench_caption_parser
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from app.services.captions import parse_captions, segments_to_text
+
+WORDS = "the quick brown fox jumps over a lazy dog while we talk about caching and vectors".split()
+
+
+def _clock(seconds: float, sep: str = ".") -> str:
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{int(h):02d}:{int(m):02d}:{s:06.3f}".replace(".", sep)
+
+
+def _line(i: int) -> list[str]:
+    return [WORDS[(i * 7 + k) % len(WORDS)] for k in range(8)]
+
+
+def make_asr_vtt(cues: int) -> str:
+    out = ["WEBVTT", "Kind: captions", "Language: en", ""]
+    previous = ""
+    for i in range(cues):
+        t = i * 3.0
+        words = _line(i)
+        timed = words[0] + "".join(
+            f"<{_clock(t + 0.3 * k)}><c> {w}</c>" for k, w in enumerate(words[1:], 1)
+        )
+        out += [f"{_clock(t)} --> {_clock(t + 2.99)} align:start position:0%", previous or " ", timed, ""]
+        previous = " ".join(words)
+        # zero-length transition cue repeating the finished line
+        out += [f"{_clock(t + 2.99)} --> {_clock(t + 3.0)} align:start position:0%", previous, " ", ""]
+    return "\n".join(out)
+
+
+def make_srt(cues: int) -> str:
+    out = []
+    for i in range(cues):
+        t = i * 3.0
+        out += [str(i + 1), f"{_clock(t, ',')} --> {_clock(t + 2.5, ',')}", " ".join(_line(i)), ""]
+    return "\n".join(out)
+
+
+def make_ttml(cues: int) -> str:
+    body = "".join(
+        f'<p begin="{_clock(i * 3.0)}" end="{_clock(i * 3.0 + 2.5)}" style="s1">'
+        f'<span tts:color="white">{" ".join(_line(i)[:4])}</span><br/>{" ".join(_line(i)[4:])}</p>'
+        for i in range(cues)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><tt xmlns="http://www.w3.org/ns/ttml" '
+        'xmlns:tts="http://www.w3.org/ns/ttml#styling"><body><div>' + body + "</div></body></tt>"
+    )
+
+
+def make_srv3(cues: int) -> str:
+    body = "".join(
+        f'<p t="{i * 3000}" d="2990" w="1">'
+        + "".join(f'<s t="{k * 300}" ac="0">{" " if k else ""}{w}</s>' for k, w in enumerate(_line(i)))
+        + "</p>"
+        for i in range(cues)
+    )
+    return '<?xml version="1.0" encoding="utf-8" ?><timedtext format="3"><body>' + body + "</body></timedtext>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cues", type=int, default=20_000, help="cues per file (~17 h of captions at 3 s/cue)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    generators = {"asr-vtt": make_asr_vtt, "srt": make_srt, "ttml": make_ttml, "srv3": make_srv3}
+    print(f"{'format':>8} {'raw MB':>7} {'MB/s':>7} {'segments':>9} {'text %':>7} {'segs %':>7}")
+    for name, make in generators.items():
+        raw = make(args.cues)
+        raw_bytes = len(raw.encode())
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            segments = parse_captions(raw)
+            best = min(best, time.perf_counter() - started)
+        text_bytes = len(segments_to_text(segments).encode())
+        compact_bytes = len(
+            json.dumps([[s.start, s.end, s.text] for s in segments], separators=(",", ":")).encode()
+        )
+        print(
+            f"{name:>8} {raw_bytes / 1e6:>7.2f} {raw_bytes / 1e6 / best:>7.1f} {len(segments):>9} "
+            f"{100 * text_bytes / raw_bytes:>6.1f}% {100 * compact_bytes / raw_bytes:>6.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
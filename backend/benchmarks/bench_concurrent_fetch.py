@@ -0,0 +1,84 @@
+"""
+Benchmark: wall-clock time of TranscriptService.iter_video_transcripts versus
+fetch concurrency, against the local stub caption server.
+
+Run from ``backend/``:  python -m benchmarks.bench_concurrent_fetch
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+from app.core.http import connection_stats, create_http_client
+from app.core.settings import Settings
+from app.services.quota import QuotaManager
+from app.services.transcripts import TranscriptService
+
+from .stub_server import StubCaptionServer
+
+
+async def run_once(
+    base_url: str, video_ids: list[str], concurrency: int, pooled: bool
+) -> tuple[float, int, dict]:
+    settings = Settings(
+        youtube_api_key="benchmark",
+        youtube_api_base_url=base_url,
+        max_videos_per_channel=len(video_ids),
+        transcript_fetch_concurrency=concurrency,
+        # Rate limit out of the way so the measurement isolates concurrency
+        youtube_api_rate_per_second=10_000,
+        youtube_api_burst=10_000,
+    )
+    http_client = create_http_client(settings) if pooled else None
+    quota = QuotaManager(
+        ":memory:",
+        daily_limit=len(video_ids) * 2,
+        max_rate=settings.youtube_api_rate_per_second,
+        burst=settings.youtube_api_burst,
+    )
+    service = TranscriptService(settings=settings, http_client=http_client, quota=quota)
+
+    started = time.perf_counter()
+    fetched = 0
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            async for item in service.iter_video_transcripts(video_ids):
+                fetched += bool(item.text)
+    finally:
+        if http_client is not None:
+            await http_client.aclose()
+    stats = connection_stats(http_client) if http_client else {}
+    return time.perf_counter() - started, fetched, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub latency per request (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--no-pool", action="store_true", help="open a client per video (pre-pooling behaviour)")
+    args = parser.parse_args()
+
+    video_ids = [f"vid{i:08d}" for i in range(args.videos)]
+    with StubCaptionServer(latency=args.latency) as server:
+        print(f"{args.videos} videos, {args.latency * 1000:.0f} ms stub latency, 2 requests per video")
+        print(f"{'concurrency':>11} {'wall (s)':>9} {'videos/s':>9} {'speedup':>8} {'connections':>11}")
+        baseline = None
+        for concurrency in args.concurrency:
+            elapsed, fetched, stats = asyncio.run(
+                run_once(server.base_url, video_ids, concurrency, pooled=not args.no_pool)
+            )
+            baseline = baseline or elapsed
+            connections = stats.get("tcp_connects", "n/a")
+            print(
+                f"{concurrency:>11} {elapsed:>9.2f} {fetched / elapsed:>9.1f} "
+                f"{baseline / elapsed:>7.1f}x {connections:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
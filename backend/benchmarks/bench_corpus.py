@@ -0,0 +1,112 @@
+"""
+Benchmark: per-channel transcript corpus versus transcripts as JSON.
+
+Writes a synthetic back catalog (Zipf-distributed vocabulary, as in
+bench_lexical_index) into a ChannelCorpus, then reports write rate, bytes on
+disk against the JSON the job store and API used to carry, Python heap held
+by the reopened corpus against the same transcripts loaded from JSON, latency of
+paged, time-window and full-text reads (p50/p99), and the payload of a
+paged listing against shipping every transcript.
+
+Run from ``backend/``:  python -m benchmarks.bench_corpus --videos 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from app.services.corpus import ChannelCorpus, resolve_codec
+
+from .bench_lexical_index import make_video, make_vocabulary, percentiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=500)
+    parser.add_argument("--minutes", type=int, default=20)
+    parser.add_argument("--vocabulary", type=int, default=30_000)
+    parser.add_argument("--codec", default="auto", choices=["auto", "zstd", "zlib", "none"])
+    parser.add_argument("--block-segments", type=int, default=256)
+    parser.add_argument("--reads", type=int, default=500)
+    args = parser.parse_args()
+
+    vocabulary = make_vocabulary(args.vocabulary)
+    weights = 1.0 / np.arange(1, args.vocabulary + 1)
+    weights /= weights.sum()
+    codec = resolve_codec(args.codec)
+    items = [make_video(video, args.minutes, vocabulary, weights) for video in range(args.videos)]
+
+    rows = [json.dumps(item.to_dict(), ensure_ascii=False) for item in items]
+    json_text = sum(len(row.encode()) for row in rows)
+    json_segments = sum(len(json.dumps(item.to_dict(True), ensure_ascii=False).encode()) for item in items)
+
+    # What loading a channel's stored job results used to hold
+    tracemalloc.start()
+    loaded = [json.loads(row) for row in rows]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del loaded
+    tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "channel"
+        corpus = ChannelCorpus(path, codec, args.block_segments)
+        started = time.perf_counter()
+        for item in items:
+            corpus.put(item.video_id, item.title, item.segments)
+        write_seconds = time.perf_counter() - started
+        corpus.close()
+        disk = sum(f.stat().st_size for f in path.iterdir())
+
+        tracemalloc.start()
+        corpus = ChannelCorpus(path, codec, args.block_segments)
+        corpus_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        rng = np.random.default_rng(0)
+        cues = args.minutes * 20
+        pages, windows, texts = [], [], []
+        for _ in range(args.reads):
+            video_id = items[rng.integers(len(items))].video_id
+            offset = int(rng.integers(cues))
+            t0 = time.perf_counter()
+            corpus.segments(video_id, offset, 200)
+            t1 = time.perf_counter()
+            corpus.segments(video_id, start=offset * 3.0, end=offset * 3.0 + 60)
+            t2 = time.perf_counter()
+            corpus.text(video_id)
+            t3 = time.perf_counter()
+            pages.append(t1 - t0)
+            windows.append(t2 - t1)
+            texts.append(t3 - t2)
+
+        listing = json.dumps({"videos": [entry.summary() for entry in corpus.videos(0, 50)]}).encode()
+        page = json.dumps({"segments": [s.to_dict() for s in corpus.segments(items[0].video_id, 0, 200)]}).encode()
+        stats = corpus.stats()
+        corpus.close()
+
+    mib = 1024 * 1024
+    print(f"{args.videos} videos x {args.minutes} min ({cues} cues each), codec {codec}, {args.block_segments} cues/block")
+    print(f"write: {args.videos / write_seconds:.0f} videos/s, block compression {stats['compression_ratio']}x")
+    print(
+        f"disk: corpus {disk / mib:.2f} MiB vs JSON text {json_text / mib:.2f} MiB "
+        f"({json_text / disk:.1f}x) / JSON with segments {json_segments / mib:.2f} MiB ({json_segments / disk:.1f}x)"
+    )
+    print(f"heap: reopened corpus {corpus_bytes / mib:.2f} MiB vs transcripts loaded from JSON {dict_bytes / mib:.2f} MiB")
+    print(f"page of 200 segments: {percentiles(pages)}")
+    print(f"60 s window:          {percentiles(windows)}")
+    print(f"full text of a video: {percentiles(texts)}")
+    print(
+        f"payload: 50-video listing {len(listing) / 1024:.1f} KiB + 200-segment page {len(page) / 1024:.1f} KiB "
+        f"vs all transcripts {json_text / mib:.2f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: chunking + embedding throughput (chunks/s) versus embedding batch
+size, and the cost of re-ingesting unchanged transcripts through the
+content-hash embedding cache.
+
+Uses synthetic timestamped transcripts and the configured embedder (the
+dependency-free hashing embedder unless ``--provider`` says otherwise).
+
+Run from ``backend/``:  python -m benchmarks.bench_embeddings
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.settings import Settings
+from app.services.captions import Segment
+from app.services.embeddings import EmbeddingCache, EmbeddingPipeline, create_embedder
+from app.services.transcripts import TranscriptItem
+
+WORDS = (
+    "today we look at caching vectors and retrieval for long videos while the quick brown fox "
+    "explains why batching matters more than raw model speed on a small cpu"
+).split()
+
+
+def make_transcripts(videos: int, minutes: int) -> list[TranscriptItem]:
+    items = []
+    for v in range(videos):
+        rng = random.Random(v)
+        segments = [
+            Segment(i * 3.0, i * 3.0 + 2.9, " ".join(rng.choices(WORDS, k=9)))
+            for i in range(minutes * 20)
+        ]
+        items.append(TranscriptItem(f"vid{v:08d}", f"Video {v}", segments=segments))
+    return items
+
+
+async def stream(items: list[TranscriptItem]):
+    for item in items:
+        yield item
+
+
+async def run(pipeline: EmbeddingPipeline, items: list[TranscriptItem]) -> tuple[float, int]:
+    started = time.perf_counter()
+    chunks = 0
+    async for batch in pipeline.process(stream(items)):
+        chunks += len(batch.chunks)
+    return time.perf_counter() - started, chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=50)
+    parser.add_argument("--minutes", type=int, default=20, help="transcript length per video")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--provider", default="hashing", choices=["hashing", "sentence-transformers", "ollama"])
+    args = parser.parse_args()
+
+    settings = Settings(embedding_provider=args.provider)
+    embedder = create_embedder(settings)
+    items = make_transcripts(args.videos, args.minutes)
+    print(f"embedder: {embedder.name}, {args.videos} videos x {args.minutes} min")
+
+    print(f"{'batch':>6} {'chunks':>7} {'seconds':>8} {'chunks/s':>9} {'batches':>8}")
+    for batch_size in args.batch_sizes:
+        pipeline = EmbeddingPipeline(
+            embedder, cache=None, batch_size=batch_size,
+            max_chars=settings.chunk_max_chars, overlap_chars=settings.chunk_overlap_chars,
+        )
+        elapsed, chunks = asyncio.run(run(pipeline, items))
+        print(f"{batch_size:>6} {chunks:>7} {elapsed:>8.3f} {chunks / elapsed:>9.0f} {pipeline.batches:>8}")
+
+    # Cold ingest fills the cache; re-ingesting unchanged transcripts only hits it
+    cache = EmbeddingCache(":memory:")
+    for label in ("cold", "re-ingest"):
+        pipeline = EmbeddingPipeline(
+            embedder, cache=cache, batch_size=args.batch_sizes[-1],
+            max_chars=settings.chunk_max_chars, overlap_chars=settings.chunk_overlap_chars,
+        )
+        elapsed, chunks = asyncio.run(run(pipeline, items))
+        print(
+            f"{label:>10}: {chunks} chunks in {elapsed:.3f}s ({chunks / elapsed:.0f} chunks/s), "
+            f"embedded {pipeline.embedded}, cache hits {pipeline.cache_hits}"
+        )
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: BM25 inverted index over a channel's full back catalog.
+
+Builds the index incrementally, one video at a time as ingestion would, from
+synthetic transcripts with a Zipf-distributed vocabulary, then reports build
+rate, postings size, ranked-query and phrase-lookup latency (p50/p99), and
+snapshot save/load time.
+
+Run from ``backend/``:  python -m benchmarks.bench_lexical_index
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.captions import Segment
+from app.services.chunking import chunk_transcript
+from app.services.lexical_index import LexicalIndex
+from app.services.transcripts import TranscriptItem
+
+
+def make_vocabulary(size: int) -> np.ndarray:
+    syllables = ["ka", "lo", "mi", "ter", "son", "vo", "ri", "den", "pa", "qu", "zel", "an"]
+    rng = np.random.default_rng(7)
+    return np.array(["".join(rng.choice(syllables, size=rng.integers(1, 4))) + str(i % 97) for i in range(size)])
+
+
+def make_video(video: int, minutes: int, vocabulary: np.ndarray, weights: np.ndarray) -> TranscriptItem:
+    rng = np.random.default_rng(video)
+    cues = minutes * 20
+    words = vocabulary[rng.choice(len(vocabulary), size=cues * 9, p=weights)].reshape(cues, 9)
+    segments = [Segment(i * 3.0, i * 3.0 + 2.9, " ".join(row)) for i, row in enumerate(words)]
+    return TranscriptItem(f"vid{video:08d}", f"Video {video}", segments=segments)
+
+
+def percentiles(samples: list[float]) -> str:
+    values = np.asarray(samples) * 1000
+    return f"p50 {np.percentile(values, 50):.3f} ms, p99 {np.percentile(values, 99):.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=1000)
+    parser.add_argument("--minutes", type=int, default=20)
+    parser.add_argument("--vocabulary", type=int, default=30_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    vocabulary = make_vocabulary(args.vocabulary)
+    weights = 1.0 / np.arange(1, args.vocabulary + 1)
+    weights /= weights.sum()
+
+    index = LexicalIndex()
+    chunk_seconds = 0.0
+    index_seconds = 0.0
+    last_video = 0.0
+    for video in range(args.videos):
+        item = make_video(video, args.minutes, vocabulary, weights)
+        started = time.perf_counter()
+        chunks = chunk_transcript(item)
+        chunked = time.perf_counter()
+        index.add_chunks(chunks)
+        last_video = time.perf_counter() - chunked
+        chunk_seconds += chunked - started
+        index_seconds += last_video
+    stats = index.stats()
+    print(
+        f"indexed {args.videos} videos ({stats['docs']} chunks, {stats['terms']} terms, "
+        f"{stats['postings']} postings, {stats['postings_bytes'] / 1e6:.1f} MB postings) "
+        f"in {index_seconds:.2f}s (+{chunk_seconds:.2f}s chunking); last video added in {last_video * 1000:.2f} ms"
+    )
+
+    rng = np.random.default_rng(1)
+    # Keyword-heavy questions: a mid-frequency "name" plus a couple of common words
+    queries = [
+        " ".join(vocabulary[rng.integers(50, 5000, 1)].tolist() + vocabulary[rng.integers(0, 200, 2)].tolist())
+        for _ in range(args.queries)
+    ]
+    for query in queries[:20]:  # warm the frozen postings
+        index.search(query, 10)
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, 10)
+        latencies.append(time.perf_counter() - started)
+    print(f"ranked query (top 10): {percentiles(latencies)}")
+
+    phrases = []
+    for _ in range(args.queries):
+        doc = int(rng.integers(0, len(index.doc_ids)))
+        text = index.payloads[doc]["text"].split()
+        offset = int(rng.integers(0, max(len(text) - 3, 1)))
+        phrases.append(" ".join(text[offset:offset + 3]))
+    latencies = []
+    for phrase in phrases:
+        started = time.perf_counter()
+        index.phrase(phrase, 10)
+        latencies.append(time.perf_counter() - started)
+    print(f"phrase lookup (3 words): {percentiles(latencies)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.npz"
+        started = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter()
+        LexicalIndex.load(path)
+        print(
+            f"snapshot {path.stat().st_size / 1e6:.1f} MB: save {saved - started:.2f}s, "
+            f"load {time.perf_counter() - saved:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Load test: concurrent channel ingests against the local YouTube stand-in.
+
+Targets:
+  service  TranscriptService.fetch_channel_transcripts, one call per channel,
+           sharing one pooled client, quota manager and request coalescing
+  app      the FastAPI app in-process (real lifespan, ASGI transport):
+           POST /api/transcripts/fetch per channel, then optionally a burst
+           of POST /api/ask against an indexed channel with the fake LLM
+           and/or one POST /api/jobs/batch of ``--channels`` new channels
+           (``--batch``), timing an interactive fetch issued mid-backfill
+
+Every channel has its own uploads on the stub server, so nothing is shared
+between ingests unless ``--cache`` is given. Reports ingests/s, videos/s,
+per-ingest latency p50/p99, quota units and stub requests per ingest, 429s
+served, demo-transcript fallbacks, failed fetches and peak RSS.
+
+``--json out.json`` saves the results; ``--compare out.json`` exits 1 when
+videos/s dropped or p99 rose by more than ``--tolerance`` against that run.
+
+Run from ``backend/``:  python -m benchmarks.bench_load --channels 32 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import httpx
+import numpy as np
+
+from app.core.http import create_http_client
+from app.core.logs import configure_logging
+from app.core.metrics import DEMO_FALLBACKS, FETCH_FAILURES
+from app.core.settings import Settings, get_settings
+from app.services.quota import QuotaManager
+from app.services.singleflight import SingleFlight
+from app.services.transcript_cache import TranscriptCache
+from app.services.transcripts import TranscriptService
+
+from .stub_server import StubCaptionServer, StubProcess
+
+
+Stub = Union[StubCaptionServer, StubProcess]
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def channel_urls(count: int) -> List[str]:
+    return [f"https://www.youtube.com/@load{i:04d}" for i in range(count)]
+
+
+def summarize(
+    target: str,
+    latencies: List[float],
+    wall: float,
+    videos: int,
+    quota_units: int,
+    server_before: Dict[str, int],
+    server_after: Dict[str, int],
+    demo_before: float,
+    failed_before: float,
+) -> Dict[str, Any]:
+    values = np.asarray(latencies) * 1000
+    ingests = len(latencies)
+    return {
+        "target": target,
+        "ingests": ingests,
+        "videos": videos,
+        "wall_s": round(wall, 3),
+        "ingests_per_s": round(ingests / wall, 2),
+        "videos_per_s": round(videos / wall, 1),
+        "p50_ms": round(float(np.percentile(values, 50)), 1),
+        "p99_ms": round(float(np.percentile(values, 99)), 1),
+        "quota_per_ingest": round(quota_units / ingests, 2),
+        "requests_per_ingest": round((server_after["requests"] - server_before["requests"]) / ingests, 2),
+        "throttled": server_after["throttled"] - server_before["throttled"],
+        "demo_fallbacks": int(DEMO_FALLBACKS.total() - demo_before),
+        "failed": int(FETCH_FAILURES.total() - failed_before),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+async def run_concurrently(urls: List[str], concurrency: int, ingest) -> tuple[List[float], int, float]:
+    """Run ``ingest(url) -> videos`` for every url, at most ``concurrency`` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    videos = 0
+
+    async def one(url: str) -> None:
+        nonlocal videos
+        async with semaphore:
+            started = time.perf_counter()
+            count = await ingest(url)
+            latencies.append(time.perf_counter() - started)
+            videos += count
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(url) for url in urls))
+    return latencies, videos, time.perf_counter() - started
+
+
+def bench_settings(args: argparse.Namespace, base_url: str) -> Settings:
+    return Settings(
+        youtube_api_key="benchmark",
+        youtube_api_base_url=base_url,
+        max_videos_per_channel=args.videos,
+        transcript_fetch_concurrency=args.fetch_concurrency,
+        youtube_api_rate_per_second=args.api_rate,
+        youtube_api_burst=max(int(args.api_rate), 1),
+        youtube_daily_quota=10**9,
+    )
+
+
+async def run_service(args: argparse.Namespace, server: Stub) -> Dict[str, Any]:
+    settings = bench_settings(args, server.base_url)
+    http_client = create_http_client(settings)
+    quota = QuotaManager(
+        ":memory:", settings.youtube_daily_quota, settings.youtube_api_rate_per_second, settings.youtube_api_burst
+    )
+    cache = TranscriptCache(":memory:", ttl_seconds=3600, max_bytes=1 << 30) if args.cache else None
+    service = TranscriptService(
+        settings=settings, http_client=http_client, cache=cache, singleflight=SingleFlight(), quota=quota
+    )
+
+    async def ingest(url: str) -> int:
+        return len(await service.fetch_channel_transcripts(url))
+
+    before = server.stats()
+    demo_before, failed_before = DEMO_FALLBACKS.total(), FETCH_FAILURES.total()
+    try:
+        latencies, videos, wall = await run_concurrently(channel_urls(args.channels), args.concurrency, ingest)
+        return summarize(
+            "service", latencies, wall, videos, quota.used_today(), before, server.stats(), demo_before, failed_before
+        )
+    finally:
+        await http_client.aclose()
+        quota.close()
+        if cache is not None:
+            cache.close()
+
+
+async def run_app(args: argparse.Namespace, server: Stub) -> Dict[str, Any]:
+    # The app reads settings from the environment and keeps its data under ./data
+    os.environ.update(
+        APP_YOUTUBE_API_KEY="benchmark",
+        APP_YOUTUBE_API_BASE_URL=server.base_url,
+        APP_MAX_VIDEOS_PER_CHANNEL=str(args.videos),
+        APP_TRANSCRIPT_FETCH_CONCURRENCY=str(args.fetch_concurrency),
+        APP_YOUTUBE_API_RATE_PER_SECOND=str(args.api_rate),
+        APP_YOUTUBE_API_BURST=str(max(int(args.api_rate), 1)),
+        APP_YOUTUBE_DAILY_QUOTA=str(10**9),
+        APP_TRANSCRIPT_CACHE_ENABLED=str(args.cache).lower(),
+        APP_INGEST_GLOBAL_CONCURRENCY=str(args.global_concurrency),
+        APP_BATCH_INGEST_WORKERS=str(args.concurrency),
+        APP_LLM_PROVIDER="fake",
+        APP_LOG_LEVEL="ERROR",
+    )
+    get_settings.cache_clear()
+    from app.main import create_app
+
+    app = create_app()
+    results: Dict[str, Any] = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            quota_before = (await client.get("/api/transcripts/stats")).json()["quota"]["used"]
+
+            async def ingest(url: str) -> int:
+                r = await client.post("/api/transcripts/fetch", json={"channel_url": url})
+                r.raise_for_status()
+                return len(r.json()["transcripts"])
+
+            before = server.stats()
+            demo_before, failed_before = DEMO_FALLBACKS.total(), FETCH_FAILURES.total()
+            latencies, videos, wall = await run_concurrently(channel_urls(args.channels), args.concurrency, ingest)
+            quota_used = (await client.get("/api/transcripts/stats")).json()["quota"]["used"] - quota_before
+            results = summarize(
+                "app", latencies, wall, videos, quota_used, before, server.stats(), demo_before, failed_before
+            )
+            if args.asks:
+                results["ask"] = await run_asks(client, args)
+            if args.batch:
+                results["batch"] = await run_batch(client, args)
+    return results
+
+
+async def run_batch(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[str, Any]:
+    """One batch of ``--channels`` channels; an interactive fetch of another channel is timed while it runs."""
+    channels = [{"channel_url": f"https://www.youtube.com/@batch{i:04d}"} for i in range(args.channels)]
+    started = time.perf_counter()
+    r = await client.post("/api/jobs/batch", json={"channels": channels})
+    r.raise_for_status()
+    batch_id = r.json()["batch_id"]
+
+    await asyncio.sleep(0.05)
+    probe_started = time.perf_counter()
+    r = await client.post("/api/transcripts/fetch", json={"channel_url": "https://www.youtube.com/@interactive"})
+    r.raise_for_status()
+    interactive_ms = (time.perf_counter() - probe_started) * 1000
+
+    while True:
+        status = (await client.get(f"/api/jobs/batches/{batch_id}")).json()
+        if status["status"] not in ("queued", "running"):
+            break
+        await asyncio.sleep(0.05)
+    wall = time.perf_counter() - started
+    # Seconds after the batch started at which each channel finished
+    done = sorted(job["finished_at"] - status["started_at"] for job in status["jobs"])
+    return {
+        "status": status["status"],
+        "videos": status["videos_completed"],
+        "videos_per_s": round(status["videos_completed"] / wall, 1),
+        "first_channel_done_s": round(done[0], 3),
+        "median_channel_done_s": round(done[len(done) // 2], 3),
+        "last_channel_done_s": round(done[-1], 3),
+        "interactive_fetch_ms": round(interactive_ms, 1),
+    }
+
+
+async def run_asks(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[str, Any]:
+    """Index one channel through a job, then fire ``--asks`` questions drawn from ``--questions`` distinct ones."""
+    channel = "https://www.youtube.com/@asks"
+    job = (await client.post("/api/jobs/ingest", json={"channel_url": channel})).json()
+    while (await client.get(f"/api/jobs/{job['job_id']}")).json()["status"] in ("queued", "running"):
+        await asyncio.sleep(0.05)
+
+    questions = [f"What is said in caption line {i} of the video?" for i in range(args.questions)]
+    cached = 0
+
+    async def ask(question: str) -> int:
+        nonlocal cached
+        r = await client.post(
+            "/api/ask", params={"format": "ndjson"}, json={"channel_url": channel, "question": question}
+        )
+        done = json.loads(r.text.strip().splitlines()[-1])
+        cached += bool(done.get("cached"))
+        return 0
+
+    asks = [questions[i % len(questions)] for i in range(args.asks)]
+    latencies, _, wall = await run_concurrently(asks, args.concurrency, ask)
+    values = np.asarray(latencies) * 1000
+    return {
+        "asks": args.asks,
+        "asks_per_s": round(args.asks / wall, 1),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "cache_hit_ratio": round(cached / args.asks, 3),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    baseline = json.loads(Path(baseline_path).read_text())
+    regressions = []
+    for target, current in results.items():
+        base = baseline.get(target)
+        if not base:
+            continue
+        if current["videos_per_s"] < base["videos_per_s"] * (1 - tolerance):
+            regressions.append(f"{target}: videos/s {current['videos_per_s']} < baseline {base['videos_per_s']}")
+        if current["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{target}: p99 {current['p99_ms']} ms > baseline {base['p99_ms']} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["service", "app", "both"], default="both")
+    parser.add_argument("--channels", type=int, default=32, help="ingests to run (one per channel)")
+    parser.add_argument("--videos", type=int, default=10, help="videos per channel")
+    parser.add_argument("--concurrency", type=int, default=8, help="ingests in flight")
+    parser.add_argument("--fetch-concurrency", type=int, default=4, help="videos in flight per ingest")
+    parser.add_argument("--global-concurrency", type=int, default=16, help="app: video fetch slots for all channels")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub latency per request (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of Data API calls answered 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After (s) sent with injected 429s")
+    parser.add_argument("--cues", type=int, default=200, help="caption cues per video")
+    parser.add_argument("--api-rate", type=float, default=10_000, help="APP_YOUTUBE_API_RATE_PER_SECOND")
+    parser.add_argument("--cache", action="store_true", help="enable the transcript cache")
+    parser.add_argument(
+        "--stub-in-process", action="store_true", help="serve the stub from a thread of this process (shares the GIL)"
+    )
+    parser.add_argument("--asks", type=int, default=0, help="app target: /api/ask requests after the ingests")
+    parser.add_argument("--questions", type=int, default=10, help="distinct questions among the asks")
+    parser.add_argument("--batch", action="store_true", help="app target: also ingest --channels as one batch job")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    # The run happens in a scratch directory
+    args.json = args.json and os.path.abspath(args.json)
+    args.compare = args.compare and os.path.abspath(args.compare)
+
+    configure_logging("ERROR")
+    results: Dict[str, Dict[str, Any]] = {}
+    stub = StubCaptionServer if args.stub_in_process else StubProcess
+    with tempfile.TemporaryDirectory() as tmp, stub(
+        latency=args.latency,
+        channel_size=args.videos,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        cues=args.cues,
+        distinct_channels=True,
+    ) as server:
+        os.chdir(tmp)
+        print(
+            f"{args.channels} channels x {args.videos} videos, concurrency {args.concurrency}, "
+            f"{args.latency * 1000:.0f} ms stub latency, {args.throttle_rate:.0%} 429s"
+        )
+        if args.target in ("service", "both"):
+            results["service"] = asyncio.run(run_service(args, server))
+        if args.target in ("app", "both"):
+            results["app"] = asyncio.run(run_app(args, server))
+
+    columns = [
+        "ingests_per_s", "videos_per_s", "p50_ms", "p99_ms", "quota_per_ingest",
+        "requests_per_ingest", "throttled", "demo_fallbacks", "failed", "peak_rss_mb",
+    ]
+    print(f"{'target':<8} " + " ".join(f"{column:>19}" for column in columns))
+    for target, result in results.items():
+        print(f"{target:<8} " + " ".join(f"{result[column]:>19}" for column in columns))
+        if "ask" in result:
+            ask = result["ask"]
+            print(
+                f"ask: {ask['asks']} requests, {ask['asks_per_s']}/s, p50 {ask['p50_ms']} ms, "
+                f"p99 {ask['p99_ms']} ms, answer cache hit ratio {ask['cache_hit_ratio']}"
+            )
+        if "batch" in result:
+            batch = result["batch"]
+            print(
+                f"batch: {batch['status']}, {batch['videos']} videos at {batch['videos_per_s']}/s, channels done "
+                f"after {batch['first_channel_done_s']}/{batch['median_channel_done_s']}/"
+                f"{batch['last_channel_done_s']} s (first/median/last), "
+                f"interactive fetch during backfill {batch['interactive_fetch_ms']} ms"
+            )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
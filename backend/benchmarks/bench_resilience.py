@@ -0,0 +1,112 @@
+"""
+Benchmark: real-transcript yield and per-video latency under upstream faults,
+with no retries, with retries (jittered backoff, Retry-After, circuit breaker)
+and with retries plus hedged caption downloads.
+
+Each scenario runs the same videos through TranscriptService against the stub
+caption server (in its own process) with injected 429s, 503s or a slow tail of timedtext
+responses, and reports the share of videos that got their real captions,
+p50/p99 latency per video (captions.list + download, retries included) and
+upstream requests per video.
+
+Run from ``backend/``:  python -m benchmarks.bench_resilience --videos 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from app.core.http import create_http_client
+from app.core.settings import Settings
+from app.services.fetch_policy import FetchPolicy, RetryPolicy
+from app.services.quota import QuotaManager
+from app.services.transcripts import STATUS_OK, TranscriptService
+
+from .bench_lexical_index import percentiles
+from .stub_server import StubProcess
+
+SCENARIOS = {
+    "clean": {},
+    "throttled": {"throttle_rate": 0.1, "retry_after": 0},
+    "errors": {"error_rate": 0.1},
+    "slow tail": {"slow_rate": 0.03, "slow_latency": 0.5},
+}
+
+
+def policies(args: argparse.Namespace) -> Dict[str, FetchPolicy]:
+    retry = RetryPolicy(attempts=args.attempts, base_delay=args.base_delay)
+    return {
+        "none": FetchPolicy(RetryPolicy(attempts=1), seed=0),
+        "retry": FetchPolicy(retry, seed=0),
+        "retry+hedge": FetchPolicy(retry, hedge=True, seed=0),
+    }
+
+
+async def run(args: argparse.Namespace, server: StubProcess, policy: FetchPolicy) -> Dict[str, Any]:
+    settings = Settings(
+        youtube_api_key="benchmark",
+        youtube_api_base_url=server.base_url,
+        transcript_cache_enabled=False,
+        youtube_api_rate_per_second=10_000,
+        youtube_api_burst=10_000,
+    )
+    http_client = create_http_client(settings)
+    quota = QuotaManager(":memory:", 10**9, settings.youtube_api_rate_per_second, settings.youtube_api_burst)
+    service = TranscriptService(settings=settings, http_client=http_client, quota=quota, fetch_policy=policy)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    real = 0
+
+    async def one(video_id: str) -> None:
+        nonlocal real
+        async with semaphore:
+            started = time.perf_counter()
+            item = await service._fetch_single_transcript(video_id)
+            latencies.append(time.perf_counter() - started)
+            real += item.status == STATUS_OK
+
+    before = server.stats()["requests"]
+    try:
+        await asyncio.gather(*(one(f"bench{n:07d}") for n in range(args.videos)))
+    finally:
+        await http_client.aclose()
+        quota.close()
+    stats = policy.stats()
+    return {
+        "real": real / args.videos,
+        "latency": percentiles(latencies),
+        "requests": (server.stats()["requests"] - before) / args.videos,
+        "retries": stats["retries"],
+        "hedges": stats["hedges_sent"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.01, help="stub latency per request (s)")
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--base-delay", type=float, default=0.05, help="first retry backoff (s)")
+    args = parser.parse_args()
+    # Per-video failure warnings would drown the table
+    logging.getLogger("app").setLevel(logging.CRITICAL)
+
+    print(f"{args.videos} videos, {args.concurrency} in flight, stub latency {args.latency * 1000:.0f} ms")
+    print(f"{'scenario':<10} {'policy':<12} {'real':>6} {'latency':>36} {'req/video':>10} {'retries':>8} {'hedges':>7}")
+    for scenario, faults in SCENARIOS.items():
+        for name, policy in policies(args).items():
+            with StubProcess(latency=args.latency, seed=0, **faults) as server:
+                result = asyncio.run(run(args, server, policy))
+            print(
+                f"{scenario:<10} {name:<12} {result['real']:>6.1%} {result['latency']:>36} "
+                f"{result['requests']:>10.2f} {result['retries']:>8} {result['hedges']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
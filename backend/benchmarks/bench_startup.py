@@ -0,0 +1,236 @@
+"""
+Benchmark: cold start of the backend.
+
+Import: ``import app.main`` in fresh interpreters, reporting the time and
+which heavy dependencies (httpx, numpy, yt_dlp) it pulled in, next to the
+same import with those dependencies loaded eagerly first (the cost lazy
+loading keeps off the import path).
+
+Server: uvicorn in a fresh process over a scratch data directory holding one
+indexed channel (``--videos`` synthetic transcripts), with the warm-up off
+and on. A client polls ``/health`` from launch, then sends POST
+/api/retrieve, retrying while the backend answers 503, then polls
+``/health/ready``. It records the time until the server listens, until the
+first successful retrieval (and that retrieval's own latency) and until the
+warm-up has finished. The "after ready" row holds the first retrieval until
+``/health/ready``, as a load balancer using it as the readiness probe would.
+
+``--json out.json`` saves the results; ``--compare out.json`` exits 1 when
+the import or the time to first successful request rose by more than
+``--tolerance`` against that run.
+
+Run from ``backend/``:  python -m benchmarks.bench_startup --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.settings import Settings
+from app.services.embeddings import EmbeddingPipeline
+from app.services.lexical_index import LexicalStore
+from app.services.vector_store import collection_for_channel, create_vector_store
+
+from .bench_lexical_index import make_video, make_vocabulary
+
+BACKEND = Path(__file__).resolve().parent.parent
+CHANNEL = "https://www.youtube.com/@startupbench"
+
+# (row, APP_WARMUP_ENABLED, client holds its first request until /health/ready)
+MODES = (("off", False, False), ("on", True, False), ("on, after ready", True, True))
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{imports}
+heavy = ("httpx", "numpy", "yt_dlp")
+print(json.dumps({{"seconds": time.perf_counter() - started, "loaded": [m for m in heavy if m in sys.modules]}}))
+"""
+
+
+def probe_import(eager: bool) -> Dict[str, Any]:
+    """``import app.main`` in a fresh interpreter; eager imports the heavy dependencies first (timed too)."""
+    imports = "import httpx, numpy, yt_dlp\nimport app.main" if eager else "import app.main"
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE.format(imports=imports)],
+        cwd=BACKEND,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _env(**overrides: str) -> Dict[str, str]:
+    env = dict(os.environ, PYTHONPATH=str(BACKEND), APP_LOG_LEVEL="WARNING", APP_LLM_PROVIDER="fake")
+    env.update(overrides)
+    return env
+
+
+async def seed(root: Path, videos: int, minutes: int) -> int:
+    """Index ``videos`` synthetic transcripts of one channel the way ingestion does; returns chunks."""
+    settings = Settings(
+        vector_store_path=str(root / "data" / "vectors"),
+        lexical_index_path=str(root / "data" / "lexical"),
+        embedding_cache_enabled=False,
+    )
+    pipeline = EmbeddingPipeline.from_settings(settings)
+    vectors = create_vector_store(settings)
+    lexical = LexicalStore(settings.lexical_index_path)
+    collection = collection_for_channel(CHANNEL)
+    vocabulary = make_vocabulary(20_000)
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    chunks = [chunk for video in range(videos) for chunk in pipeline.chunk(make_video(video, minutes, vocabulary, weights))]
+    embedded = await pipeline.embed_chunks(chunks)
+    await vectors.upsert(collection, [chunk.chunk_id for chunk in chunks], embedded, [chunk.to_dict() for chunk in chunks])
+    lexical.add_chunks(collection, chunks)
+    lexical.flush(collection)
+    await vectors.close()
+    pipeline.close()
+    return len(chunks)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(url: str, body: Optional[bytes] = None) -> int:
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, ConnectionError):
+        return 0
+
+
+def _wait_for(url: str, deadline: float, interval: float) -> float:
+    while time.perf_counter() < deadline:
+        if _request(url) == 200:
+            return time.perf_counter()
+        time.sleep(interval)
+    raise TimeoutError(url)
+
+
+def launch(root: Path, warmup: bool, wait_ready: bool, interval: float, timeout: float) -> Dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    retrieve = json.dumps({"channel_url": CHANNEL, "question": "kalo mi ter", "top_k": 5}).encode()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=root,
+        env=_env(APP_WARMUP_ENABLED="true" if warmup else "false"),
+    )
+    try:
+        deadline = started + timeout
+        listening = _wait_for(f"{base}/health", deadline, interval)
+        ready = _wait_for(f"{base}/health/ready", deadline, interval) if wait_ready else None
+        while True:
+            sent = time.perf_counter()
+            status = _request(f"{base}/api/retrieve", retrieve)
+            if status == 200:
+                first = time.perf_counter()
+                break
+            if status != 503 or time.perf_counter() > deadline:
+                raise RuntimeError(f"/api/retrieve answered {status}")
+            time.sleep(interval)
+        if ready is None:
+            # Polled after the first retrieval: when already ready by then, this is ~first_request_ms
+            ready = _wait_for(f"{base}/health/ready", deadline, interval)
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "listening_ms": (listening - started) * 1000,
+        "first_request_ms": (first - started) * 1000,
+        "first_request_latency_ms": (first - sent) * 1000,
+        "ready_ms": (ready - started) * 1000,
+    }
+
+
+def p50(samples: List[float]) -> float:
+    return round(float(np.percentile(samples, 50)), 1)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    baseline = json.loads(Path(baseline_path).read_text())
+    regressions = []
+    for target, current in results.items():
+        base = baseline.get(target)
+        if not base:
+            continue
+        for metric in ("import_ms", "first_request_ms"):
+            if metric in current and current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{target}: {metric} {current[metric]} > baseline {base[metric]}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement (p50 reported)")
+    parser.add_argument("--videos", type=int, default=200, help="indexed videos in the scratch data directory")
+    parser.add_argument("--minutes", type=int, default=10, help="length of each synthetic video")
+    parser.add_argument("--interval", type=float, default=0.005, help="client poll interval (s)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="max seconds per server launch")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"import app.main, p50 of {args.runs} fresh interpreters")
+    print(f"{'import':<8} {'ms':>8}  heavy modules loaded")
+    for name, eager in (("lazy", False), ("eager", True)):
+        probes = [probe_import(eager) for _ in range(args.runs)]
+        results[f"import_{name}"] = {
+            "import_ms": p50([probe["seconds"] * 1000 for probe in probes]),
+            "loaded": probes[-1]["loaded"],
+        }
+        print(f"{name:<8} {results[f'import_{name}']['import_ms']:>8}  {', '.join(probes[-1]['loaded']) or '-'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        chunks = asyncio.run(seed(root, args.videos, args.minutes))
+        print(f"\nuvicorn launch to first successful POST /api/retrieve ({chunks} chunks indexed), p50 of {args.runs}")
+        columns = ["listening_ms", "first_request_ms", "first_request_latency_ms", "ready_ms"]
+        print(f"{'warmup':<16} " + " ".join(f"{column:>25}" for column in columns))
+        for name, warmup, wait_ready in MODES:
+            runs = [launch(root, warmup, wait_ready, args.interval, args.timeout) for _ in range(args.runs)]
+            result = results[f"warmup_{name.replace(' ', '_')}"] = {
+                column: p50([run[column] for run in runs]) for column in columns
+            }
+            print(f"{name:<16} " + " ".join(f"{result[column]:>25}" for column in columns))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: local vector store query latency and memory footprint versus
+corpus size, for exact (brute-force) and IVF search in float32 and float16.
+
+Vectors are synthetic clustered unit vectors (a mixture of "topics", like
+chunks of one channel). Reports insert time, p50/p99 query latency, IVF
+recall@10 against exact search, on-disk matrix size and resident memory.
+
+Run from ``backend/``:  python -m benchmarks.bench_vector_store
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.services.vector_store import LocalCollection
+
+
+def clustered_vectors(n: int, dim: int, topics: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1e6
+    except OSError:  # not Linux: peak instead of current
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    values = np.asarray(samples) * 1000
+    return float(np.percentile(values, 50)), float(np.percentile(values, 99))
+
+
+def bench(root: Path, n: int, dim: int, dtype: str, query_count: int, ann: bool, nprobe: int) -> None:
+    vectors = clustered_vectors(n, dim, topics=max(8, n // 2000))
+    # Queries land near stored chunks, as questions about the channel would
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, n, query_count)] + 0.5 * rng.standard_normal((query_count, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    path = root / f"{dtype}-{n}-{'ivf' if ann else 'exact'}"
+    rss_before = rss_mb()
+    collection = LocalCollection(path, dtype=dtype, ann_threshold=1 if ann else 0, nprobe=nprobe)
+    started = time.perf_counter()
+    for offset in range(0, n, 10_000):
+        block = vectors[offset:offset + 10_000]
+        ids = [f"v{i}" for i in range(offset, offset + len(block))]
+        collection.upsert(ids, block, [{"video_id": f"vid{i // 50}"} for i in range(offset, offset + len(block))])
+    insert_s = time.perf_counter() - started
+
+    latencies = []
+    recall = 0.0
+    for query in queries:
+        started = time.perf_counter()
+        hits = collection.search(query, 10)
+        latencies.append(time.perf_counter() - started)
+        if ann:
+            exact = set(np.argpartition(-(vectors @ query), 10)[:10])
+            recall += len(exact & {int(hit.id[1:]) for hit in hits}) / 10
+    p50, p99 = percentiles(latencies)
+    stats = collection.stats()
+    print(
+        f"{n:>8} {dtype:>8} {'ivf' if ann else 'exact':>6} {insert_s:>8.2f} {p50:>8.2f} {p99:>8.2f} "
+        f"{(recall / query_count if ann else 1.0):>7.3f} {(stats['matrix_bytes'] + stats['ann_bytes']) / 1e6:>9.1f} "
+        f"{rss_mb() - rss_before:>8.1f}"
+    )
+    collection.close()
+    del collection
+    shutil.rmtree(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    # 200k+ points take minutes per configuration (index build and recall checks)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, default=16)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench-vectors-"))
+    print(f"{'points':>8} {'dtype':>8} {'search':>6} {'insert s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'recall':>7} {'index MB':>9} {'RSS MB':>8}")
+    try:
+        for n in args.sizes:
+            for dtype in ("float32", "float16"):
+                for ann in (False, True):
+                    bench(root, n, args.dim, dtype, args.queries, ann, args.nprobe)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Local stand-in for the YouTube caption endpoints used by the benchmarks.
+
+Serves ``/channels``, ``/playlistItems`` (uploads listing), ``/captions``
+(captions.list) and ``/timedtext`` on 127.0.0.1 with a configurable
+per-request latency, so fetch pipelines can be measured without touching the
+network or spending quota. Optionally injects HTTP 429s on Data API calls,
+503s and slow responses on caption downloads, and gives every channel its
+own uploads, for load tests across many channels.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import multiprocessing
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+_API_PATHS = ("/channels", "/playlistItems", "/captions")
+
+
+def make_vtt(video_id: str, cues: int = 50) -> str:
+    lines = ["WEBVTT", ""]
+    for i in range(cues):
+        start, end = i * 2, i * 2 + 2
+        lines.append(f"00:{start // 60:02d}:{start % 60:02d}.000 --> 00:{end // 60:02d}:{end % 60:02d}.000")
+        lines.append(f"Caption line {i} for video {video_id}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class StubCaptionServer:
+    """
+    Threaded HTTP server emulating captions.list + timedtext with fixed latency.
+
+    ``throttle_rate`` is the fraction of Data API calls (channels, playlistItems,
+    captions) answered with 429 and ``Retry-After: retry_after``.
+    ``error_rate`` of timedtext downloads get a 503 and ``slow_rate`` of them
+    take ``slow_latency`` seconds instead of ``latency``. With
+    ``distinct_channels`` each uploads playlist id gets ``channel_size`` videos
+    of its own; otherwise every channel shares ``uploads``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        channel_size: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        cues: int = 50,
+        distinct_channels: bool = False,
+        seed: int = 0,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+    ):
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.retry_after = retry_after
+        self.cues = cues
+        self.channel_size = channel_size
+        self.distinct_channels = distinct_channels
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.slow = 0
+        self.by_endpoint: dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # Channel uploads, newest first (11-char ids like real videos)
+        self.uploads: list[str] = []
+        self.publish(channel_size)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # Headers and body go out as separate writes; avoid Nagle/delayed-ACK stalls
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args) -> None:  # keep benchmark output clean
+                pass
+
+            def _send(self, status: int, body: str, content_type: str, headers: dict | None = None) -> None:
+                payload = body.encode()
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                endpoint = "/" + url.path.rsplit("/", 1)[-1]
+                if endpoint == "/_stats":
+                    self._send(200, json.dumps(server.stats()), "application/json")
+                    return
+                with server._lock:
+                    server.requests += 1
+                    server.by_endpoint[endpoint] = server.by_endpoint.get(endpoint, 0) + 1
+                    throttle = endpoint in _API_PATHS and server._random.random() < server.throttle_rate
+                    if throttle:
+                        server.throttled += 1
+                    # Draw only when enabled so seeded throttling stays reproducible
+                    caption = endpoint == "/timedtext"
+                    fail = caption and server.error_rate > 0 and server._random.random() < server.error_rate
+                    slow = caption and not fail and server.slow_rate > 0 and server._random.random() < server.slow_rate
+                    server.errors += fail
+                    server.slow += slow
+                time.sleep(server.slow_latency if slow else server.latency)
+                if throttle:
+                    body = {"error": {"code": 429, "message": "Too Many Requests"}}
+                    self._send(429, json.dumps(body), "application/json", {"Retry-After": str(server.retry_after)})
+                elif fail:
+                    self._send(503, "unavailable", "text/plain")
+                elif endpoint == "/channels":
+                    handle = (query.get("forHandle") or query.get("forUsername") or ["stub"])[0].lstrip("@")
+                    uploads = f"UU{handle}" if server.distinct_channels else "UUstub"
+                    body = {"items": [{"contentDetails": {"relatedPlaylists": {"uploads": uploads}}}]}
+                    self._send(200, json.dumps(body), "application/json")
+                elif endpoint == "/playlistItems":
+                    start = int(query.get("pageToken", ["0"])[0] or 0)
+                    size = int(query.get("maxResults", ["50"])[0])
+                    uploads = server.channel_uploads(query.get("playlistId", [""])[0])
+                    page = uploads[start:start + size]
+                    body = {
+                        "items": [
+                            {
+                                "snippet": {"title": f"Stub video {vid}"},
+                                "contentDetails": {"videoId": vid, "videoPublishedAt": server.published_at(vid)},
+                            }
+                            for vid in page
+                        ]
+                    }
+                    if start + size < len(uploads):
+                        body["nextPageToken"] = str(start + size)
+                    self._send(200, json.dumps(body), "application/json")
+                elif endpoint == "/captions":
+                    video_id = query.get("videoId", [""])[0]
+                    body = {
+                        "items": [
+                            {
+                                "snippet": {
+                                    "language": "en",
+                                    "trackKind": "standard",
+                                    "baseUrl": f"{server.base_url}/timedtext?v={video_id}&lang=en",
+                                }
+                            }
+                        ]
+                    }
+                    self._send(200, json.dumps(body), "application/json")
+                elif endpoint == "/timedtext":
+                    video_id = query.get("v", [""])[0]
+                    etag = f'"{video_id}-v1"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self._send(200, make_vtt(video_id, server.cues), "text/vtt", {"ETag": etag})
+                else:
+                    self._send(404, "not found", "text/plain")
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 256  # default backlog of 5 drops SYNs under concurrency
+            daemon_threads = True
+
+            def handle_error(self, request, client_address) -> None:
+                # Clients abandoning requests (cancelled hedges) are expected, not errors
+                if not isinstance(sys.exc_info()[1], ConnectionError):
+                    super().handle_error(request, client_address)
+
+        self._httpd = Server((host, port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def publish(self, count: int) -> list[str]:
+        """Add ``count`` new uploads to the top of the channel."""
+        first = len(self.uploads)
+        new = [f"stub{n:07d}" for n in range(first + count - 1, first - 1, -1)]
+        self.uploads[:0] = new
+        return new
+
+    def channel_uploads(self, playlist_id: str) -> list[str]:
+        """Uploads of a playlist, newest first; distinct per playlist when ``distinct_channels`` is set."""
+        if not self.distinct_channels:
+            return self.uploads
+        prefix = hashlib.blake2b(playlist_id.encode(), digest_size=2).hexdigest()
+        return [f"{prefix}{n:07d}" for n in range(self.channel_size - 1, -1, -1)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "slow": self.slow,
+                "by_endpoint": dict(self.by_endpoint),
+            }
+
+    @staticmethod
+    def published_at(video_id: str) -> str:
+        # One upload a day, in id order
+        day = datetime.date(2024, 1, 1) + datetime.timedelta(days=int(video_id[-7:]))
+        return f"{day.isoformat()}T12:00:00Z"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubCaptionServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _serve(kwargs: dict, conn) -> None:
+    with StubCaptionServer(**kwargs) as server:
+        conn.send(server.base_url)
+        threading.Event().wait()
+
+
+class StubProcess:
+    """
+    A StubCaptionServer in a child process, so serving requests does not
+    compete with the code under test for the GIL. Counters are read over
+    HTTP (``/_stats``).
+    """
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.base_url = ""
+
+    def stats(self) -> dict:
+        with urllib.request.urlopen(f"{self.base_url}/_stats") as response:
+            return json.loads(response.read())
+
+    def __enter__(self) -> "StubProcess":
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(self.kwargs, child), daemon=True)
+        self._process.start()
+        self.base_url = parent.recv()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join()
@@ -0,0 +1,124 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import get_settings
+from app.main import create_app
+from app.services.captions import Segment
+from app.services.llm import LLM
+from app.services.transcripts import TranscriptItem
+
+CHANNEL = "https://www.youtube.com/@asktest"
+QUESTION = "How does gradient descent pick the learning rate?"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Every data/ path of the default settings lands in the test's directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("APP_LLM_PROVIDER", "fake")
+    # The hashing embedder is lexical; a one-word paraphrase scores about 0.8
+    monkeypatch.setenv("APP_ANSWER_CACHE_SIMILARITY", "0.75")
+    get_settings.cache_clear()
+    with TestClient(create_app()) as client:
+        yield client
+    get_settings.cache_clear()
+
+
+def ingest(client: TestClient, *cues: str) -> None:
+    """Index one video of the channel the way an ingestion job does."""
+    segments = [Segment(i * 30.0, i * 30.0 + 30.0, text) for i, text in enumerate(cues)]
+
+    async def transcripts():
+        yield TranscriptItem(video_id="video000001", title="Optimization basics", segments=segments)
+
+    client.portal.call(client.app.state.job_manager._index, CHANNEL, transcripts())
+
+
+def ask(client: TestClient, question: str = QUESTION, **body: Any) -> List[Dict[str, Any]]:
+    response = client.post("/api/ask", json={"channel_url": CHANNEL, "question": question, **body})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n", 1)
+        event = json.loads(data.removeprefix("data: "))
+        assert name == f"event: {event['type']}"
+        events.append(event)
+    return events
+
+
+def answer_text(events: List[Dict[str, Any]]) -> str:
+    return "".join(event["text"] for event in events if event["type"] == "token")
+
+
+def test_llm_is_abstract():
+    with pytest.raises(TypeError):
+        LLM()  # type: ignore[abstract]
+
+
+def test_unknown_channel_is_404(client):
+    response = client.post("/api/ask", json={"channel_url": CHANNEL, "question": QUESTION})
+
+    assert response.status_code == 404
+    assert client.app.state.llm.calls == 0
+
+
+def test_events_stream_sources_tokens_done(client):
+    ingest(client, "Gradient descent steps downhill. The learning rate sets the step size.", "Momentum helps too.")
+    events = ask(client)
+
+    types = [event["type"] for event in events]
+    assert types[0] == "sources" and types[-1] == "done"
+    assert set(types[1:-1]) == {"token"} and len(types) > 3
+    assert events[0]["cached"] is False
+    assert events[0]["chunks"][0]["video_id"] == "video000001"
+    assert answer_text(events).startswith('In "Optimization basics" at 0:00: Gradient descent steps downhill.')
+    assert events[-1]["cached"] is False
+    assert client.app.state.llm.calls == 1
+
+
+def test_repeated_question_is_an_exact_cache_hit(client):
+    ingest(client, "Gradient descent steps downhill. The learning rate sets the step size.")
+    first = ask(client)
+    # Case, spacing and trailing punctuation do not matter
+    second = ask(client, "  how does GRADIENT descent pick the learning rate ")
+
+    assert [event["type"] for event in second] == ["sources", "token", "done"]
+    assert second[0]["cached"] is True and second[-1]["match"] == "exact"
+    assert answer_text(second) == answer_text(first)
+    assert client.app.state.llm.calls == 1
+
+    # use_cache=false always generates
+    ask(client, use_cache=False)
+    assert client.app.state.llm.calls == 2
+
+
+def test_paraphrase_is_a_near_duplicate_hit(client):
+    ingest(client, "Gradient descent steps downhill. The learning rate sets the step size.")
+    first = ask(client)
+    similar = ask(client, "How does gradient descent pick a learning rate?")
+
+    assert similar[-1]["cached"] is True
+    assert similar[-1]["match"] == "similar"
+    assert 0.75 <= similar[-1]["similarity"] < 1
+    assert similar[-1]["cached_question"] == QUESTION
+    assert answer_text(similar) == answer_text(first)
+    assert client.app.state.llm.calls == 1
+
+    # An unrelated question is generated
+    ask(client, "What does momentum do?")
+    assert client.app.state.llm.calls == 2
+
+
+def test_reingest_invalidates_cached_answers(client):
+    ingest(client, "Gradient descent steps downhill. The learning rate sets the step size.")
+    ask(client)
+    ingest(client, "Gradient descent was rewritten. Schedules now decay the learning rate.")
+    events = ask(client)
+
+    assert events[-1]["cached"] is False
+    assert "rewritten" in answer_text(events)
+    assert client.app.state.llm.calls == 2
@@ -0,0 +1,106 @@
+from app.services.captions import Segment, detect_format, parse_captions, segments_to_text
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:01.000 --> 00:00:03.500
+Hello <b>world</b> &amp; friends
+
+00:00:03.500 --> 00:00:05.000
+Second cue
+"""
+
+SRT = """1
+00:00:01,000 --> 00:00:02,000
+First line
+
+2
+00:00:02,000 --> 00:01:02,250
+Second line
+spans two rows
+"""
+
+TTML = """<?xml version="1.0" encoding="utf-8"?>
+<tt xmlns="http://www.w3.org/ns/ttml" xmlns:ttp="http://www.w3.org/ns/ttml#parameter" ttp:tickRate="10000000">
+  <body><div>
+    <p begin="00:00:01.000" end="00:00:02.000">One</p>
+    <p begin="20000000t" dur="10000000t">Two</p>
+    <p begin="4s" dur="500ms">Three<br/>lines</p>
+  </div></body>
+</tt>
+"""
+
+SRV3 = """<?xml version="1.0" encoding="utf-8" ?>
+<timedtext format="3"><body>
+<p t="1000" d="1500">Alpha</p>
+<p t="2500" d="1000"><s>Beta</s><s> gamma</s></p>
+</body></timedtext>
+"""
+
+# YouTube ASR: every cue repeats the previous line above the new one
+ASR_VTT = """WEBVTT
+
+00:00:00.000 --> 00:00:02.000
+ 
+so today we are
+
+00:00:02.000 --> 00:00:02.010
+so today we are
+ 
+
+00:00:02.010 --> 00:00:04.000
+so today we are
+talking about captions
+
+00:00:04.000 --> 00:00:06.000
+talking about captions
+and how they roll
+"""
+
+
+def test_detect_format():
+    assert detect_format(VTT) == "vtt"
+    assert detect_format(SRT) == "srt"
+    assert detect_format(TTML) == "ttml"
+    assert detect_format(SRV3) == "srv3"
+    assert detect_format("just words") == "text"
+
+
+def test_vtt_strips_markup_and_entities():
+    assert parse_captions(VTT) == [
+        Segment(1.0, 3.5, "Hello world & friends"),
+        Segment(3.5, 5.0, "Second cue"),
+    ]
+
+
+def test_srt_comma_times_and_multiline_cues():
+    segments = parse_captions(SRT)
+    assert segments == [Segment(1.0, 2.0, "First line"), Segment(2.0, 62.25, "Second line spans two rows")]
+
+
+def test_ttml_clock_tick_and_offset_times():
+    segments = parse_captions(TTML)
+    assert [segment.text for segment in segments] == ["One", "Two", "Three lines"]
+    assert [(segment.start, segment.end) for segment in segments] == [(1.0, 2.0), (2.0, 3.0), (4.0, 4.5)]
+
+
+def test_srv3_milliseconds():
+    assert parse_captions(SRV3) == [Segment(1.0, 2.5, "Alpha"), Segment(2.5, 3.5, "Beta gamma")]
+
+
+def test_asr_rolling_lines_emitted_once():
+    segments = parse_captions(ASR_VTT)
+    assert segments_to_text(segments) == "so today we are talking about captions and how they roll"
+    assert segments[0].start == 0.0
+    assert segments[-1].start == 4.0
+
+
+def test_identical_consecutive_cues_merge():
+    body = '<timedtext format="3"><body><p t="1000" d="1000">same</p><p t="2000" d="1000">same</p></body></timedtext>'
+    assert parse_captions(body) == [Segment(1.0, 3.0, "same")]
+
+
+def test_malformed_xml_yields_parsed_prefix():
+    body = '<timedtext format="3"><body><p t="0" d="1000">ok</p><p t="1000"'
+    assert parse_captions(body) == [Segment(0.0, 1.0, "ok")]
@@ -0,0 +1,93 @@
+import asyncio
+from typing import List
+
+from app.core.http import create_http_client
+from app.core.settings import Settings
+from app.services.channel_sync import (
+    ChannelStateStore,
+    ChannelWatermark,
+    VideoRef,
+    normalize_published_at,
+    reached_watermark,
+)
+from app.services.quota import QuotaManager
+from app.services.transcripts import TranscriptService
+from benchmarks.stub_server import StubCaptionServer
+
+CHANNEL = "https://www.youtube.com/@sync"
+
+
+def syncer(server: StubCaptionServer, state: ChannelStateStore, limit: int = 2):
+    settings = Settings(
+        youtube_api_key="test",
+        youtube_api_base_url=server.base_url,
+        max_videos_per_channel=limit,
+        transcript_cache_enabled=False,
+    )
+
+    def sync(incremental: bool = True) -> List[str]:
+        async def run():
+            client = create_http_client(settings)
+            quota = QuotaManager(":memory:", settings.youtube_daily_quota, max_rate=1000, burst=1000)
+            service = TranscriptService(settings=settings, http_client=client, quota=quota, channel_state=state)
+            try:
+                items = await service.fetch_channel_transcripts(CHANNEL, incremental=incremental)
+            finally:
+                await client.aclose()
+            assert all(item["status"] == "ok" for item in items)
+            return [item["video_id"] for item in items]
+
+        return asyncio.run(run())
+
+    return sync
+
+
+def test_capped_incremental_syncs_leave_no_gap():
+    state = ChannelStateStore(":memory:")
+    with StubCaptionServer(channel_size=2, latency=0) as server:
+        sync = syncer(server, state)
+        first = sync()
+        assert first == server.uploads[:2]
+
+        new = server.publish(5)
+        # The delta is larger than the limit: it is taken oldest first over several syncs
+        synced = [sync() for _ in range(4)]
+
+    assert synced == [new[3:5], new[1:3], new[0:1], []]
+    assert state.get_watermark(CHANNEL).last_video_id == new[0]
+
+
+def test_full_fetch_leaves_the_watermark_alone():
+    state = ChannelStateStore(":memory:")
+    with StubCaptionServer(channel_size=2, latency=0) as server:
+        sync = syncer(server, state)
+        sync()
+        new = server.publish(1)
+
+        assert sync(incremental=False) == [new[0], server.uploads[1]]
+        assert state.get_watermark(CHANNEL).last_video_id == server.uploads[1]
+        assert sync() == new
+
+
+def test_published_dates_from_both_sources_compare_alike():
+    assert normalize_published_at("20240105") == "2024-01-05"
+    assert normalize_published_at("2024-01-05T23:30:00-02:00") == "2024-01-06"
+    assert normalize_published_at("not a date") is None and normalize_published_at(None) is None
+
+    # A watermark written from yt-dlp, read while listing via the Data API, and the other way round
+    from_ytdlp = ChannelWatermark("key", "deleted0001", "20240105")
+    from_api = ChannelWatermark("key", "deleted0001", "2024-01-05T10:00:00Z")
+    for watermark in (from_ytdlp, from_api):
+        assert reached_watermark(VideoRef("older000001", "2024-01-04T08:00:00Z"), watermark)
+        assert reached_watermark(VideoRef("older000001", "20240104"), watermark)
+        assert not reached_watermark(VideoRef("newer000001", "2024-01-06T08:00:00Z"), watermark)
+        assert not reached_watermark(VideoRef("newer000001", "20240106"), watermark)
+        # Same day: listed again rather than risk skipping a newer upload
+        assert not reached_watermark(VideoRef("sameday0001", "20240105"), watermark)
+
+
+def test_stored_dates_are_normalized(tmp_path):
+    state = ChannelStateStore(str(tmp_path / "state.sqlite3"))
+    state.set_watermark(CHANNEL, VideoRef("video000001", "2024-01-05T10:00:00Z"))
+
+    assert state.get_watermark(CHANNEL).last_published_at == "2024-01-05"
@@ -0,0 +1,73 @@
+from app.services.captions import Segment
+from app.services.chunking import chunk_transcript, content_hash
+from app.services.transcripts import TranscriptItem
+
+
+def make_item(cues: int = 60, words: int = 8) -> TranscriptItem:
+    segments = [
+        Segment(i * 2.0, i * 2.0 + 2.0, " ".join(f"w{i}x{j}" for j in range(words))) for i in range(cues)
+    ]
+    return TranscriptItem(video_id="vid00000001", title="Title", segments=segments)
+
+
+def test_chunks_respect_max_chars_and_segment_boundaries():
+    item = make_item()
+    chunks = chunk_transcript(item, max_chars=200, overlap_chars=50)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk.text) <= 200
+        assert chunk.text == " ".join(segment.text for segment in chunk.segments)
+        assert chunk.start == chunk.segments[0].start
+        assert chunk.end == chunk.segments[-1].end
+    assert chunks[0].start == 0.0
+    assert chunks[-1].end == item.segments[-1].end
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+
+
+def test_overlap_repeats_trailing_segments():
+    chunks = chunk_transcript(make_item(), max_chars=200, overlap_chars=50)
+
+    for previous, current in zip(chunks, chunks[1:]):
+        repeated = [segment for segment in current.segments if segment in previous.segments]
+        # The repeated segments are the tail of the previous chunk and fit the overlap budget
+        assert repeated == previous.segments[len(previous.segments) - len(repeated):]
+        assert sum(len(segment.text) + 1 for segment in repeated) <= 50
+        assert current.segments[len(repeated)] not in previous.segments
+
+
+def test_without_overlap_every_segment_appears_once():
+    item = make_item()
+    chunks = chunk_transcript(item, max_chars=200, overlap_chars=0)
+
+    assert [segment for chunk in chunks for segment in chunk.segments] == item.segments
+
+
+def test_long_segment_is_split_at_word_boundaries():
+    text = " ".join(f"word{i}" for i in range(100))
+    item = TranscriptItem(video_id="vid00000002", title="", segments=[Segment(0.0, 100.0, text)])
+    chunks = chunk_transcript(item, max_chars=120, overlap_chars=0)
+
+    assert " ".join(chunk.text for chunk in chunks) == text
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+    # Timestamps are interpolated across the split pieces
+    assert chunks[0].start == 0.0 and chunks[-1].end == 100.0
+    assert all(a.end <= b.start for a, b in zip(chunks, chunks[1:]))
+
+
+def test_text_only_transcript_is_chunked_untimed():
+    item = TranscriptItem(video_id="vid00000003", title="Demo", text="demo text " * 30)
+    chunks = chunk_transcript(item, max_chars=100, overlap_chars=20)
+
+    assert len(chunks) > 1
+    assert all(chunk.start == 0.0 and chunk.end == 0.0 for chunk in chunks)
+
+
+def test_chunk_ids_and_hashes_are_stable():
+    first = chunk_transcript(make_item(), max_chars=200, overlap_chars=50)
+    second = chunk_transcript(make_item(), max_chars=200, overlap_chars=50)
+
+    assert [chunk.chunk_id for chunk in first] == [chunk.chunk_id for chunk in second]
+    assert [chunk.content_hash for chunk in first] == [content_hash(chunk.text) for chunk in second]
+    assert first[0].chunk_id == "vid00000001:0"
+    assert first[0].to_dict()["text"] == first[0].text
@@ -0,0 +1,116 @@
+from typing import List
+
+import pytest
+
+from app.services.captions import Segment
+from app.services.corpus import ChannelCorpus, CorpusStore, _compressor, _decompress, decode_block, encode_block
+
+CODECS = ["zstd", "zlib", "none"]
+
+
+def make_segments(count: int, step: float = 2.0) -> List[Segment]:
+    return [Segment(round(i * step, 3), round(i * step + step * 1.5, 3), f"cue {i} ünïcode") for i in range(count)]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_block_round_trip(codec):
+    segments = make_segments(50, step=1.234)
+    raw = encode_block(segments)
+    starts, ends, texts = decode_block(_decompress(codec, _compressor(codec)(raw)))
+
+    assert texts == [s.text for s in segments]
+    assert starts.tolist() == pytest.approx([s.start for s in segments], abs=1e-3)
+    assert ends.tolist() == pytest.approx([s.end for s in segments], abs=1e-3)
+    assert decode_block(encode_block([]))[2] == []
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_reopen_replays_the_index(tmp_path, codec):
+    corpus = ChannelCorpus(tmp_path, codec, block_segments=16)
+    corpus.put("video0000a", "First", make_segments(40))
+    corpus.put("video0000b", "Second", make_segments(5))
+    corpus.put("video0000a", "First again", make_segments(20))
+    corpus.close()
+
+    reopened = ChannelCorpus(tmp_path, codec, block_segments=16)
+    assert [entry.video_id for entry in reopened.videos()] == ["video0000b", "video0000a"]
+    entry = reopened.get("video0000a")
+    assert entry.title == "First again" and entry.segments == 20 and len(entry.blocks) == 2
+    assert reopened.segments("video0000a") == make_segments(20)
+    assert reopened.text("video0000b") == " ".join(s.text for s in make_segments(5))
+    # A torn record at the tail of the index is ignored
+    reopened.close()
+    with open(tmp_path / "index.jsonl", "a", encoding="utf-8") as index:
+        index.write('{"video_id": "video0000c", "ti')
+    assert ChannelCorpus(tmp_path, codec).get("video0000c") is None
+
+
+def test_unchanged_put_writes_nothing(tmp_path):
+    corpus = ChannelCorpus(tmp_path, "zlib")
+    corpus.put("video0000a", "Title", make_segments(10))
+    size = (tmp_path / "segments.bin").stat().st_size
+
+    corpus.put("video0000a", "Title", make_segments(10))
+    assert (tmp_path / "segments.bin").stat().st_size == size
+    assert corpus.stats()["dead_bytes"] == 0
+
+
+def test_delete_and_compaction_on_reopen(tmp_path):
+    corpus = ChannelCorpus(tmp_path, "none", block_segments=64)
+    corpus.put("video0000a", "Kept", make_segments(30))
+    long_cues = [Segment(i * 2.0, i * 2.0 + 2.0, "long cue " * 50) for i in range(3000)]
+    corpus.put("video0000b", "Deleted", long_cues)
+    assert corpus.delete("video0000b") and not corpus.delete("video0000b")
+    assert corpus.segments("video0000b") == [] and corpus.text("video0000b") is None
+    dead = corpus.stats()["dead_bytes"]
+    assert dead > 1 << 20
+    before = (tmp_path / "segments.bin").stat().st_size
+    corpus.close()
+
+    # Dead bytes outweigh live ones (and 1 MiB), so opening rewrites the files
+    reopened = ChannelCorpus(tmp_path, "none", block_segments=64)
+    assert reopened.stats()["dead_bytes"] == 0
+    assert (tmp_path / "segments.bin").stat().st_size == before - dead
+    assert [entry.video_id for entry in reopened.videos()] == ["video0000a"]
+    assert reopened.segments("video0000a") == make_segments(30)
+    assert ChannelCorpus(tmp_path, "none").segments("video0000a") == make_segments(30)
+
+
+def test_paging_across_blocks(tmp_path):
+    corpus = ChannelCorpus(tmp_path, "zlib", block_segments=10)
+    segments = make_segments(35)
+    corpus.put("video0000a", "Paged", segments)
+
+    assert corpus.segments("video0000a", offset=8, limit=5) == segments[8:13]
+    assert corpus.segments("video0000a", offset=30, limit=100) == segments[30:]
+    assert corpus.segments("video0000a", offset=35) == []
+    assert corpus.segments("video0000a", limit=0) == []
+    assert corpus.segments("missing") == []
+    assert [entry.video_id for entry in corpus.videos(offset=0, limit=1)] == ["video0000a"]
+
+
+def test_time_window_reads(tmp_path):
+    corpus = ChannelCorpus(tmp_path, "zlib", block_segments=10)
+    # Cues every 2 s, each 3 s long, so neighbouring cues overlap
+    segments = make_segments(50)
+    corpus.put("video0000a", "Windowed", segments)
+
+    window = corpus.segments("video0000a", start=21.0, end=30.0)
+    # The cue from 20 s is still running at 21 s; the one at 30 s starts at the end
+    assert window == [s for s in segments if s.end > 21.0 and s.start < 30.0]
+    assert window[0].start == 20.0 and window[-1].start == 28.0
+    # A window crossing a block boundary (block 2 starts at 20 s), then paged
+    assert corpus.segments("video0000a", start=17.0, end=25.0, offset=1, limit=2) == segments[9:11]
+    assert corpus.segments("video0000a", start=95.0) == segments[47:]
+    assert corpus.segments("video0000a", start=500.0) == []
+
+
+def test_store_opens_one_corpus_per_collection(tmp_path):
+    store = CorpusStore(str(tmp_path), codec="zlib")
+    store.corpus("channel_a").put("video0000a", "A", make_segments(3))
+
+    assert store.corpus("channel_a") is store.corpus("channel_a")
+    assert store.exists("channel_a") and not store.exists("channel_b")
+    assert store.stats()["channels"]["channel_a"]["videos"] == 1
+    store.close()
+    assert CorpusStore(str(tmp_path), codec="zlib").corpus("channel_a").get("video0000a").title == "A"
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from typing import List, Sequence
+
+import numpy as np
+import pytest
+
+from app.services.captions import Segment
+from app.services.embeddings import Embedder, EmbeddingCache, EmbeddingPipeline, HashingEmbedder
+from app.services.transcripts import TranscriptItem
+
+
+class CountingEmbedder(HashingEmbedder):
+    """Hashing embedder that records every batch it is asked to embed."""
+
+    def __init__(self, dim: int = 64):
+        super().__init__(dim)
+        self.calls: List[List[str]] = []
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return await super().embed(texts)
+
+
+async def _stream(*items: TranscriptItem):
+    for item in items:
+        yield item
+
+
+def make_item(video_id: str, cues: int = 40) -> TranscriptItem:
+    segments = [
+        Segment(i * 2.0, i * 2.0 + 2.0, f"cue {i} of {video_id} speaks about topic {i % 7}") for i in range(cues)
+    ]
+    return TranscriptItem(video_id=video_id, title=video_id, segments=segments)
+
+
+def collect(pipeline: EmbeddingPipeline, *items: TranscriptItem):
+    async def run():
+        return [batch async for batch in pipeline.process(_stream(*items))]
+
+    return asyncio.run(run())
+
+
+def test_embedder_is_abstract():
+    with pytest.raises(TypeError):
+        Embedder()  # type: ignore[abstract]
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    texts = ["the quick brown fox", "jumps over the lazy dog", ""]
+    first = HashingEmbedder(128).embed_sync(texts)
+    second = asyncio.run(HashingEmbedder(128).embed(texts))
+
+    assert first.shape == (3, 128) and first.dtype == np.float32
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first[:2], axis=1), 1.0, rtol=1e-5)
+    assert not first[2].any()
+
+
+def test_hashing_embedder_ranks_shared_words_higher():
+    texts = ["neural network training", "training a neural network", "apple pie recipe"]
+    vectors = HashingEmbedder(384).embed_sync(texts)
+
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_batches_cover_every_chunk_in_order():
+    embedder = CountingEmbedder()
+    pipeline = EmbeddingPipeline(embedder, batch_size=4, max_chars=200, overlap_chars=0)
+    items = [make_item("video0000a"), make_item("video0000b")]
+    batches = collect(pipeline, *items)
+
+    expected = [chunk.chunk_id for item in items for chunk in pipeline.chunk(item)]
+    assert [chunk.chunk_id for batch in batches for chunk in batch.chunks] == expected
+    assert all(len(batch.chunks) <= 4 and batch.vectors.shape == (len(batch.chunks), 64) for batch in batches)
+
+
+def test_reingest_hits_the_cache(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    item = make_item("video0000a")
+
+    first = EmbeddingPipeline(CountingEmbedder(), EmbeddingCache(path), batch_size=8, max_chars=200)
+    vectors = np.concatenate([batch.vectors for batch in collect(first, item)])
+    first.close()
+
+    # A new process re-ingesting the same video embeds nothing
+    embedder = CountingEmbedder()
+    second = EmbeddingPipeline(embedder, EmbeddingCache(path), batch_size=8, max_chars=200)
+    cached = np.concatenate([batch.vectors for batch in collect(second, item)])
+
+    assert embedder.calls == []
+    np.testing.assert_array_equal(vectors, cached)
+    assert second.stats()["cache_hits"] == second.stats()["chunks"] == len(vectors)
+
+
+def test_cache_io_runs_off_the_event_loop(tmp_path):
+    threads = []
+
+    class RecordingCache(EmbeddingCache):
+        def get_many(self, model, hashes):
+            threads.append(threading.current_thread())
+            return super().get_many(model, hashes)
+
+        def put_many(self, model, items):
+            threads.append(threading.current_thread())
+            super().put_many(model, items)
+
+    pipeline = EmbeddingPipeline(HashingEmbedder(64), RecordingCache(str(tmp_path / "e.sqlite3")), max_chars=200)
+    collect(pipeline, make_item("video0000a"))
+
+    assert threads and threading.main_thread() not in threads
+
+
+def test_only_changed_chunks_are_embedded():
+    embedder = CountingEmbedder()
+    pipeline = EmbeddingPipeline(embedder, EmbeddingCache(":memory:"), batch_size=8, max_chars=200, overlap_chars=0)
+    collect(pipeline, make_item("video0000a"))
+    embedder.calls.clear()
+
+    # The video gains cues at the end: earlier chunks keep their text and hash
+    changed = make_item("video0000a", cues=50)
+    collect(pipeline, changed)
+
+    old_texts = {chunk.text for chunk in pipeline.chunk(make_item("video0000a"))}
+    embedded = [text for call in embedder.calls for text in call]
+    assert embedded
+    assert not set(embedded) & old_texts
+    assert set(embedded) == {chunk.text for chunk in pipeline.chunk(changed)} - old_texts
+
+
+def test_identical_text_is_embedded_once_per_batch():
+    embedder = CountingEmbedder()
+    pipeline = EmbeddingPipeline(embedder, batch_size=8, max_chars=200)
+    a = TranscriptItem(video_id="video0000a", title="", segments=[Segment(0, 1, "same words")])
+    b = TranscriptItem(video_id="video0000b", title="", segments=[Segment(0, 1, "same words")])
+    batches = collect(pipeline, a, b)
+
+    assert embedder.calls == [["same words"]]
+    np.testing.assert_array_equal(batches[0].vectors[0], batches[0].vectors[1])
@@ -0,0 +1,141 @@
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+
+from app.services.fetch_policy import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    FetchPolicy,
+    RetryPolicy,
+)
+
+URL = "https://video.google.com/timedtext"
+
+
+def status_error(code: int, retry_after: str = "") -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", URL)
+    headers = {"retry-after": retry_after} if retry_after else {}
+    return httpx.HTTPStatusError(str(code), request=request, response=httpx.Response(code, headers=headers))
+
+
+def failing(*errors: Exception):
+    """An attempt raising ``errors`` in turn, then returning the number of calls."""
+    calls = []
+
+    async def attempt() -> int:
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return len(calls)
+
+    return attempt
+
+
+def test_retry_after_is_honoured_with_jitter_and_capped():
+    policy = RetryPolicy(base_delay=0.25, max_delay=8.0, max_retry_after=30.0)
+    rng = random.Random(0)
+
+    assert all(5.0 <= policy.delay(1, 5.0, rng) <= 5.25 for _ in range(100))
+    assert policy.delay(1, 31.0, rng) is None
+    # Without Retry-After: full jitter up to a capped exponential
+    assert all(0 <= policy.delay(3, None, rng) <= 1.0 for _ in range(100))
+    assert max(policy.delay(20, None, rng) for _ in range(100)) <= 8.0
+
+
+def test_call_retries_throttling_but_not_client_errors():
+    policy = FetchPolicy(RetryPolicy(attempts=3, base_delay=0.001), seed=0)
+
+    assert asyncio.run(policy.call(URL, failing(status_error(429, "0"), status_error(503)))) == 3
+    assert policy.retries == 2
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(policy.call(URL, failing(status_error(404))))
+    # A Retry-After beyond the budget is not waited out
+    started = time.perf_counter()
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(policy.call(URL, failing(status_error(429, "120"))))
+    assert time.perf_counter() - started < 1
+    assert policy.retries == 2 and policy.gave_up == 1
+    # Throttling is not a host failure
+    assert policy.breaker(URL).state == CLOSED
+
+
+def test_breaker_opens_then_half_opens_for_one_probe():
+    breaker = CircuitBreaker("host", failure_threshold=2, reset_seconds=0.05)
+    for _ in range(2):
+        breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    time.sleep(0.06)
+    breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    # A failed probe reopens the circuit at once
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.opens == 2
+
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_open_circuit_sheds_calls_without_attempting():
+    policy = FetchPolicy(RetryPolicy(attempts=1), failure_threshold=2, reset_seconds=60)
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(policy.call(URL, failing(status_error(502))))
+
+    async def never() -> None:
+        raise AssertionError("attempted while the circuit is open")
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(policy.call(URL, never))
+    assert policy.stats()["circuits"]["video.google.com"]["state"] == OPEN
+
+
+def hedged_calls(policy: FetchPolicy, samples: int, slow: float = 0.5):
+    """Warm the latency window with ``samples`` fast calls, then make one whose first attempt is slow."""
+    starts = []
+
+    async def attempt() -> int:
+        starts.append(time.perf_counter())
+        await asyncio.sleep(slow if len(starts) == samples + 1 else 0.001)
+        return len(starts)
+
+    async def run() -> int:
+        for _ in range(samples):
+            await policy.hedged(URL, attempt)
+        return await policy.hedged(URL, attempt)
+
+    return asyncio.run(run()), len(starts) - samples
+
+
+def test_slow_request_is_hedged_and_the_hedge_wins():
+    policy = FetchPolicy(hedge=True, hedge_quantile=0.95, hedge_min_delay=0.01)
+    result, attempts = hedged_calls(policy, FetchPolicy.min_hedge_samples)
+
+    assert attempts == 2
+    assert result == FetchPolicy.min_hedge_samples + 2
+    assert policy.hedges_sent == policy.hedges_won == 1
+
+
+def test_no_hedge_without_enough_samples_or_when_disabled():
+    policy = FetchPolicy(hedge=True, hedge_min_delay=0.01)
+    assert hedged_calls(policy, FetchPolicy.min_hedge_samples - 1, slow=0.05)[1] == 1
+
+    disabled = FetchPolicy(hedge=False)
+    assert hedged_calls(disabled, FetchPolicy.min_hedge_samples, slow=0.05)[1] == 1
+    assert policy.hedges_sent == disabled.hedges_sent == 0
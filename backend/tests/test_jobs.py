@@ -0,0 +1,160 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+from app.services.captions import Segment
+from app.services.embeddings import EmbeddingPipeline, HashingEmbedder
+from app.services.jobs import QUEUED, RUNNING, JobManager, JobStore
+from app.services.lexical_index import LexicalStore
+from app.services.scheduler import BULK, INTERACTIVE
+from app.services.transcripts import STATUS_DEMO, STATUS_FAILED, TranscriptItem
+from app.services.vector_store import LocalVectorStore, collection_for_channel
+
+
+def test_only_one_owner_claims_a_job():
+    store = JobStore(":memory:")
+    job, _, _ = store.create_or_get_active("https://www.youtube.com/@a", incremental=False)
+
+    assert store.claim(job.id, "first", lease_seconds=60)
+    assert not store.claim(job.id, "second", lease_seconds=60)
+    assert store.get(job.id).status == RUNNING
+
+
+def test_requeue_skips_live_leases():
+    store = JobStore(":memory:")
+    live, _, _ = store.create_or_get_active("https://www.youtube.com/@live", incremental=False)
+    dead, _, _ = store.create_or_get_active("https://www.youtube.com/@dead", incremental=False)
+    store.claim(live.id, "alive", lease_seconds=60)
+    store.claim(dead.id, "crashed", lease_seconds=0.01)
+    time.sleep(0.02)
+
+    assert store.requeue_interrupted() == [(dead.id, dead.priority)]
+    assert store.get(live.id).status == RUNNING
+    assert store.get(dead.id).status == QUEUED
+    assert store.claim(dead.id, "alive", lease_seconds=60)
+
+
+def test_renew_and_release_need_the_owner():
+    store = JobStore(":memory:")
+    job, _, _ = store.create_or_get_active("https://www.youtube.com/@a", incremental=False)
+    store.claim(job.id, "owner", lease_seconds=60)
+
+    assert not store.renew_lease(job.id, "other", lease_seconds=60)
+    store.release(job.id, "other")
+    assert store.get(job.id).status == RUNNING
+    assert store.renew_lease(job.id, "owner", lease_seconds=60)
+    store.release(job.id, "owner")
+    assert store.get(job.id).status == QUEUED
+
+
+def test_interactive_request_raises_a_bulk_job():
+    store = JobStore(":memory:")
+    _, [(job_id, _)] = store.create_batch([("https://www.youtube.com/@a", False, 1.0)])
+    assert store.get(job_id).priority == BULK
+
+    job, coalesced, promoted = store.create_or_get_active("https://www.youtube.com/@a", incremental=False)
+    assert (job.id, coalesced, promoted) == (job_id, True, True)
+    assert job.priority == INTERACTIVE
+    # A bulk request never lowers an interactive job
+    _, [(again, coalesced)] = store.create_batch([("https://www.youtube.com/@a", False, 1.0)])
+    assert (again, coalesced) == (job_id, True)
+    assert store.get(job_id).priority == INTERACTIVE
+
+
+def test_submit_promotes_queued_and_running_bulk_jobs():
+    manager = JobManager(JobStore(":memory:"), service_factory=None, workers=0)  # type: ignore[arg-type]
+    _, [(queued, _), (running, _)] = manager.store.create_batch(
+        [("https://www.youtube.com/@queued", False, 1.0), ("https://www.youtube.com/@running", False, 1.0)]
+    )
+    manager.store.claim(running, manager.owner, lease_seconds=60)
+    service = manager._services[running] = SimpleNamespace(priority=BULK)
+
+    manager.submit("https://www.youtube.com/@queued")
+    manager.submit("https://www.youtube.com/@running")
+
+    # The queued job joins the interactive queue; the running one fetches its remaining videos as interactive
+    interactive = manager._queues[INTERACTIVE]
+    assert interactive.get_nowait() == queued and interactive.empty()
+    assert service.priority == INTERACTIVE
+
+
+def test_jobs_without_a_lease_column_are_migrated(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, channel_key TEXT NOT NULL, channel_url TEXT NOT NULL, "
+        "incremental INTEGER NOT NULL, status TEXT NOT NULL, total INTEGER, completed INTEGER NOT NULL DEFAULT 0, "
+        "error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+    )
+    conn.execute(
+        "INSERT INTO jobs (id, channel_key, channel_url, incremental, status, created_at) VALUES (?, ?, ?, 0, ?, ?)",
+        ("old", "youtube.com/@a", "https://www.youtube.com/@a", RUNNING, time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+    store = JobStore(str(path))
+    # Left running by a process that predates leases
+    assert store.requeue_interrupted() == [("old", "interactive")]
+
+
+def test_demo_and_failed_items_leave_the_index_alone(tmp_path):
+    manager = JobManager(
+        JobStore(":memory:"),
+        service_factory=None,  # type: ignore[arg-type]
+        workers=0,
+        embeddings=EmbeddingPipeline(HashingEmbedder(64)),
+        vectors=LocalVectorStore(str(tmp_path / "vectors")),
+        lexical=LexicalStore(str(tmp_path / "lexical")),
+    )
+    channel = "https://www.youtube.com/@a"
+    collection = collection_for_channel(channel)
+    captions = TranscriptItem("video0000a", "Real", segments=[Segment(0.0, 5.0, "gradient descent explained")])
+
+    async def index(*items):
+        async def transcripts():
+            for item in items:
+                yield item
+
+        await manager._index(channel, transcripts())
+        return await manager.vectors.count(collection)
+
+    assert asyncio.run(index(captions)) == 1
+    # A later fetch of the same video fell back to demo text or failed
+    demo = TranscriptItem("video0000a", "(quota exceeded)", text="demo text", status=STATUS_DEMO)
+    failed = TranscriptItem("video0000b", "Other", text="", status=STATUS_FAILED)
+    assert asyncio.run(index(demo, failed)) == 1
+    assert [hit.id for hit in manager.lexical.search(collection, "gradient")] == ["video0000a:0"]
+    assert manager.lexical.search(collection, "demo") == []
+
+
+def test_progress_is_recorded_off_the_event_loop():
+    threads = []
+
+    class RecordingStore(JobStore):
+        def set_videos(self, *args):
+            threads.append(threading.current_thread())
+            super().set_videos(*args)
+
+        def record_video(self, *args, **kwargs):
+            threads.append(threading.current_thread())
+            super().record_video(*args, **kwargs)
+
+    class FakeService:
+        corpus = None
+
+        async def iter_ingest_events(self, channel_url, incremental, include_segments):
+            yield {"type": "start", "video_ids": ["video0000a"]}
+            yield {"type": "transcript", "transcript": {"video_id": "video0000a", "title": "A", "text": "words"}}
+
+    manager = JobManager(RecordingStore(":memory:"), service_factory=None, workers=0)  # type: ignore[arg-type]
+    job, _, _ = manager.store.create_or_get_active("https://www.youtube.com/@a", incremental=False)
+
+    async def run():
+        return [item.video_id async for item in manager._ingest(FakeService(), job.id, job.channel_url, False)]
+
+    assert asyncio.run(run()) == ["video0000a"]
+    assert len(threads) == 2 and threading.main_thread() not in threads
+    assert manager.store.get(job.id).completed == 1
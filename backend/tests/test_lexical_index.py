@@ -0,0 +1,102 @@
+from typing import List
+
+import pytest
+
+from app.services.captions import Segment
+from app.services.chunking import Chunk, chunk_transcript
+from app.services.lexical_index import LexicalIndex, LexicalStore
+from app.services.transcripts import TranscriptItem
+
+
+def make_chunks(video_id: str, *cues: str, max_chars: int = 1000) -> List[Chunk]:
+    segments = [Segment(i * 10.0, i * 10.0 + 10.0, text) for i, text in enumerate(cues)]
+    item = TranscriptItem(video_id=video_id, title=video_id, segments=segments)
+    return chunk_transcript(item, max_chars=max_chars, overlap_chars=0)
+
+
+def build() -> LexicalIndex:
+    index = LexicalIndex()
+    index.add_chunks(make_chunks("video0000a", "gradient descent converges slowly", "learning rate schedules"))
+    index.add_chunks(make_chunks("video0000b", "gradient descent gradient descent everywhere"))
+    index.add_chunks(make_chunks("video0000c", "baking bread with sourdough starter"))
+    return index
+
+
+def test_bm25_ranks_by_term_frequency_and_rarity():
+    index = build()
+    hits = index.search("gradient descent", top_k=10)
+
+    assert [hit.id for hit in hits] == ["video0000b:0", "video0000a:0"]
+    assert hits[0].score > hits[1].score > 0
+    # A rare term outweighs a common one
+    assert index.search("sourdough gradient")[0].id == "video0000c:0"
+
+
+def test_stopwords_only_and_unknown_queries():
+    index = build()
+
+    assert index.search("the of and") == []
+    assert index.search("quantum") == []
+    assert index.search("with")[0].id == "video0000c:0"  # a query of only stopwords still uses them
+
+
+def test_length_normalization_favours_shorter_chunks():
+    index = LexicalIndex(k1=1.2, b=0.75)
+    index.add_chunks(make_chunks("video0000a", "python"))
+    index.add_chunks(make_chunks("video0000b", "python " + "filler words " * 20))
+
+    assert [hit.id for hit in index.search("python")] == ["video0000a:0", "video0000b:0"]
+
+
+def test_phrase_matches_exact_sequence_with_timestamp():
+    index = LexicalIndex()
+    index.add_chunks(make_chunks("video0000a", "we talk about the learning", "rate of the model today"))
+    index.add_chunks(make_chunks("video0000b", "rate the learning of models"))
+
+    matches = index.phrase("learning rate")
+    assert [match["video_id"] for match in matches] == ["video0000a"]
+    # The phrase starts in the first caption segment
+    assert matches[0]["match_time"] == 0.0
+    assert index.phrase("rate of the model")[0]["match_time"] == 10.0
+    assert index.phrase("learning model") == []
+    assert index.phrase("unknown words") == []
+
+
+def test_delete_video_filters_dead_docs():
+    index = build()
+    index.delete_video("video0000b")
+
+    assert [hit.id for hit in index.search("gradient descent")] == ["video0000a:0"]
+    assert index.phrase("descent everywhere") == []
+    assert index.dead_docs == 1
+
+    compacted = index.compacted()
+    assert compacted.dead_docs == 0
+    assert [hit.id for hit in compacted.search("gradient descent")] == ["video0000a:0"]
+
+
+def test_reingest_replaces_chunks_and_keep_spares_them():
+    index = LexicalIndex()
+    index.add_chunks(make_chunks("video0000a", "old words here", "more old words", max_chars=20))
+    index.add_chunks(make_chunks("video0000a", "new words here", max_chars=20))
+    index.delete_video("video0000a", keep={"video0000a:0"})
+
+    assert index.search("old") == []
+    assert [hit.id for hit in index.search("new")] == ["video0000a:0"]
+    assert index.live_docs == 1
+
+
+def test_store_persists_and_reloads(tmp_path):
+    store = LexicalStore(str(tmp_path))
+    store.add_chunks("channel", make_chunks("video0000a", "gradient descent converges slowly"))
+    store.add_chunks("channel", make_chunks("video0000b", "gradient boosting trees"))
+    store.delete_video("channel", "video0000b")
+    before = store.search("channel", "gradient")
+    store.flush("channel")
+
+    reloaded = LexicalStore(str(tmp_path))
+    assert reloaded.warm_up() == 1
+    after = reloaded.search("channel", "gradient")
+    assert [hit.id for hit in after] == [hit.id for hit in before] == ["video0000a:0"]
+    assert after[0].score == pytest.approx(before[0].score, rel=1e-5)
+    assert reloaded.phrase("channel", "converges slowly")[0]["video_id"] == "video0000a"
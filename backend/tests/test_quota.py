@@ -0,0 +1,96 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.http import create_http_client
+from app.core.settings import Settings
+from app.services.quota import QuotaManager
+from app.services.transcripts import TranscriptService
+from benchmarks.stub_server import StubCaptionServer
+
+
+def test_try_consume_respects_limit_and_reserve():
+    quota = QuotaManager(":memory:", daily_limit=10, max_rate=100, burst=10)
+
+    assert quota.try_consume(4) == 4
+    assert quota.try_consume(4, reserve=3) is None
+    assert quota.used_today() == 4
+    assert quota.try_consume(6) == 10
+    assert quota.try_consume(1) is None
+
+
+def test_concurrent_managers_never_overspend(tmp_path):
+    path = str(tmp_path / "quota.sqlite3")
+    # One manager per worker stands in for separate processes sharing the file
+    managers = [QuotaManager(path, daily_limit=50, max_rate=100, burst=10) for _ in range(4)]
+
+    def spend(quota: QuotaManager) -> int:
+        return sum(quota.try_consume(1) is not None for _ in range(40))
+
+    with ThreadPoolExecutor(len(managers)) as pool:
+        granted = sum(pool.map(spend, managers))
+
+    assert granted == 50
+    assert managers[0].used_today() == 50
+
+
+def test_a_contended_write_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "quota.sqlite3")
+    quota = QuotaManager(path, daily_limit=10, max_rate=100, burst=10)
+    # Another process holds the write lock for a while
+    other = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.3, other.execute, ("COMMIT",)).start()
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await quota.wait_for_slot()
+        waited = time.perf_counter() - started
+        task.cancel()
+        return waited, ticks
+
+    waited, ticks = asyncio.run(run())
+    assert waited >= 0.25
+    # The loop kept running other work while the slot was being reserved
+    assert ticks >= 10
+
+
+def test_ingestion_stops_at_the_daily_limit():
+    async def ingest(base_url: str):
+        settings = Settings(
+            youtube_api_key="test",
+            youtube_api_base_url=base_url,
+            max_videos_per_channel=20,
+            transcript_fetch_concurrency=8,
+            youtube_daily_quota=10,
+            transcript_cache_enabled=False,
+        )
+        client = create_http_client(settings)
+        quota = QuotaManager(":memory:", settings.youtube_daily_quota, max_rate=1000, burst=1000)
+        service = TranscriptService(settings=settings, http_client=client, quota=quota)
+        try:
+            return await service.fetch_channel_transcripts("https://www.youtube.com/@quota"), quota
+        finally:
+            await client.aclose()
+
+    with StubCaptionServer(channel_size=20) as server:
+        items, quota = asyncio.run(ingest(server.base_url))
+        by_endpoint = server.stats()["by_endpoint"]
+        api_calls = sum(by_endpoint.get(path, 0) for path in ("/channels", "/playlistItems", "/captions"))
+
+    statuses = Counter((item["status"], item.get("reason")) for item in items)
+    assert quota.used_today() == api_calls == 10
+    # channels.list and one playlistItems page leave 8 units for captions.list
+    assert statuses == {("ok", None): 8, ("demo", "quota_exhausted"): 12}
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.services.captions import Segment
+from app.services.chunking import chunk_transcript
+from app.services.embeddings import EmbeddingPipeline, HashingEmbedder
+from app.services.lexical_index import LexicalStore
+from app.services.retrieval import Retriever, reciprocal_rank_fusion
+from app.services.transcripts import TranscriptItem
+from app.services.vector_store import LocalVectorStore, SearchHit, collection_for_channel
+
+CHANNEL = "https://www.youtube.com/@retrieval"
+
+
+def hit(point_id: str, score: float) -> SearchHit:
+    return SearchHit(point_id, score, {"chunk_id": point_id})
+
+
+def test_rrf_sums_reciprocal_ranks():
+    fused = reciprocal_rank_fusion(
+        [hit("a", 0.9), hit("b", 0.8), hit("c", 0.7)],
+        [hit("c", 12.0), hit("d", 9.0)],
+        k=60,
+    )
+
+    assert [entry["chunk_id"] for entry in fused] == ["c", "a", "b", "d"]
+    assert fused[0]["score"] == pytest.approx(1 / 63 + 1 / 61, abs=1e-6)
+    assert fused[0]["vector_score"] == 0.7 and fused[0]["lexical_score"] == 12.0
+    assert fused[1]["lexical_score"] is None
+    assert fused[3]["vector_score"] is None
+
+
+def test_rrf_lexical_weight_shifts_the_order():
+    vector = [hit("a", 0.9), hit("b", 0.8)]
+    lexical = [hit("b", 5.0), hit("a", 4.0)]
+
+    assert reciprocal_rank_fusion(vector, lexical, k=1, lexical_weight=0.5)[0]["chunk_id"] == "a"
+    assert reciprocal_rank_fusion(vector, lexical, k=1, lexical_weight=2.0)[0]["chunk_id"] == "b"
+
+
+@pytest.fixture
+def retriever(tmp_path):
+    pipeline = EmbeddingPipeline(HashingEmbedder(256))
+    vectors = LocalVectorStore(str(tmp_path / "vectors"))
+    lexical = LexicalStore(str(tmp_path / "lexical"))
+    collection = collection_for_channel(CHANNEL)
+    cues = {
+        "video0000a": ["how transformers use attention layers", "positional encodings explained"],
+        "video0000b": ["cooking pasta al dente", "the sauce needs garlic"],
+        "video0000c": ["attention is all you need paper review", "self attention heads"],
+    }
+
+    async def index():
+        for video_id, texts in cues.items():
+            segments = [Segment(i * 5.0, i * 5.0 + 5.0, text) for i, text in enumerate(texts)]
+            # One chunk per cue
+            chunks = chunk_transcript(TranscriptItem(video_id=video_id, title=video_id, segments=segments), 40, 0)
+            embedded = await pipeline.embed_chunks(chunks)
+            await vectors.upsert(collection, [c.chunk_id for c in chunks], embedded, [c.to_dict() for c in chunks])
+            lexical.add_chunks(collection, chunks)
+
+    asyncio.run(index())
+    return Retriever(pipeline, vectors, lexical, rrf_k=60)
+
+
+def test_hybrid_fuses_both_rankings(retriever):
+    query = "self attention"
+    hybrid = asyncio.run(retriever.retrieve(CHANNEL, query, top_k=3, mode="hybrid"))
+    vector = asyncio.run(retriever.retrieve(CHANNEL, query, top_k=10, mode="vector"))
+    lexical = asyncio.run(retriever.retrieve(CHANNEL, query, top_k=10, mode="lexical"))
+
+    assert len(hybrid) == 3
+    assert hybrid[0]["chunk_id"] == "video0000c:1"
+    assert all(entry["video_id"] != "video0000b" for entry in hybrid)
+    # Each fused score is the RRF of the chunk's ranks in the two lists
+    vector_rank = {entry["chunk_id"]: rank for rank, entry in enumerate(vector, 1)}
+    lexical_rank = {entry["chunk_id"]: rank for rank, entry in enumerate(lexical, 1)}
+    for entry in hybrid:
+        expected = sum(
+            1 / (60 + ranks[entry["chunk_id"]]) for ranks in (vector_rank, lexical_rank) if entry["chunk_id"] in ranks
+        )
+        assert entry["score"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_modes_and_fallbacks(retriever):
+    lexical = asyncio.run(retriever.retrieve(CHANNEL, "garlic", mode="lexical"))
+    assert [entry["chunk_id"] for entry in lexical] == ["video0000b:1"]
+    assert lexical[0]["lexical_score"] > 0
+
+    with pytest.raises(ValueError):
+        asyncio.run(retriever.retrieve(CHANNEL, "garlic", mode="semantic"))
+
+    # Without a lexical index every mode is served from the vector store
+    retriever.lexical = None
+    fallback = asyncio.run(retriever.retrieve(CHANNEL, "garlic", mode="hybrid"))
+    assert fallback and all("vector_score" in entry for entry in fallback)
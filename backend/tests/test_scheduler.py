@@ -0,0 +1,58 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from app.services.scheduler import BULK, INTERACTIVE, FairScheduler
+
+
+def grant_order(scheduler: FairScheduler, waiters: List[Tuple[str, str, float]]) -> List[str]:
+    """Queue every waiter behind a held slot, then record the order the slots are granted in."""
+    order: List[str] = []
+
+    async def fetch(flow: str, priority: str, weight: float) -> None:
+        async with scheduler.slot(flow, priority, weight):
+            order.append(flow)
+            await asyncio.sleep(0)
+
+    async def run() -> None:
+        await scheduler.acquire("holder")
+        tasks = [asyncio.create_task(fetch(*waiter)) for waiter in waiters]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["waiting"][waiters[0][1]] > 0
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    return order
+
+
+def test_stride_shares_slots_by_weight():
+    scheduler = FairScheduler(1)
+    order = grant_order(scheduler, [("light", BULK, 1.0)] * 20 + [("heavy", BULK, 3.0)] * 20)
+
+    # While both channels wait, the heavy one gets three slots for each of the light one's
+    first = order[:20]
+    assert first.count("heavy") == 15 and first.count("light") == 5
+    # A channel with many queued videos does not starve the other
+    assert "light" in order[:4]
+    assert scheduler.stats()["granted"][BULK] == 40
+
+
+def test_equal_weights_alternate():
+    order = grant_order(FairScheduler(1), [("a", BULK, 1.0)] * 4 + [("b", BULK, 1.0)] * 4)
+
+    assert order == ["a", "b"] * 4
+
+
+def test_interactive_is_served_before_bulk():
+    scheduler = FairScheduler(1)
+    order = grant_order(scheduler, [("backfill", BULK, 10.0)] * 5 + [("user", INTERACTIVE, 1.0)] * 3)
+
+    assert order == ["user"] * 3 + ["backfill"] * 5
+    assert scheduler.stats()["granted"] == {INTERACTIVE: 4, BULK: 5}
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(FairScheduler(1).acquire("flow", "urgent"))
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    runs = []
+
+    async def fetch(key: str) -> str:
+        runs.append(key)
+        await asyncio.sleep(0.01)
+        return f"result {key}"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("video", key, lambda key=key: fetch(key)) for key in "aaab"))
+
+    assert asyncio.run(run()) == ["result a"] * 3 + ["result b"]
+    assert sorted(runs) == ["a", "b"]
+    assert flight.stats() == {"video": {"calls": 4, "coalesced": 2, "in_flight": 0}}
+
+
+def test_namespaces_and_later_calls_are_not_coalesced():
+    flight = SingleFlight()
+    runs = []
+
+    async def fetch() -> int:
+        runs.append(None)
+        run = len(runs)
+        await asyncio.sleep(0)
+        return run
+
+    async def run():
+        together = await asyncio.gather(flight.do("video", "a", fetch), flight.do("channel", "a", fetch))
+        # Once the first call has finished, the key starts a new one
+        return together, await flight.do("video", "a", fetch)
+
+    assert asyncio.run(run()) == ([1, 2], 3)
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    runs = []
+
+    async def failing() -> None:
+        runs.append(None)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("video", "a", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(runs) == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == "upstream down" for result in results)
+    assert flight.stats()["video"]["in_flight"] == 0
+
+
+def test_cancelling_one_waiter_leaves_the_shared_call_running():
+    flight = SingleFlight()
+    release = None
+
+    async def fetch() -> str:
+        await release.wait()
+        return "done"
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.create_task(flight.do("video", "a", fetch))
+        second = asyncio.create_task(flight.do("video", "a", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
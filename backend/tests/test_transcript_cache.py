@@ -0,0 +1,124 @@
+import asyncio
+import sqlite3
+import time
+
+from app.core.http import create_http_client
+from app.core.settings import Settings
+from app.services.captions import Segment
+from app.services.quota import QuotaManager
+from app.services.transcript_cache import CachedTranscript, TranscriptCache
+from app.services.transcripts import TranscriptService
+from benchmarks.stub_server import StubCaptionServer
+
+
+def entry(video_id: str, text: str = "x" * 100, **fields) -> CachedTranscript:
+    return CachedTranscript(video_id=video_id, track="en", title=video_id, text=text, **fields)
+
+
+def test_entries_go_stale_after_the_ttl(monkeypatch):
+    cache = TranscriptCache(":memory:", ttl_seconds=60, max_bytes=10_000)
+    cache.put(entry("video0000a", segments=[Segment(0.0, 1.5, "hello")]))
+
+    cached = cache.get("video0000a")
+    assert cached.fresh and cached.segments == [Segment(0.0, 1.5, "hello")]
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert not cache.get("video0000a").fresh
+    assert cache.get("missing") is None
+    assert {key: cache.stats()[key] for key in ("hits", "stale", "misses")} == {"hits": 1, "stale": 1, "misses": 1}
+
+
+def test_lru_eviction_keeps_the_total_under_max_bytes():
+    cache = TranscriptCache(":memory:", ttl_seconds=3600, max_bytes=350)
+    for video_id in ("video0000a", "video0000b", "video0000c"):
+        cache.put(entry(video_id))
+        time.sleep(0.001)
+    # Reading "a" makes "b" the least recently used
+    cache.get("video0000a")
+    time.sleep(0.001)
+    cache.put(entry("video0000d"))
+
+    assert cache.get("video0000b") is None
+    assert all(cache.get(video_id) for video_id in ("video0000a", "video0000c", "video0000d"))
+    stats = cache.stats()
+    assert stats["bytes"] == 300 <= cache.max_bytes and stats["evictions"] == 1
+    # Replacing an entry counts only its new size; an entry over the bound is not stored
+    cache.put(entry("video0000a", text="y" * 50))
+    cache.put(entry("video0000e", text="z" * 400))
+    assert cache.stats()["bytes"] == 250 and cache.get("video0000e") is None
+
+
+def test_expired_entries_without_validators_are_evicted_first(monkeypatch):
+    cache = TranscriptCache(":memory:", ttl_seconds=60, max_bytes=250)
+    cache.put(entry("video0000a", etag='"a"', source_url="http://stub/timedtext?v=a"))
+    cache.put(entry("video0000b"))
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    cache.put(entry("video0000c"))
+
+    # "b" is expired and cannot be revalidated; "a" (older, but with an ETag) stays
+    assert cache.get("video0000b") is None
+    assert cache.get("video0000a").has_validators
+
+
+def test_mark_revalidated_restarts_the_ttl(monkeypatch):
+    cache = TranscriptCache(":memory:", ttl_seconds=60, max_bytes=10_000)
+    cache.put(entry("video0000a", etag='"a"', source_url="http://stub/timedtext?v=a"))
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    stale = cache.get("video0000a")
+    assert not stale.fresh
+    cache.mark_revalidated(stale)
+    assert stale.fresh and cache.get("video0000a").fresh
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_stale_entry_is_revalidated_with_a_conditional_request(tmp_path):
+    # Every entry is stale as soon as it is written
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=0, max_bytes=10_000_000)
+
+    async def fetch(base_url: str):
+        settings = Settings(youtube_api_key="test", youtube_api_base_url=base_url)
+        client = create_http_client(settings)
+        quota = QuotaManager(":memory:", 100, max_rate=1000, burst=1000)
+        service = TranscriptService(settings=settings, http_client=client, quota=quota, cache=cache)
+        try:
+            first = await service._fetch_video("stub0000000")
+            second = await service._fetch_video("stub0000000")
+        finally:
+            await client.aclose()
+        return first, second, quota.used_today()
+
+    with StubCaptionServer(channel_size=1, latency=0) as server:
+        first, second, used = asyncio.run(fetch(server.base_url))
+        by_endpoint = server.stats()["by_endpoint"]
+
+    assert first.status == second.status == "ok"
+    assert second.segments == first.segments
+    # The second fetch was a 304 on timedtext: no captions.list, no quota
+    assert by_endpoint == {"/captions": 1, "/timedtext": 2}
+    assert used == 1
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_caches_without_a_segments_column_are_migrated(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE transcripts (video_id TEXT NOT NULL, track TEXT NOT NULL, title TEXT NOT NULL, "
+        "text TEXT NOT NULL, source_url TEXT, etag TEXT, last_modified TEXT, size INTEGER NOT NULL, "
+        "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (video_id, track))"
+    )
+    conn.execute(
+        "INSERT INTO transcripts VALUES ('video0000a', 'en', 'Old', 'old text', NULL, NULL, NULL, 8, ?, ?)",
+        (time.time(), time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+    cache = TranscriptCache(str(path), ttl_seconds=60, max_bytes=10_000)
+    old = cache.get("video0000a")
+    assert old.text == "old text" and old.segments == []
+    cache.put(entry("video0000b", segments=[Segment(1.0, 2.0, "new")]))
+    assert cache.get("video0000b").segments == [Segment(1.0, 2.0, "new")]
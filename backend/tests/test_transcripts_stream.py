@@ -0,0 +1,91 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import get_settings
+from app.main import create_app
+from benchmarks.stub_server import StubCaptionServer
+
+CHANNEL = "https://www.youtube.com/@streamtest"
+VIDEOS = 3
+
+
+@pytest.fixture
+def server():
+    with StubCaptionServer(channel_size=VIDEOS, latency=0) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("APP_LLM_PROVIDER", "fake")
+    monkeypatch.setenv("APP_YOUTUBE_API_KEY", "test")
+    monkeypatch.setenv("APP_YOUTUBE_API_BASE_URL", server.base_url)
+    monkeypatch.setenv("APP_MAX_VIDEOS_PER_CHANNEL", str(VIDEOS))
+    monkeypatch.setenv("APP_YOUTUBE_API_RATE_PER_SECOND", "1000")
+    monkeypatch.setenv("APP_YOUTUBE_API_BURST", "1000")
+    get_settings.cache_clear()
+    with TestClient(create_app()) as client:
+        yield client
+    get_settings.cache_clear()
+
+
+def stream(client: TestClient, stream_format: str, **body: Any):
+    return client.post(f"/api/transcripts/fetch/stream?format={stream_format}", json={"channel_url": CHANNEL, **body})
+
+
+def assert_event_order(events: List[Dict[str, Any]]) -> None:
+    start, *middle, done = events
+    assert start["type"] == "start"
+    assert start["channel_url"] == CHANNEL
+    assert start["total"] == VIDEOS
+    assert len(start["video_ids"]) == VIDEOS
+
+    # One transcript followed by its progress event per video, in completion order
+    assert len(middle) == 2 * VIDEOS
+    transcripts, progress = middle[0::2], middle[1::2]
+    assert [event["type"] for event in transcripts] == ["transcript"] * VIDEOS
+    assert [event["type"] for event in progress] == ["progress"] * VIDEOS
+    assert [event["completed"] for event in progress] == list(range(1, VIDEOS + 1))
+    assert all(event["total"] == VIDEOS for event in progress)
+    assert sorted(event["transcript"]["video_id"] for event in transcripts) == sorted(start["video_ids"])
+    assert all(event["transcript"]["status"] == "ok" for event in transcripts)
+    assert all(event["transcript"]["text"] for event in transcripts)
+
+    assert done == {"type": "done", "completed": VIDEOS, "failed": 0, "total": VIDEOS}
+
+
+def test_ndjson_stream_frames_one_event_per_line(client):
+    response = stream(client, "ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["cache-control"] == "no-cache"
+
+    assert response.text.endswith("\n")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert_event_order(events)
+
+
+def test_sse_stream_names_each_event_by_type(client):
+    response = stream(client, "sse", include_segments=True)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    assert response.text.endswith("\n\n")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n")
+        event = json.loads(data.removeprefix("data: "))
+        assert name == f"event: {event['type']}"
+        events.append(event)
+    assert_event_order(events)
+    assert all(event["transcript"]["segments"] for event in events if event["type"] == "transcript")
+
+
+def test_invalid_channel_url_is_rejected_before_streaming(client, server):
+    response = client.post("/api/transcripts/fetch/stream", json={"channel_url": "https://example.com/not-a-channel"})
+    assert response.status_code == 400
+    assert server.stats()["by_endpoint"] == {}
@@ -0,0 +1,193 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.vector_store import LocalVectorStore, VectorStore
+
+COLLECTION = "channel_test"
+
+
+def normalized(rng: np.random.Generator, rows: int, dim: int = 32) -> np.ndarray:
+    vectors = rng.standard_normal((rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def points(video_id: str, count: int):
+    ids = [f"{video_id}:{i}" for i in range(count)]
+    return ids, [{"video_id": video_id, "text": point_id} for point_id in ids]
+
+
+def test_vector_store_is_abstract():
+    with pytest.raises(TypeError):
+        VectorStore()  # type: ignore[abstract]
+
+
+def test_upsert_and_search(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    vectors = normalized(np.random.default_rng(0), 20)
+    ids, payloads = points("video0000a", 20)
+
+    async def run():
+        await store.upsert(COLLECTION, ids, vectors, payloads)
+        return await store.search(COLLECTION, vectors[7], top_k=3), await store.count(COLLECTION)
+
+    hits, count = asyncio.run(run())
+    assert count == 20
+    assert hits[0].id == "video0000a:7"
+    assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+    assert hits[0].payload == payloads[7]
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+
+
+def test_upsert_replaces_existing_ids(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    rng = np.random.default_rng(1)
+    ids, payloads = points("video0000a", 5)
+
+    async def run():
+        await store.upsert(COLLECTION, ids, normalized(rng, 5), payloads)
+        replacement = normalized(rng, 1)
+        await store.upsert(COLLECTION, ids[:1], replacement, [{"video_id": "video0000a", "text": "new"}])
+        return await store.search(COLLECTION, replacement[0], top_k=1), await store.count(COLLECTION)
+
+    hits, count = asyncio.run(run())
+    assert count == 5
+    assert hits[0].id == ids[0] and hits[0].payload["text"] == "new"
+
+
+def test_duplicate_ids_in_one_batch_keep_the_last(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    vectors = normalized(np.random.default_rng(7), 3)
+    ids = ["video0000a:0", "video0000a:1", "video0000a:0"]
+    payloads = [{"video_id": "video0000a", "text": text} for text in ("old", "other", "new")]
+
+    async def run():
+        await store.upsert(COLLECTION, ids, vectors, payloads)
+        return await store.search(COLLECTION, vectors[2], top_k=10), await store.count(COLLECTION)
+
+    hits, count = asyncio.run(run())
+    assert count == 2 and len(hits) == 2
+    assert store.collection(COLLECTION).rows == 2
+    assert hits[0].id == "video0000a:0" and hits[0].payload["text"] == "new"
+    assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_float16_searches_a_float32_copy(tmp_path):
+    rng = np.random.default_rng(8)
+    vectors = normalized(rng, 300)
+    ids, payloads = points("video0000a", 300)
+    half = LocalVectorStore(str(tmp_path / "half"), dtype="float16")
+    full = LocalVectorStore(str(tmp_path / "full"))
+
+    async def run(store):
+        await store.upsert(COLLECTION, ids[:200], vectors[:200], payloads[:200])
+        first = await store.search(COLLECTION, vectors[5], top_k=5)
+        # Rows written after the copy was made are searched too
+        await store.upsert(COLLECTION, ids[200:], vectors[200:], payloads[200:])
+        return first, await store.search(COLLECTION, vectors[250], top_k=5)
+
+    half_hits, full_hits = asyncio.run(run(half)), asyncio.run(run(full))
+    for h, f in zip(half_hits, full_hits):
+        assert [hit.id for hit in h] == [hit.id for hit in f]
+        assert [hit.score for hit in h] == pytest.approx([hit.score for hit in f], abs=1e-3)
+    assert half_hits[1][0].id == "video0000a:250"
+    stats = half.stats()["collections"][COLLECTION]
+    assert stats["dtype"] == "float16" and stats["working_bytes"] >= 2 * stats["matrix_bytes"]
+
+
+def test_missing_collection_and_dimension_mismatch(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    vectors = normalized(np.random.default_rng(2), 3)
+    ids, payloads = points("video0000a", 3)
+
+    assert asyncio.run(store.search("absent", vectors[0])) == []
+    asyncio.run(store.upsert(COLLECTION, ids, vectors, payloads))
+    with pytest.raises(ValueError):
+        asyncio.run(store.search(COLLECTION, np.ones(8, dtype=np.float32)))
+
+
+def test_delete_video_keeps_listed_ids_and_other_videos(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    rng = np.random.default_rng(3)
+    a_ids, a_payloads = points("video0000a", 6)
+    b_ids, b_payloads = points("video0000b", 4)
+
+    async def run():
+        await store.upsert(COLLECTION, a_ids, normalized(rng, 6), a_payloads)
+        await store.upsert(COLLECTION, b_ids, normalized(rng, 4), b_payloads)
+        await store.delete_video(COLLECTION, "video0000a", keep={"video0000a:0", "video0000a:1"})
+        return await store.search(COLLECTION, normalized(rng, 1)[0], top_k=100)
+
+    hits = asyncio.run(run())
+    assert sorted(hit.id for hit in hits) == sorted(["video0000a:0", "video0000a:1", *b_ids])
+
+
+def test_persist_and_reload(tmp_path):
+    rng = np.random.default_rng(4)
+    vectors = normalized(rng, 50)
+    ids, payloads = points("video0000a", 50)
+    query = vectors[12]
+
+    async def write():
+        store = LocalVectorStore(str(tmp_path), dtype="float16")
+        await store.upsert(COLLECTION, ids, vectors, payloads)
+        await store.delete_video(COLLECTION, "video0000a", keep=set(ids[:40]))
+        hits = await store.search(COLLECTION, query, top_k=5)
+        await store.close()
+        return hits
+
+    async def read():
+        store = LocalVectorStore(str(tmp_path))
+        assert store.warm_up() == 1
+        return await store.search(COLLECTION, query, top_k=5), await store.count(COLLECTION), store.stats()
+
+    before = asyncio.run(write())
+    after, count, stats = asyncio.run(read())
+    assert count == 40
+    # The stored dtype wins over the one the store is reopened with
+    assert stats["collections"][COLLECTION]["dtype"] == "float16"
+    assert [hit.id for hit in after] == [hit.id for hit in before]
+    assert after[0].id == "video0000a:12"
+    assert after[0].score == pytest.approx(1.0, abs=1e-3)
+
+
+def test_ivf_recall_against_exact_search(tmp_path):
+    rng = np.random.default_rng(5)
+    # Clustered data, as chunk embeddings of related videos are
+    centers = normalized(rng, 40)
+    vectors = centers[rng.integers(0, 40, 4000)] + 0.3 * normalized(rng, 4000)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids, payloads = points("video0000a", 4000)
+    queries = vectors[rng.choice(4000, 50, replace=False)] + 0.1 * normalized(rng, 50)
+
+    async def top_ids(store: LocalVectorStore):
+        await store.upsert(COLLECTION, ids, vectors, payloads)
+        return [{hit.id for hit in await store.search(COLLECTION, query, top_k=10)} for query in queries]
+
+    exact = asyncio.run(top_ids(LocalVectorStore(str(tmp_path / "exact"))))
+    ann_store = LocalVectorStore(str(tmp_path / "ann"), ann_threshold=1000, nprobe=8)
+    approximate = asyncio.run(top_ids(ann_store))
+
+    assert ann_store.stats()["collections"][COLLECTION]["ann"]
+    recall = np.mean([len(a & e) / len(e) for a, e in zip(approximate, exact)])
+    assert recall >= 0.9
+
+    # The index is saved with the collection and used again after a reload
+    reloaded = LocalVectorStore(str(tmp_path / "ann"), ann_threshold=1000, nprobe=8)
+    assert reloaded.collection(COLLECTION).index is not None
+    again = asyncio.run(reloaded.search(COLLECTION, queries[0], top_k=10))
+    assert {hit.id for hit in again} == approximate[0]
+
+
+def test_drop_removes_the_collection(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    ids, payloads = points("video0000a", 3)
+
+    async def run():
+        await store.upsert(COLLECTION, ids, normalized(np.random.default_rng(6), 3), payloads)
+        await store.drop(COLLECTION)
+        return await store.count(COLLECTION)
+
+    assert asyncio.run(run()) == 0
+    assert not (tmp_path / COLLECTION).exists()
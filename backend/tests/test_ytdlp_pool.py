@@ -0,0 +1,132 @@
+import asyncio
+import datetime
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from app.services import ytdlp_pool
+from app.services.channel_sync import ChannelWatermark
+from app.services.ytdlp_pool import YoutubeDLPool
+
+CHANNEL = "https://www.youtube.com/@pooltest"
+UPLOADS = 20
+
+
+def upload(i: int) -> Dict[str, Any]:
+    """The i-th newest upload, one day apart, as a flat yt-dlp entry."""
+    day = datetime.date(2024, 6, 30) - datetime.timedelta(days=i)
+    return {"id": f"video{i:06d}", "title": f"Upload {i}", "upload_date": day.strftime("%Y%m%d")}
+
+
+class FakeYoutubeDL:
+    """Stands in for yt_dlp.YoutubeDL; records where it was built and how far entries were consumed."""
+
+    def __init__(self, log: SimpleNamespace, opts: Dict[str, Any]):
+        self.log = log
+        self.opts = opts
+        log.instances.append((threading.current_thread().name, opts))
+
+    def extract_info(self, url: str, download: bool = True, process: bool = True) -> Dict[str, Any]:
+        assert (download, process) == (False, False)
+        self.log.calls.append(threading.current_thread().name)
+
+        def entries():
+            # Broken entries are skipped, not counted against the limit
+            yield None
+            yield {"id": "not a video id"}
+            for i in range(UPLOADS):
+                self.log.consumed += 1
+                yield upload(i)
+
+        return {"id": url, "entries": entries()}
+
+
+@pytest.fixture
+def log(monkeypatch):
+    log = SimpleNamespace(instances=[], calls=[], consumed=0)
+    monkeypatch.setattr(ytdlp_pool, "yt_dlp", SimpleNamespace(YoutubeDL=lambda opts: FakeYoutubeDL(log, opts)))
+    # Warm instances are per thread; start each test without the main thread's
+    monkeypatch.setattr(ytdlp_pool, "_local", threading.local())
+    return log
+
+
+def ids(videos) -> List[str]:
+    return [video.video_id for video in videos]
+
+
+def test_limit_stops_enumeration_early(log):
+    videos = ytdlp_pool.list_uploads(CHANNEL, limit=3)
+
+    assert ids(videos) == [upload(i)["id"] for i in range(3)]
+    assert videos[0].title == "Upload 0"
+    assert videos[0].published_at == "2024-06-30"
+    # The lazy entries generator is not walked past the limit
+    assert log.consumed == 3
+
+
+def test_watermark_stops_at_last_ingested_video(log):
+    watermark = ChannelWatermark("pooltest", last_video_id=upload(5)["id"])
+
+    videos = ytdlp_pool.list_uploads(CHANNEL, limit=UPLOADS, watermark=watermark)
+
+    assert ids(videos) == [upload(i)["id"] for i in range(5)]
+    assert log.consumed == 6
+
+
+def test_watermark_falls_back_to_upload_date(log):
+    # The watermark video is gone from the channel; stop at the first older upload
+    watermark = ChannelWatermark("pooltest", last_video_id="deletedvid1", last_published_at="2024-06-23")
+
+    videos = ytdlp_pool.list_uploads(CHANNEL, limit=UPLOADS, watermark=watermark)
+
+    assert ids(videos) == [upload(i)["id"] for i in range(8)]
+    assert log.consumed == 9
+
+
+def test_missing_entries_yield_nothing(log, monkeypatch):
+    monkeypatch.setattr(FakeYoutubeDL, "extract_info", lambda self, url, download, process: None)
+
+    assert ytdlp_pool.list_uploads(CHANNEL, limit=3) == []
+
+
+def test_pool_runs_off_the_event_loop_and_reuses_instances(log):
+    async def run():
+        pool = YoutubeDLPool(workers=1)
+        try:
+            first = await pool.list_uploads(CHANNEL, limit=2)
+            second = await pool.list_uploads(CHANNEL, limit=2)
+        finally:
+            pool.shutdown()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert ids(first) == ids(second) == [upload(0)["id"], upload(1)["id"]]
+    assert len(log.calls) == 2
+    assert all(name.startswith("ytdlp") for name in log.calls)
+    # One warm "flat" YoutubeDL serves both calls on the single worker
+    assert len(log.instances) == 1
+    thread, opts = log.instances[0]
+    assert thread.startswith("ytdlp")
+    assert opts["extract_flat"] and opts["lazy_playlist"]
+
+
+def test_warm_up_builds_every_profile_on_every_worker(log):
+    async def run():
+        pool = YoutubeDLPool(workers=3)
+        try:
+            await pool.warm_up(timeout=5)
+            await pool.list_uploads_many([f"{CHANNEL}{i}" for i in range(6)], limit=1)
+        finally:
+            pool.shutdown()
+
+    asyncio.run(run())
+
+    threads = {thread for thread, _ in log.instances}
+    assert len(threads) == 3
+    # Enumerating six channels afterwards builds no further instances
+    assert len(log.instances) == 3 * len(ytdlp_pool._PROFILES)
+    assert len(log.calls) == 6
+    assert threading.main_thread().name not in threads
@@ -7,11 +7,22 @@ import { Textarea } from '@/components/ui/textarea'
 import { ArrowLeft, MessageCircle } from 'lucide-react'
 import type { TranscriptItem } from '@/lib/api'
 
+const BACKEND_URL = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000'
+
+type AnswerSource = {
+  chunk_id: string
+  video_id: string
+  title: string
+  start: number
+}
+
 export default function ChatPage() {
   const [question, setQuestion] = useState('')
   const [answer, setAnswer] = useState('')
   const [channelUrl, setChannelUrl] = useState('')
   const [transcripts, setTranscripts] = useState<TranscriptItem[]>([])
+  const [sources, setSources] = useState<AnswerSource[]>([])
+  const [isAsking, setIsAsking] = useState(false)
   const router = useRouter()
 
   useEffect(() => {
@@ -31,11 +42,47 @@ export default function ChatPage() {
     }
   }, [router])
 
-  const handleAskQuestion = () => {
-    if (!question.trim()) return
-    
-    // Placeholder answer for now
-    setAnswer('Answer placeholder - this will be replaced with real AI responses in later steps.')
+  const handleAskQuestion = async () => {
+    if (!question.trim() || isAsking) return
+
+    setAnswer('')
+    setSources([])
+    setIsAsking(true)
+    try {
+      // POST + streamed body (EventSource only supports GET); events are SSE blocks separated by a blank line
+      const response = await fetch(`${BACKEND_URL}/api/ask`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ channel_url: channelUrl, question }),
+      })
+      if (!response.ok || !response.body) {
+        const error = await response.json().catch(() => null)
+        setAnswer(error?.detail ?? `Request failed (${response.status})`)
+        return
+      }
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const blocks = buffer.split('\n\n')
+        buffer = blocks.pop() ?? ''
+        for (const block of blocks) {
+          const data = block.split('\n').find((line) => line.startsWith('data: '))
+          if (!data) continue
+          const event = JSON.parse(data.slice(6))
+          if (event.type === 'sources') setSources(event.chunks)
+          else if (event.type === 'token') setAnswer((prev) => prev + event.text)
+          else if (event.type === 'error') setAnswer((prev) => `${prev}\n\n${event.detail}`)
+        }
+      }
+    } catch (e) {
+      setAnswer(`Failed to reach the backend: ${e instanceof Error ? e.message : e}`)
+    } finally {
+      setIsAsking(false)
+    }
   }
 
   const handleBack = () => {
@@ -95,11 +142,11 @@ export default function ChatPage() {
                   
                   <Button
                     onClick={handleAskQuestion}
-                    disabled={!question.trim()}
+                    disabled={!question.trim() || isAsking}
                     className="w-full"
                     size="lg"
                   >
-                    Ask Question
+                    {isAsking ? 'Answering…' : 'Ask Question'}
                   </Button>
                 </div>
               </div>
@@ -112,6 +159,23 @@ export default function ChatPage() {
                   <div className="bg-gray-50 rounded-lg p-4 border">
                     <p className="text-gray-700 whitespace-pre-wrap">{answer}</p>
                   </div>
+                  {sources.length > 0 && (
+                    <ul className="mt-3 space-y-1 text-sm text-gray-600">
+                      {sources.map((source) => (
+                        <li key={source.chunk_id} className="truncate">
+                          <a
+                            href={`https://www.youtube.com/watch?v=${source.video_id}&t=${Math.floor(source.start)}s`}
+                            target="_blank"
+                            rel="noreferrer"
+                            className="text-blue-600 hover:underline"
+                          >
+                            {source.title || source.video_id} @ {Math.floor(source.start / 60)}:
+                            {String(Math.floor(source.start % 60)).padStart(2, '0')}
+                          </a>
+                        </li>
+                      ))}
+                    </ul>
+                  )}
                 </div>
               )}
 
@@ -123,7 +187,11 @@ export default function ChatPage() {
                   <div className="bg-gray-50 rounded-lg p-4 border max-h-64 overflow-auto text-sm text-gray-700 space-y-3">
                     {transcripts.slice(0, 3).map((t, idx) => (
                       <div key={`${t.video_id}-${idx}`}>
-                        <div className="font-medium truncate">{t.title || t.video_id}</div>
+                        <div className="font-medium truncate">
+                          {t.title || t.video_id}
+                          {t.status === 'demo' && <span className="ml-2 text-xs text-amber-600">demo transcript</span>}
+                          {t.status === 'failed' && <span className="ml-2 text-xs text-red-600">fetch failed</span>}
+                        </div>
                         <div className="line-clamp-3">{t.text}</div>
                       </div>
                     ))}
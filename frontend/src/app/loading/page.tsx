@@ -31,8 +31,11 @@ export default function LoadingPage() {
         clearInterval(interval)
         if (cancelled) return
         setProgress(100)
-        // Store transcripts in sessionStorage for now
-        sessionStorage.setItem('transcripts', JSON.stringify(res.transcripts))
+        // Only ids, titles and status: full text stays on the backend (paged via /api/corpus)
+        sessionStorage.setItem(
+          'transcripts',
+          JSON.stringify(res.transcripts.map(({ video_id, title, status }) => ({ video_id, title, status })))
+        )
         router.push(`/chat?channelUrl=${encodeURIComponent(channelUrl)}`)
       } catch (_e) {
         // On error, go back to channel page